@@ -0,0 +1,322 @@
+"""
+Data Seeder for Robot Framework Automation
+Seeds test data fixtures in batches into a database or a REST endpoint.
+
+Fixtures are the rows of a JSON test data file, loaded with the
+CommonLibrary ``Load Test Data``, or lists and dictionaries of the test.
+A database batch is written with one ``executemany`` array bind, on its own
+pooled connection, and the batches run in parallel. A REST batch is sent
+as concurrent requests on the session of a RequestsLibrary alias. Progress
+is logged after every batch.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from CommonLibrary import CommonLibrary
+from requests import RequestException, Response, Session
+from robot.api import logger
+from robot.api.deco import keyword, library
+from robot.libraries.BuiltIn import BuiltIn
+from robot.utils import DotDict
+
+
+@library(scope="GLOBAL", version="1.0.0")
+class DataSeeder:
+    """
+    Bulk seeding of test data into a database table or a REST endpoint.
+
+    The database keywords use the pools of the ``DatabasePool`` library and
+    the REST keywords the sessions of the ``RequestsLibrary``, import
+    ``Database.resource`` or ``RequestsLibrary.resource`` before seeding.
+
+    Seeding is idempotent with ``upsert_keys`` for a table, rows with the
+    same keys are updated, and with ``key_field`` for an endpoint, a
+    conflicting POST is repeated as PUT to the URL of the row.
+    """
+
+    def __init__(self, batch_size: int = 500, parallel: int = 4):
+        """
+        Args:
+            batch_size (int): rows per batch, defaults to 500
+            parallel (int): batches or requests run at the same time,
+                defaults to 4
+        """
+        self.batch_size = int(batch_size)
+        self.parallel = int(parallel)
+        self.common_library = CommonLibrary()
+
+    @keyword("Load Seed Rows")
+    def load_seed_rows(self, source: Any, key: Optional[str] = None,
+                       name_field: Optional[str] = None) -> List[Any]:
+        """
+        Returns the rows of a fixture.
+
+        Args:
+            source (Any): list of rows, dictionary of rows by name, or a
+                JSON test data file
+            key (Optional[str]): path of the rows in the data, e.g.
+                ``users`` or ``fixtures.items``
+            name_field (Optional[str]): field receiving the name of a row
+                in a dictionary of rows
+
+        Returns:
+            List[Any]: rows as dictionaries or lists
+        """
+        data = source
+        if isinstance(source, str):
+            data = self.common_library.load_test_data(source)
+        for part in key.split(".") if key else ():
+            try:
+                data = data[part]
+            except (KeyError, TypeError):
+                raise ValueError(f"Test data has no '{key}'.") from None
+        if isinstance(data, dict):
+            if name_field:
+                return [{name_field: name, **row}
+                        for name, row in data.items()]
+            return list(data.values())
+        if not isinstance(data, (list, tuple)):
+            raise ValueError(f"Seed rows must be a list or a dictionary, "
+                             f"got {type(data).__name__}.")
+        return list(data)
+
+    @keyword("Seed Database Table")
+    def seed_database_table(self, table: str, rows: Any,
+                            key: Optional[str] = None,
+                            columns: Optional[Sequence[str]] = None,
+                            upsert_keys: Optional[Sequence[str]] = None,
+                            environment: Optional[str] = None,
+                            batch_size: Optional[int] = None,
+                            parallel: Optional[int] = None) -> DotDict:
+        """
+        Inserts or upserts rows into a table, one array bind per batch.
+
+        Every batch is committed on its own pooled connection of the
+        environment. Nested values are written as JSON.
+
+        Args:
+            table (str): table name
+            rows (Any): rows, see ``Load Seed Rows``
+            key (Optional[str]): path of the rows in the data
+            columns (Optional[Sequence[str]]): columns to write, defaults to
+                the fields of the rows
+            upsert_keys (Optional[Sequence[str]]): columns identifying a row,
+                existing rows are updated instead of inserted
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+            batch_size (Optional[int]): rows per batch
+            parallel (Optional[int]): batches written at the same time,
+                limited to the pool size
+
+        Returns:
+            DotDict: target, rows, batches, seconds and rows_per_second
+        """
+        rows = self.load_seed_rows(rows, key)
+        columns = list(columns or self._get_columns(rows))
+        values = [[self._to_column_value(row.get(column))
+                   for column in columns]
+                  if isinstance(row, dict) else list(row) for row in rows]
+        pool = self._get_database_pool_library().get_pool(environment)
+        sql = pool.upsert_sql(table, columns, list(upsert_keys)) \
+            if upsert_keys else pool.insert_sql(table, columns)
+        batches = self._split(values, batch_size)
+        workers = min(int(parallel or self.parallel), pool.maximum,
+                      len(batches) or 1)
+        if not pool.concurrent_writes:
+            workers = 1
+
+        def write(batch: List[list]) -> int:
+            connection = pool.acquire()
+            try:
+                cursor = connection.cursor()
+                try:
+                    cursor.executemany(sql, batch)
+                finally:
+                    cursor.close()
+                connection.commit()
+            finally:
+                pool.release(connection)
+            return len(batch)
+
+        start = time.perf_counter()
+        done = 0
+        errors = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(write, batch) for batch in batches]
+            for future in as_completed(futures):
+                try:
+                    done += future.result()
+                except Exception as error:
+                    errors.append(error)
+                    continue
+                self._log_progress(table, done, len(values), start)
+        if errors:
+            raise RuntimeError(f"{len(errors)} of {len(batches)} batches "
+                               f"into {table} failed, {done} rows were "
+                               f"written: {errors[0]}")
+        return self._report(table, len(values), len(batches), start)
+
+    @keyword("Seed Rest Endpoint")
+    def seed_rest_endpoint(self, alias: str, endpoint: str, rows: Any,
+                           key: Optional[str] = None,
+                           key_field: Optional[str] = None,
+                           method: str = "POST",
+                           upsert_method: Optional[str] = "PUT",
+                           conflict_status: int = 409,
+                           batch_size: Optional[int] = None,
+                           parallel: Optional[int] = None,
+                           timeout: Optional[float] = None,
+                           fail_on_error: bool = True) -> DotDict:
+        """
+        Sends every row as JSON body, the rows of a batch concurrently.
+
+        A response with ``conflict_status`` means the row exists. With
+        ``key_field`` it is sent again with ``upsert_method`` to
+        ``endpoint/<key_field value>``, without it the row is counted as
+        existing.
+
+        Args:
+            alias (str): RequestsLibrary session alias
+            endpoint (str): path relative to the session URL
+            rows (Any): rows, see ``Load Seed Rows``
+            key (Optional[str]): path of the rows in the data
+            key_field (Optional[str]): field with the id of a row in its URL
+            method (str): method creating a row, defaults to POST
+            upsert_method (Optional[str]): method updating an existing row,
+                defaults to PUT, None counts it as existing
+            conflict_status (int): status of an existing row, defaults to 409
+            batch_size (Optional[int]): rows per batch
+            parallel (Optional[int]): requests sent at the same time
+            timeout (Optional[float]): seconds per request, defaults to the
+                timeout of the session
+            fail_on_error (bool): fail when a row was not seeded
+
+        Returns:
+            DotDict: target, rows, batches, seconds, rows_per_second,
+                created, updated, existing, failed and errors
+        """
+        rows = self.load_seed_rows(rows, key)
+        session: Session = self._get_requests_library(
+            "GetSessionData").get_session_object(alias)
+        url = self._join_url(session.url, endpoint)
+        timeout = timeout or self._get_requests_library(
+            "RequestsContextUtility").rf_requests.timeout
+        counts = {"created": 0, "updated": 0, "existing": 0, "failed": 0}
+        errors: List[str] = []
+
+        def send(row: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+            try:
+                response = session.request(method, url, json=row,
+                                           timeout=timeout)
+                if response.status_code != int(conflict_status):
+                    return self._outcome("created", response)
+                if not key_field or not upsert_method \
+                        or str(upsert_method).upper() == "NONE":
+                    return "existing", None
+                response = session.request(
+                    upsert_method, f"{url.rstrip('/')}/{row[key_field]}",
+                    json=row, timeout=timeout)
+                return self._outcome("updated", response)
+            except (RequestException, KeyError) as error:
+                return "failed", f"{type(error).__name__}: {error}"
+
+        batches = self._split(rows, batch_size)
+        start = time.perf_counter()
+        done = 0
+        with ThreadPoolExecutor(
+                max_workers=int(parallel or self.parallel)) as executor:
+            for batch in batches:
+                for outcome, error in executor.map(send, batch):
+                    counts[outcome] += 1
+                    if error and len(errors) < 10:
+                        errors.append(error)
+                done += len(batch)
+                self._log_progress(url, done, len(rows), start)
+        report = self._report(url, len(rows), len(batches), start)
+        report.update(counts, errors=errors)
+        if counts["failed"] and fail_on_error:
+            raise RuntimeError(f"{counts['failed']} of {len(rows)} rows "
+                               f"were not seeded to {url}: {errors[0]}")
+        return report
+
+    def _get_database_pool_library(self) -> Any:
+        try:
+            return BuiltIn().get_library_instance("DatabasePool")
+        except RuntimeError:
+            raise RuntimeError("Import Resources/Common/Database/"
+                               "Database.resource before seeding a "
+                               "table.") from None
+
+    @staticmethod
+    def _get_requests_library(name: str) -> Any:
+        """Library of RequestsLibrary.resource giving the sessions."""
+        try:
+            return BuiltIn().get_library_instance(name)
+        except RuntimeError:
+            raise RuntimeError("Import Resources/Common/RequestsLibrary/"
+                               "RequestsLibrary.resource and create the "
+                               "session before seeding an endpoint.") \
+                from None
+
+    @staticmethod
+    def _join_url(base: str, endpoint: str) -> str:
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
+        if not endpoint:
+            return base
+        return f"{base.rstrip('/')}/{endpoint.lstrip('/')}"
+
+    @staticmethod
+    def _get_columns(rows: List[Any]) -> List[str]:
+        columns: Dict[str, None] = {}
+        for row in rows:
+            if not isinstance(row, dict):
+                raise ValueError("Rows as lists need the columns argument.")
+            columns.update(dict.fromkeys(row))
+        return list(columns)
+
+    @staticmethod
+    def _to_column_value(value: Any) -> Any:
+        if isinstance(value, (dict, list, tuple)):
+            return json.dumps(value)
+        return value
+
+    def _split(self, rows: List[Any],
+               batch_size: Optional[int]) -> List[List[Any]]:
+        size = int(batch_size or self.batch_size)
+        return [rows[start:start + size]
+                for start in range(0, len(rows), size)]
+
+    @staticmethod
+    def _outcome(success: str,
+                 response: Response) -> Tuple[str, Optional[str]]:
+        if response.ok:
+            return success, None
+        return "failed", (f"{response.request.method} {response.url}: "
+                          f"{response.status_code} {response.text[:200]}")
+
+    @staticmethod
+    def _log_progress(target: str, done: int, total: int,
+                      start: float) -> None:
+        seconds = time.perf_counter() - start
+        logger.info(f"Seeded {done}/{total} rows into {target} "
+                    f"({done * 100 // max(total, 1)}%, "
+                    f"{done / max(seconds, 1e-9):.0f} rows/s).")
+
+    @staticmethod
+    def _report(target: str, rows: int, batches: int,
+                start: float) -> DotDict:
+        seconds = time.perf_counter() - start
+        report = DotDict(target=target, rows=rows, batches=batches,
+                         seconds=round(seconds, 3),
+                         rows_per_second=round(rows / max(seconds, 1e-9)))
+        logger.info(f"Seeded {rows} rows into {target} in {batches} "
+                    f"batches, {seconds:.2f}s.")
+        return report
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,331 @@
+"""
+Download Library for Robot Framework Automation
+Waits for browser downloads to complete in a download directory.
+
+On Linux the directory is watched with inotify, so a finished download is
+noticed as soon as the browser closes or renames the file. Elsewhere the
+directory is polled with stat. Partial files (``.crdownload``, ``.part``)
+are never reported, a download is complete when its final file is written.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from robot.api import logger
+from robot.api.deco import keyword, library
+from robot.utils import DotDict, timestr_to_secs
+
+PARTIAL_SUFFIXES = (".crdownload", ".part", ".partial", ".download", ".tmp")
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher():
+    """
+    Minimal inotify binding with ctypes, yields (mask, name) events of one
+    directory.
+    """
+
+    def __init__(self, directory: str):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        watch = self.libc.inotify_add_watch(self.fd,
+                                            os.fsencode(directory),
+                                            WATCH_MASK)
+        if watch < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(),
+                          f"inotify_add_watch failed for '{directory}'")
+
+    def read_events(self, timeout: float) -> List[tuple]:
+        readable, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not readable:
+            return []
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(buffer):
+            _, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class DownloadWatch():
+    """
+    State of one watched download directory.
+
+    Files existing when the watch starts are ignored. Every completed file
+    is reported only once, so consecutive waits return the next downloads.
+    """
+
+    def __init__(self, directory: str, backend: str, poll_interval: float):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.ignored = {path.name: self._get_signature(path)
+                        for path in self.directory.iterdir() if path.is_file()}
+        self.reported: set = set()
+        self.completed: Dict[str, float] = {}
+        self.signatures: Dict[str, tuple] = {}
+        self.watcher = None
+        if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+            try:
+                self.watcher = InotifyWatcher(str(self.directory))
+            except (OSError, AttributeError) as error:
+                if backend == "inotify":
+                    raise
+                logger.info(f"inotify not available, polling: {error}")
+        elif backend == "inotify":
+            raise RuntimeError("inotify backend is only available on Linux.")
+        self.backend = "inotify" if self.watcher else "poll"
+
+    def wait(self, count: int, timeout: float, pattern: str) -> List[Path]:
+        """Waits until ``count`` unreported downloads matching ``pattern``."""
+        deadline = time.monotonic() + timeout
+        # Files completed before the first event still have to be found.
+        self._scan()
+        while True:
+            ready = self._get_ready(pattern)
+            if len(ready) >= count:
+                ready = ready[:count]
+                self.reported.update(path.name for path in ready)
+                return ready
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                partial = [path.name for path in self.directory.iterdir()
+                           if self._is_partial(path.name)]
+                raise AssertionError(
+                    f"Expected {count} download(s) in '{self.directory}' "
+                    f"within {timeout}s, got {len(ready)}. "
+                    f"Partial files: {partial or 'none'}.")
+            if self.watcher:
+                unsettled = self._get_unsettled()
+                wait_time = self.poll_interval if unsettled else 1.0
+                self._handle_events(
+                    self.watcher.read_events(min(remaining, wait_time)))
+                if unsettled:
+                    self._scan()
+            else:
+                time.sleep(min(remaining, self.poll_interval))
+                self._scan()
+
+    def close(self) -> None:
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+
+    def _handle_events(self, events: List[tuple]) -> None:
+        for mask, name in events:
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                self.completed[name] = time.monotonic()
+            elif mask & (IN_CREATE | IN_MODIFY | IN_DELETE | IN_MOVED_FROM):
+                self.completed.pop(name, None)
+
+    def _scan(self) -> None:
+        """
+        Marks files complete whose size and mtime did not change since the
+        previous scan. With inotify, scans only pick up files that were
+        completed before the watch existed, events handle the rest.
+        """
+        for path in self.directory.iterdir():
+            if not path.is_file() or self._is_partial(path.name):
+                continue
+            signature = self._get_signature(path)
+            if self.ignored.get(path.name) == signature:
+                continue
+            previous = self.signatures.get(path.name)
+            self.signatures[path.name] = signature
+            if path.name in self.completed:
+                if not self.watcher and previous != signature:
+                    self.completed.pop(path.name)
+            elif previous == signature:
+                self.completed[path.name] = time.monotonic()
+
+    def _get_unsettled(self) -> List[str]:
+        return [name for name in self.signatures
+                if name not in self.completed and name not in self.reported]
+
+    def _get_ready(self, pattern: str) -> List[Path]:
+        ready = []
+        for name in sorted(self.completed, key=self.completed.get):
+            path = self.directory / name
+            if (name in self.reported
+                    or self._is_partial(name)
+                    or self._has_partial_sibling(name)
+                    or not path.match(pattern)
+                    or not path.is_file()):
+                continue
+            if self.ignored.get(name) == self._get_signature(path):
+                continue
+            ready.append(path)
+        return ready
+
+    def _has_partial_sibling(self, name: str) -> bool:
+        # Firefox keeps an empty placeholder with the final name next to
+        # the .part file until the download is done.
+        return any((self.directory / f"{name}{suffix}").exists()
+                   for suffix in PARTIAL_SUFFIXES)
+
+    @staticmethod
+    def _is_partial(name: str) -> bool:
+        return name.lower().endswith(PARTIAL_SUFFIXES)
+
+    @staticmethod
+    def _get_signature(path: Path) -> Optional[tuple]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+
+@library(scope="GLOBAL", version="1.0.0")
+class DownloadLibrary:
+    """Waits for completed browser downloads without sleeping."""
+
+    def __init__(self, backend: str = "auto", poll_interval: float = 0.2):
+        """
+        Args:
+            backend (str): ``auto``, ``inotify`` or ``poll``. ``auto`` uses
+                inotify on Linux and polling elsewhere.
+            poll_interval (float): Seconds between scans of the poll backend.
+        """
+        self.backend = backend.lower()
+        self.poll_interval = float(poll_interval)
+        self.watches: Dict[str, DownloadWatch] = {}
+
+    @keyword("Start Download Watch")
+    def start_download_watch(self, directory: str) -> None:
+        """
+        Start watching a download directory.
+
+        Files already in the directory are not reported as downloads. Call
+        this before the action that triggers the download, so that no
+        events are missed.
+
+        Args:
+            directory (str): Download directory, for example
+                ``${WEB_BROWSER_DOWNLOAD_PATH}``.
+        """
+        self.stop_download_watch(directory)
+        watch = DownloadWatch(directory, self.backend, self.poll_interval)
+        self.watches[self._get_key(directory)] = watch
+        logger.info(f"Watching '{directory}' for downloads ({watch.backend}).")
+
+    @keyword("Wait For Downloads")
+    def wait_for_downloads(self,
+                           directory: str,
+                           count: int = 1,
+                           timeout: str = "60s",
+                           pattern: str = "*") -> List[Dict[str, Any]]:
+        """
+        Wait until ``count`` downloads are completed in a directory.
+
+        Each completed download is returned only once, so concurrent
+        downloads can be collected with one call, or one by one. Without
+        `Start Download Watch` the watch starts here and files already
+        completed in the directory are reported too.
+
+        Args:
+            directory (str): Download directory.
+            count (int): Number of downloads to wait for. Defaults to 1.
+            timeout (str): Robot Framework time string. Defaults to 60s.
+            pattern (str): Glob pattern the file name must match.
+
+        Returns:
+            List[Dict[str, Any]]: path, name, size and sha256 of each
+                download, in order of completion.
+        """
+        key = self._get_key(directory)
+        if key not in self.watches:
+            self.watches[key] = DownloadWatch(directory,
+                                              self.backend,
+                                              self.poll_interval)
+            self.watches[key].ignored = {}
+        paths = self.watches[key].wait(int(count),
+                                       timestr_to_secs(timeout),
+                                       pattern)
+        downloads = [self._get_download_info(path) for path in paths]
+        for download in downloads:
+            logger.info(f"Downloaded '{download.name}' "
+                        f"({download.size} bytes, sha256 {download.sha256}).")
+        return downloads
+
+    @keyword("Wait For Download")
+    def wait_for_download(self,
+                          directory: str,
+                          timeout: str = "60s",
+                          pattern: str = "*") -> Dict[str, Any]:
+        """
+        Wait until one download is completed in a directory.
+
+        Args:
+            directory (str): Download directory.
+            timeout (str): Robot Framework time string. Defaults to 60s.
+            pattern (str): Glob pattern the file name must match.
+
+        Returns:
+            Dict[str, Any]: path, name, size and sha256 of the download.
+        """
+        return self.wait_for_downloads(directory, 1, timeout, pattern)[0]
+
+    @keyword("Stop Download Watch")
+    def stop_download_watch(self, directory: str) -> None:
+        """
+        Stop watching a download directory.
+
+        Args:
+            directory (str): Download directory.
+        """
+        watch = self.watches.pop(self._get_key(directory), None)
+        if watch:
+            watch.close()
+
+    @staticmethod
+    def _get_key(directory: str) -> str:
+        return os.path.realpath(directory)
+
+    @staticmethod
+    def _get_download_info(path: Path) -> Dict[str, Any]:
+        sha256 = hashlib.sha256()
+        with path.open("rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        return DotDict(path=str(path),
+                       name=path.name,
+                       size=path.stat().st_size,
+                       sha256=sha256.hexdigest())
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,123 @@
+"""
+Keyword Profiler Listener for Robot Framework Automation
+Records the wall-clock time of every keyword with its call stack.
+
+Writes into the output directory at the end of the execution:
+    - keyword_profile.folded: collapsed stacks with the self time in
+      microseconds, input for flamegraph.pl, speedscope or inferno
+    - keyword_profile.txt: the top keywords by self time and total time
+
+Usage:
+    robot --listener KeywordProfiler Tests
+    robot --listener KeywordProfiler:50 Tests
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn
+
+
+class KeywordProfiler:
+    """
+    Listener v3 aggregating self time and total time per keyword.
+
+    Only integers and precomputed stack strings are handled while keywords
+    run, the aggregation into the reports happens once in ``close``.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, top: int = 30, output_dir: Optional[str] = None):
+        """
+        Args:
+            top (int): Number of keywords listed in the summary.
+            output_dir (str): Directory of the reports, defaults to the
+                Robot Framework output directory.
+        """
+        self.top = int(top)
+        self.output_dir = output_dir
+        # Frames are [name, stack, start_ns, child_ns].
+        self.frames: List[list] = []
+        self.suites: List[str] = []
+        self.active: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        self.total_ns: Dict[str, int] = {}
+        self.self_ns: Dict[str, int] = {}
+        self.stacks: Dict[str, int] = {}
+
+    def start_suite(self, data, result) -> None:
+        if self.output_dir is None:
+            self.output_dir = BuiltIn().get_variable_value("${OUTPUT_DIR}",
+                                                           "Results")
+        self.suites.append(self._get_frame_name(result.name))
+
+    def end_suite(self, data, result) -> None:
+        self.suites.pop()
+
+    def start_keyword(self, data, result) -> None:
+        name = self._get_frame_name(result.full_name)
+        if self.frames:
+            stack = f"{self.frames[-1][1]};{name}"
+        else:
+            stack = f"{';'.join(self.suites)};{name}"
+        self.active[name] = self.active.get(name, 0) + 1
+        self.frames.append([name, stack, time.perf_counter_ns(), 0])
+
+    def end_keyword(self, data, result) -> None:
+        if not self.frames:
+            return
+        name, stack, start_ns, child_ns = self.frames.pop()
+        total_ns = time.perf_counter_ns() - start_ns
+        self_ns = total_ns - child_ns
+        if self.frames:
+            self.frames[-1][3] += total_ns
+        self.active[name] -= 1
+        # Recursive calls count into the total time only once.
+        if not self.active[name]:
+            self.total_ns[name] = self.total_ns.get(name, 0) + total_ns
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.self_ns[name] = self.self_ns.get(name, 0) + self_ns
+        self.stacks[stack] = self.stacks.get(stack, 0) + self_ns
+
+    def close(self) -> None:
+        output_dir = Path(self.output_dir or "Results")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        folded = output_dir / "keyword_profile.folded"
+        with folded.open("w", encoding="utf-8") as file:
+            for stack, self_ns in sorted(self.stacks.items()):
+                if self_ns >= 1000:
+                    file.write(f"{stack} {self_ns // 1000}\n")
+        summary = output_dir / "keyword_profile.txt"
+        summary.write_text(self._get_summary(), encoding="utf-8")
+        logger.console(f"Keyword profile:  {summary}")
+
+    def _get_summary(self) -> str:
+        lines = []
+        for title, values in (("self time", self.self_ns),
+                              ("total time", self.total_ns)):
+            lines.append(f"Top {self.top} keywords by {title}")
+            lines.append(f"{'total s':>10} {'self s':>10} {'calls':>8} "
+                         f"{'avg ms':>10}  keyword")
+            ranked = sorted(values, key=values.get, reverse=True)
+            for name in ranked[:self.top]:
+                calls = self.calls[name]
+                total_s = self.total_ns.get(name, 0) / 1e9
+                lines.append(f"{total_s:>10.3f} "
+                             f"{self.self_ns[name] / 1e9:>10.3f} "
+                             f"{calls:>8} "
+                             f"{total_s * 1000 / calls:>10.2f}  {name}")
+            lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _get_frame_name(name: str) -> str:
+        # Semicolons separate the frames of a collapsed stack.
+        return name.replace(";", ",")
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,257 @@
+"""
+Lazy Library Proxy for Robot Framework Automation
+Imports a heavy library only when one of its keywords is run for real.
+
+Keyword names, arguments and documentation are read from a libdoc spec,
+generated once in a separate process and cached per library, arguments,
+files named in the arguments (e.g. plugins) and library version. The
+library itself is created on the first keyword call, so suites,
+``--dryrun`` runs and suites not using the library never start
+e.g. the Browser Library Node.js process.
+
+Usage:
+    Library    LazyLibrary    Browser    plugins=${CURDIR}${/}Plugin.py    AS    Browser
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from robot.api import logger
+from robot.api.deco import library
+from robot.libraries import STDLIBS
+from robot.running.testlibraries import TestLibrary
+from robot.utils import Importer
+
+SPEC_DIRECTORY = Path(os.environ.get(
+    "LAZY_LIBRARY_CACHE",
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "robotframework-lazy-library"))
+PROXY_ATTRIBUTES = ("_", "ROBOT_", "get_keyword_", "run_keyword", "getKeyword",
+                    "runKeyword")
+LISTENER_METHODS = {"logmessage", "message", "outputfile", "logfile",
+                    "reportfile", "xunitfile", "debugfile", "libraryimport",
+                    "resourceimport", "variablesimport"}
+
+
+@library(scope="GLOBAL", version="1.0.0")
+class LazyLibrary:
+    """
+    Dynamic library proxy creating the wrapped library on first use.
+
+    Import it with ``AS`` and the name of the wrapped library, so keywords
+    and ``Get Library Instance`` work as before. Attributes of the proxy,
+    e.g. ``get_library_instance("Browser").take_screenshot``, are taken from
+    the wrapped library and create it as well.
+
+    Version 2 listeners of the wrapped library, like the Browser Library
+    auto closing, receive the events of the suites and tests started before
+    the library was created.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, library_name: str, *args: str, **kwargs: str):
+        """
+        Args:
+            library_name (str): name or path of the wrapped library.
+            *args (str): positional arguments of the wrapped library.
+            **kwargs (str): named arguments of the wrapped library.
+        """
+        self.ROBOT_LIBRARY_LISTENER = self
+        self._library_name = library_name
+        self._arguments = list(args) + [f"{name}={value}"
+                                        for name, value in kwargs.items()]
+        self._spec = self._load_spec()
+        self._keywords = {keyword["name"]: keyword
+                          for keyword in self._spec["keywords"]}
+        self.ROBOT_LIBRARY_DOC_FORMAT = self._spec.get("docFormat", "ROBOT")
+        self._code: Any = None
+        self._library: Optional[TestLibrary] = None
+        self._listeners: List[Any] = []
+        self._running: List[Tuple[str, str, dict]] = []
+
+    def get_keyword_names(self) -> List[str]:
+        return list(self._keywords)
+
+    def get_keyword_arguments(self, name: str) -> List[str]:
+        arguments = []
+        for argument in self._keywords[name]["args"]:
+            kind = argument["kind"]
+            if kind == "VAR_POSITIONAL":
+                arguments.append(f"*{argument['name']}")
+            elif kind == "VAR_NAMED":
+                arguments.append(f"**{argument['name']}")
+            elif kind == "NAMED_ONLY_MARKER":
+                arguments.append("*")
+            elif kind == "POSITIONAL_ONLY_MARKER":
+                arguments.append("/")
+            elif argument["required"]:
+                arguments.append(argument["name"])
+            else:
+                arguments.append(f"{argument['name']}="
+                                 f"{argument['defaultValue']}")
+        return arguments
+
+    def get_keyword_documentation(self, name: str) -> str:
+        if name == "__intro__":
+            return self._spec.get("doc", "")
+        if name == "__init__":
+            return "\n\n".join(init.get("doc", "")
+                               for init in self._spec.get("inits", []))
+        return self._keywords[name].get("doc", "")
+
+    def get_keyword_tags(self, name: str) -> List[str]:
+        return self._keywords[name].get("tags", [])
+
+    def run_keyword(self, name: str, args: list,
+                    kwargs: Optional[Dict[str, Any]] = None) -> Any:
+        keyword = self._get_library().find_keywords(name, count=1)
+        positional, named = keyword.args.convert(list(args),
+                                                 list((kwargs or {}).items()))
+        return keyword.method(*positional, **dict(named))
+
+    def __getattr__(self, name: str) -> Any:
+        # Robot Framework probes libraries and listeners for optional
+        # attributes, those must not create the wrapped library.
+        if name.startswith(PROXY_ATTRIBUTES) \
+                or name.replace("_", "").lower() in LISTENER_METHODS \
+                or (self._library is None
+                    and not hasattr(self._get_code(), name)):
+            raise AttributeError(name)
+        return getattr(self._get_library().instance, name)
+
+    def start_suite(self, name: str, attributes: dict) -> None:
+        self._running.append(("start_suite", name, attributes))
+        self._forward("start_suite", name, attributes)
+
+    def end_suite(self, name: str, attributes: dict) -> None:
+        if self._running:
+            self._running.pop()
+        self._forward("end_suite", name, attributes)
+
+    def start_test(self, name: str, attributes: dict) -> None:
+        self._running.append(("start_test", name, attributes))
+        self._forward("start_test", name, attributes)
+
+    def end_test(self, name: str, attributes: dict) -> None:
+        if self._running:
+            self._running.pop()
+        self._forward("end_test", name, attributes)
+
+    def start_keyword(self, name: str, attributes: dict) -> None:
+        if self._listeners:
+            self._forward("start_keyword", name, attributes)
+
+    def end_keyword(self, name: str, attributes: dict) -> None:
+        if self._listeners:
+            self._forward("end_keyword", name, attributes)
+
+    def close(self) -> None:
+        self._forward("close")
+
+    def _get_library(self) -> TestLibrary:
+        if self._library is None:
+            logger.info(f"Importing lazy library '{self._library_name}'.")
+            self._library = TestLibrary.from_name(self._library_name,
+                                                  args=self._arguments)
+            self._listeners = self._get_listeners(self._library.instance)
+            for event, name, attributes in self._running:
+                self._forward(event, name, attributes)
+        return self._library
+
+    def _get_code(self) -> Any:
+        """The library class or module, imported without creating it."""
+        if self._code is None:
+            name = self._library_name
+            if name in STDLIBS:
+                name = f"robot.libraries.{name}"
+            self._code = Importer("library").import_class_or_module(name)
+        return self._code
+
+    def _get_listeners(self, instance: Any) -> List[Any]:
+        listeners = getattr(instance, "ROBOT_LIBRARY_LISTENER", None)
+        if listeners is None:
+            return []
+        if not isinstance(listeners, (list, tuple)):
+            listeners = [listeners]
+        supported = []
+        for listener in listeners:
+            if int(getattr(listener, "ROBOT_LISTENER_API_VERSION", 2)) == 2:
+                supported.append(listener)
+            else:
+                logger.warn(f"Listener {type(listener).__name__} of lazy "
+                            f"library '{self._library_name}' is not version "
+                            f"2 and does not get events.")
+        return supported
+
+    def _forward(self, event: str, *args: Any) -> None:
+        for listener in self._listeners:
+            method = getattr(listener, event, None) \
+                or getattr(listener, f"_{event}", None)
+            if method is not None:
+                method(*args)
+
+    def _load_spec(self) -> dict:
+        """Reads the cached libdoc spec, generating it when missing."""
+        spec_file = SPEC_DIRECTORY / f"{self._get_spec_key()}.json"
+        if not spec_file.is_file():
+            self._generate_spec(spec_file)
+        return json.loads(spec_file.read_text(encoding="utf-8"))
+
+    def _get_spec_key(self) -> str:
+        """Library name and a hash of its arguments, source and version."""
+        path = Path(self._library_name)
+        if not path.exists():
+            try:
+                spec = find_spec(self._library_name.split(".")[0])
+            except (ImportError, ValueError):
+                spec = None
+            path = Path(spec.origin) if spec and spec.origin else path
+        stat = path.stat() if path.exists() else None
+        digest = hashlib.sha1(json.dumps([
+            self._library_name,
+            self._arguments,
+            str(path),
+            stat.st_mtime_ns if stat else None,
+            self._get_argument_files(),
+            sys.version,
+        ]).encode("utf-8")).hexdigest()[:16]
+        return f"{Path(self._library_name).stem}-{digest}"
+
+    def _get_argument_files(self) -> List[Tuple[str, int, int]]:
+        """Size and mtime of the files in the arguments, e.g. plugins."""
+        files = []
+        for argument in self._arguments:
+            for value in argument.split("=", 1)[-1].split(","):
+                path = Path(value.strip())
+                if value.strip() and path.is_file():
+                    stat = path.stat()
+                    files.append((str(path), stat.st_size, stat.st_mtime_ns))
+        return files
+
+    def _generate_spec(self, spec_file: Path) -> None:
+        spec_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary = spec_file.with_suffix(f".{os.getpid()}.tmp")
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(
+            path for path in sys.path if path))
+        process = subprocess.run(
+            [sys.executable, "-m", "robot.libdoc", "--format", "JSON",
+             "::".join([self._library_name] + self._arguments),
+             str(temporary)],
+            capture_output=True, text=True, env=environment)
+        if process.returncode != 0 or not temporary.is_file():
+            raise RuntimeError(f"Reading the keywords of library "
+                               f"'{self._library_name}' failed:\n"
+                               f"{process.stdout}{process.stderr}")
+        os.replace(temporary, spec_file)
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,167 @@
+"""
+Python Profiler Listener for Robot Framework Automation
+Profiles the Python code run by the libraries, per suite.
+
+Writes into ``profile/`` in the output directory, for every suite with tests:
+    - <suite>.pstats: cProfile statistics, read with ``python -m pstats``
+      or snakeviz
+    - <suite>.speedscope.json: stacks of a sampling profiler, open in
+      https://www.speedscope.app/
+
+Usage:
+    robot --listener PythonProfiler Tests
+    robot --listener PythonProfiler:both:0.005 Tests
+"""
+
+import cProfile
+import json
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn
+
+MODES = ("both", "cprofile", "sampling")
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the call stack of one thread at a fixed interval.
+
+    Stacks are stored as tuples of frame indexes, identical stacks are
+    counted together with the time elapsed between the samples.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="python-profiler-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames: List[dict] = []
+        self.frame_indexes: Dict[Tuple[str, str, int], int] = {}
+        self.samples: List[Tuple[int, ...]] = []
+        self.weights: List[float] = []
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        previous = time.perf_counter()
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is not None:
+                self.samples.append(self._get_stack(frame))
+                self.weights.append((now - previous) * 1000)
+            previous = now
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+    def to_speedscope(self, name: str) -> dict:
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "PythonProfiler",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(self.weights),
+                "samples": [list(stack) for stack in self.samples],
+                "weights": self.weights,
+            }],
+        }
+
+    def _get_stack(self, frame) -> Tuple[int, ...]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_name, code.co_filename, code.co_firstlineno)
+            index = self.frame_indexes.get(key)
+            if index is None:
+                index = self.frame_indexes[key] = len(self.frames)
+                self.frames.append({"name": key[0],
+                                    "file": key[1],
+                                    "line": key[2]})
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+
+class PythonProfiler:
+    """
+    Listener v3 profiling every suite that contains tests.
+
+    Profiling is opt-in. The default ``sampling`` mode has a low overhead,
+    ``cprofile`` or ``both`` add cProfile, which slows down Python heavy
+    keywords.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self,
+                 mode: str = "sampling",
+                 interval: float = 0.01,
+                 output_dir: Optional[str] = None):
+        """
+        Args:
+            mode (str): ``sampling`` (default), ``cprofile`` or ``both``.
+            interval (float): Seconds between the stack samples.
+            output_dir (str): Directory of the profiles, defaults to
+                ``profile`` in the Robot Framework output directory.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Invalid profiler mode '{mode}', "
+                             f"use one of {', '.join(MODES)}.")
+        self.mode = mode
+        self.interval = float(interval)
+        self.output_dir = output_dir
+        self.profiler: Optional[cProfile.Profile] = None
+        self.sampler: Optional[StackSampler] = None
+
+    def start_suite(self, data, result) -> None:
+        if self.output_dir is None:
+            output_dir = BuiltIn().get_variable_value("${OUTPUT_DIR}",
+                                                      "Results")
+            self.output_dir = str(Path(output_dir) / "profile")
+        if not data.tests:
+            return
+        if self.mode in ("both", "sampling"):
+            self.sampler = StackSampler(threading.get_ident(), self.interval)
+            self.sampler.start()
+        if self.mode in ("both", "cprofile"):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def end_suite(self, data, result) -> None:
+        if self.profiler is None and self.sampler is None:
+            return
+        output_dir = Path(self.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_name = re.sub(r"[^\w.-]+", "_", result.full_name)
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(output_dir / f"{file_name}.pstats")
+            self.profiler = None
+        if self.sampler is not None:
+            self.sampler.stop()
+            speedscope = output_dir / f"{file_name}.speedscope.json"
+            speedscope.write_text(
+                json.dumps(self.sampler.to_speedscope(result.full_name)),
+                encoding="utf-8")
+            self.sampler = None
+
+    def close(self) -> None:
+        if self.output_dir and Path(self.output_dir).is_dir():
+            logger.console(f"Python profiles: {self.output_dir}")
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,8 @@
+from .screenshot_library import ScreenshotLibrary
+
+__version__ = "1.0.0"
+__date__ = "2026-10-19"
+
+__all__ = [
+    ScreenshotLibrary
+]
@@ -0,0 +1,285 @@
+"""
+Screenshot Library for Robot Framework Automation
+Captures screenshots from Browser or SeleniumLibrary and hands the encoding
+and writing of the image to a background thread pool.
+
+Screenshots are deduplicated by a perceptual (difference) hash, so repeated
+captures of an unchanged page are written only once. WebP and JPEG encoding
+and the perceptual hash use Pillow of the common dependency group, without
+it the screenshots are written as PNG and deduplicated by exact match.
+"""
+
+import hashlib
+import io
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from robot.api import logger
+from robot.api.deco import keyword, library
+from robot.libraries.BuiltIn import BuiltIn
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+SUPPORTED_FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+FILE_EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+HASH_SIZE = 8
+
+
+@library(scope="GLOBAL", version="1.0.0")
+class ScreenshotLibrary:
+    """Asynchronous, deduplicated screenshots for Browser and SeleniumLibrary."""
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self,
+                 image_format: str = "webp",
+                 quality: int = 80,
+                 directory: Optional[str] = None,
+                 max_workers: int = 2,
+                 hash_distance: int = 0,
+                 history_size: int = 32,
+                 library_name: Optional[str] = None):
+        self.image_format = image_format.lower()
+        self.quality = int(quality)
+        self.directory = directory
+        self.max_workers = int(max_workers)
+        self.hash_distance = int(hash_distance)
+        self.history_size = int(history_size)
+        self.library_name = library_name
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending: list[Future] = []
+        self.hashes: OrderedDict[tuple, str] = OrderedDict()
+        self.index = 0
+        self.lock = Lock()
+        self.ROBOT_LIBRARY_LISTENER = self
+
+    @keyword("Take Optimized Screenshot")
+    def take_optimized_screenshot(self,
+                                  selector: Optional[str] = None,
+                                  filename: str = "screenshot-{index}",
+                                  image_format: Optional[str] = None,
+                                  quality: Optional[int] = None) -> str:
+        """
+        Take a screenshot and encode and write it in the background.
+
+        The screenshot is captured from the Browser library when it is
+        imported, otherwise from SeleniumLibrary. The image is logged as a
+        link right away, the file itself appears once the background
+        encoding is done. Use `Wait For Screenshots` to make sure all files
+        are written.
+
+        Args:
+            selector (str): Optional selector or locator of an element, only
+                the region of this element is captured.
+            filename (str): Name of the file without extension, ``{index}``
+                is replaced with a running number.
+            image_format (str): ``webp``, ``jpeg`` or ``png``, defaults to
+                the format given in the library import.
+            quality (int): Encoding quality from 0 to 100 for ``webp`` and
+                ``jpeg``, defaults to the quality given in the library import.
+
+        Returns:
+            str: Path of the screenshot file. For a duplicate frame, the path
+                of the previously written identical screenshot.
+        """
+        image_format = self._get_image_format(image_format or self.image_format)
+        quality = self.quality if quality is None else int(quality)
+        png_bytes = self._capture_png(selector)
+        image = None
+        if Image is not None:
+            image = Image.open(io.BytesIO(png_bytes))
+            image.load()
+        frame_hash = self._get_frame_hash(image, png_bytes)
+        duplicate = self._find_duplicate(frame_hash)
+        if duplicate:
+            logger.info(f"Screenshot is identical to '{duplicate}', "
+                        "not writing a new file.")
+            self._log_screenshot(duplicate)
+            return duplicate
+        self.index += 1
+        path = self._get_screenshot_directory() / (
+            f"{filename.format(index=self.index)}."
+            f"{FILE_EXTENSIONS[image_format]}")
+        self._remember_hash(frame_hash, str(path))
+        future = self._get_executor().submit(self._write_screenshot,
+                                             path,
+                                             png_bytes,
+                                             image,
+                                             image_format,
+                                             quality)
+        self.pending.append(future)
+        self._log_screenshot(str(path))
+        return str(path)
+
+    @keyword("Wait For Screenshots")
+    def wait_for_screenshots(self) -> None:
+        """
+        Wait until all screenshots taken so far are written to disk.
+
+        Fails if writing any of the pending screenshots failed.
+        """
+        pending, self.pending = self.pending, []
+        errors = []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as error:
+                errors.append(str(error))
+        if errors:
+            raise RuntimeError("Writing screenshots failed:\n"
+                               + "\n".join(errors))
+        logger.info(f"{len(pending)} screenshot(s) written.")
+
+    @keyword("Reset Screenshot Deduplication")
+    def reset_screenshot_deduplication(self) -> None:
+        """
+        Forget the hashes of earlier screenshots.
+
+        The next screenshot is written even if an identical one was taken
+        before.
+        """
+        with self.lock:
+            self.hashes.clear()
+
+    def close(self) -> None:
+        """Listener method, writes the pending screenshots before exiting."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        for future in self.pending:
+            if future.exception() is not None:
+                logger.warn(f"Writing screenshot failed: {future.exception()}")
+        self.pending = []
+
+    def _capture_png(self, selector: Optional[str]) -> bytes:
+        library_name = self._get_library_name()
+        instance = BuiltIn().get_library_instance(library_name)
+        if library_name == "Browser":
+            from Browser.utils.data_types import ScreenshotReturnType
+            return instance.take_screenshot(
+                selector=selector,
+                log_screenshot=False,
+                return_as=ScreenshotReturnType.bytes)
+        if selector:
+            return instance.find_element(selector).screenshot_as_png
+        return instance.driver.get_screenshot_as_png()
+
+    def _get_library_name(self) -> str:
+        if self.library_name:
+            return self.library_name
+        libraries = BuiltIn().get_library_instance(all=True)
+        for name in ("Browser", "SeleniumLibrary"):
+            if name in libraries:
+                return name
+        raise RuntimeError("Neither Browser nor SeleniumLibrary is imported.")
+
+    def _get_image_format(self, image_format: str) -> str:
+        image_format = image_format.lower().replace("jpg", "jpeg")
+        if image_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported screenshot format '{image_format}', "
+                             f"use one of {', '.join(SUPPORTED_FORMATS)}.")
+        if image_format != "png" and Image is None:
+            logger.warn("Pillow is not installed, writing screenshots as PNG.")
+            self.image_format = image_format = "png"
+        return image_format
+
+    def _get_frame_hash(self, image, png_bytes: bytes) -> tuple:
+        """
+        Difference hash of the frame, one bit per horizontally adjacent
+        pixel pair of a 9x8 grayscale thumbnail. The image size and a coarse
+        brightness are kept alongside, so that plain frames of a different
+        color (all with an empty difference hash) are not mixed up. Without
+        Pillow the digest of the PNG bytes is used, which only matches byte
+        identical frames.
+        """
+        if image is None:
+            return None, hashlib.sha1(png_bytes).hexdigest()
+        thumbnail = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE),
+                                              Image.Resampling.BILINEAR)
+        pixels = list(thumbnail.getdata())
+        frame_hash = 0
+        for row in range(HASH_SIZE):
+            for column in range(HASH_SIZE):
+                left = pixels[row * (HASH_SIZE + 1) + column]
+                right = pixels[row * (HASH_SIZE + 1) + column + 1]
+                frame_hash = (frame_hash << 1) | (left > right)
+        brightness = sum(pixels) // len(pixels) // 16
+        return (image.size, brightness), frame_hash
+
+    def _find_duplicate(self, frame_hash: tuple) -> Optional[str]:
+        group, value = frame_hash
+        with self.lock:
+            if frame_hash in self.hashes:
+                return self.hashes[frame_hash]
+            if not self.hash_distance or group is None:
+                return None
+            for (known_group, known_value), path in self.hashes.items():
+                if known_group != group:
+                    continue
+                if bin(known_value ^ value).count("1") <= self.hash_distance:
+                    return path
+        return None
+
+    def _remember_hash(self, frame_hash: tuple, path: str) -> None:
+        with self.lock:
+            self.hashes[frame_hash] = path
+            while len(self.hashes) > self.history_size:
+                self.hashes.popitem(last=False)
+
+    def _get_screenshot_directory(self) -> Path:
+        if self.directory:
+            directory = Path(self.directory)
+        else:
+            output_dir = BuiltIn().get_variable_value("${OUTPUT_DIR}", ".")
+            directory = Path(output_dir) / "screenshots"
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="screenshot")
+        # Drop completed futures so that long runs do not keep them all.
+        self.pending = [future for future in self.pending
+                        if not future.done() or future.exception()]
+        return self.executor
+
+    @staticmethod
+    def _write_screenshot(path: Path,
+                          png_bytes: bytes,
+                          image,
+                          image_format: str,
+                          quality: int) -> None:
+        # Pillow releases the GIL while encoding, so the pool runs encoders
+        # in parallel with the test execution.
+        if image is None or image_format == "png":
+            path.write_bytes(png_bytes)
+            return
+        if image_format == "jpeg" and image.mode != "RGB":
+            image = image.convert("RGB")
+        temporary_path = path.with_name(f".{path.name}.tmp")
+        image.save(temporary_path,
+                   SUPPORTED_FORMATS[image_format],
+                   quality=max(min(quality, 100), 0))
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def _log_screenshot(path: str) -> None:
+        output_dir = BuiltIn().get_variable_value("${OUTPUT_DIR}", ".")
+        link = os.path.relpath(path, output_dir).replace(os.sep, "/")
+        logger.info(f'</td></tr><tr><td colspan="3">'
+                    f'<a href="{link}"><img src="{link}" width="800px"></a>',
+                    html=True)
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,106 @@
+/*
+ * Browser Library JavaScript extension for request routing.
+ *
+ * Blocks resource types and URL patterns and serves static assets from an
+ * on-disk cache keyed by URL, revalidated with the stored ETag.
+ * Loaded on demand by BrowserUtilitiesPlugin.py `Apply Routing Profile`.
+ */
+const crypto = require("crypto");
+const fs = require("fs");
+const path = require("path");
+
+// response.body() is already decoded, these headers describe the encoded
+// transfer and would break a fulfilled body.
+const ENCODING_HEADERS = new Set([
+    "content-encoding", "content-length", "transfer-encoding"]);
+
+function withoutEncodingHeaders(headers) {
+    return Object.fromEntries(Object.entries(headers).filter(
+        ([name]) => !ENCODING_HEADERS.has(name.toLowerCase())));
+}
+
+function getCacheFiles(cacheDirectory, url) {
+    const key = crypto.createHash("sha256").update(url).digest("hex");
+    return {
+        body: path.join(cacheDirectory, `${key}.body`),
+        meta: path.join(cacheDirectory, `${key}.json`),
+    };
+}
+
+function readCache(files) {
+    try {
+        return {
+            meta: JSON.parse(fs.readFileSync(files.meta, "utf8")),
+            body: fs.readFileSync(files.body),
+        };
+    } catch (error) {
+        return null;
+    }
+}
+
+function fulfillFromCache(route, cached) {
+    return route.fulfill({
+        status: cached.meta.status,
+        headers: withoutEncodingHeaders(cached.meta.headers),
+        body: cached.body,
+    });
+}
+
+async function applyRoutingProfile(profile, cacheDirectory, context, logger) {
+    const blockedTypes = new Set(profile.BLOCK_RESOURCE_TYPES || []);
+    const blockedPatterns = (profile.BLOCK_URL_PATTERNS || []).map(
+        (pattern) => new RegExp(pattern));
+    const cachedTypes = new Set(profile.CACHE_RESOURCE_TYPES || []);
+    const revalidate = profile.CACHE_REVALIDATE !== false;
+    if (cachedTypes.size > 0) {
+        fs.mkdirSync(cacheDirectory, { recursive: true });
+    }
+    await context.route("**/*", async (route) => {
+        const request = route.request();
+        const url = request.url();
+        const type = request.resourceType();
+        if (blockedTypes.has(type)
+                || blockedPatterns.some((pattern) => pattern.test(url))) {
+            return route.abort("blockedbyclient");
+        }
+        if (!cachedTypes.has(type) || request.method() !== "GET") {
+            return route.fallback();
+        }
+        const files = getCacheFiles(cacheDirectory, url);
+        const cached = readCache(files);
+        if (cached && !revalidate) {
+            return fulfillFromCache(route, cached);
+        }
+        const headers = { ...request.headers() };
+        if (cached) {
+            headers["if-none-match"] = cached.meta.etag;
+        }
+        let response;
+        try {
+            response = await route.fetch({ headers });
+        } catch (error) {
+            return cached ? fulfillFromCache(route, cached) : route.abort();
+        }
+        if (response.status() === 304 && cached) {
+            return fulfillFromCache(route, cached);
+        }
+        const body = await response.body();
+        const responseHeaders = withoutEncodingHeaders(response.headers());
+        const etag = responseHeaders["etag"];
+        if (etag && response.ok()) {
+            fs.writeFileSync(files.body, body);
+            fs.writeFileSync(files.meta, JSON.stringify({
+                url: url,
+                etag: etag,
+                status: response.status(),
+                headers: responseHeaders,
+            }));
+        }
+        return route.fulfill({ response, body, headers: responseHeaders });
+    });
+    logger(`Routing profile applied: blocked types [${[...blockedTypes]}], `
+        + `cached types [${[...cachedTypes]}] in ${cacheDirectory}`);
+}
+
+exports.__esModule = true;
+exports.applyRoutingProfile = applyRoutingProfile;
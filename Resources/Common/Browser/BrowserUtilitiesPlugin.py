@@ -4,10 +4,49 @@
 """
 Browser Utilities Plugin
 """
+import re
+from pathlib import Path
+from typing import Any, Optional
+
 from Browser import Browser
 from Browser.base.librarycomponent import LibraryComponent
 from robot.api.deco import keyword
 from robot.api.logger import logging
+from robot.libraries.BuiltIn import BuiltIn
+
+# Collects the rendered rows of a virtualized container, then scrolls it by
+# one viewport and waits for the grid to render the next page.
+COLLECT_AND_SCROLL_ROWS = """
+async (container, arg) => {
+    const rows = [];
+    for (const row of container.querySelectorAll(arg.row_selector)) {
+        const key = row.getAttribute(arg.key_attribute);
+        if (key === null) {
+            continue;
+        }
+        const cells = arg.cell_selector
+            ? Array.from(row.querySelectorAll(arg.cell_selector),
+                         (cell) => cell.innerText.trim())
+            : [row.innerText.trim()];
+        rows.push({key: key, cells: cells});
+    }
+    const previous = container.scrollTop;
+    container.scrollTop = previous + container.clientHeight;
+    await new Promise((resolve) => requestAnimationFrame(
+        () => requestAnimationFrame(resolve)));
+    return {rows: rows, at_end: container.scrollTop === previous};
+}
+"""
+
+ROUTING_EXTENSION = Path(__file__).parent / "BrowserRouting.js"
+
+# Serialises a table or ARIA grid into a list of {header: cell text} rows,
+# shared with the SeleniumLibrary TableDataPlugin.
+TABLE_TO_ROWS = re.sub(
+    r"^/\*.*?\*/\s*", "",
+    (Path(__file__).parent.parent / "TableToRows.js").read_text(
+        encoding="utf-8"),
+    flags=re.DOTALL)
 
 
 class BrowserUtilitiesPlugin(LibraryComponent):
@@ -17,6 +56,7 @@ class BrowserUtilitiesPlugin(LibraryComponent):
 
     def __init__(self, library: Browser):
         super().__init__(library)
+        self.routing_extension_loaded = False
 
     @keyword("Get List Of Texts")
     def get_list_of_texts(self,
@@ -68,6 +108,126 @@ class BrowserUtilitiesPlugin(LibraryComponent):
             except AssertionError:
                 break
 
+    @keyword("Get Table Data")
+    def get_table_data(self,
+                       selector: str,
+                       columns: Optional[list[str]] = None
+                       ) -> list[dict[str, Optional[str]]]:
+        """
+        Returns the rows of a table or grid in one script call.
+
+        Headers are read from ``thead th`` or ``columnheader`` roles,
+        falling back to the first row. The result can be compared to
+        expected data directly, e.g. with ``Lists Should Be Equal``.
+
+        Args:
+            selector (str): Browser selector of the table or grid
+            columns (list[str], optional):
+                            Headers to keep, in this order.
+                            Defaults to None (all columns).
+
+        Returns:
+            list[dict[str, Optional[str]]]: rows as {header: cell text}
+        """
+        return self.library.evaluate_javascript(
+            selector, TABLE_TO_ROWS, arg=columns or [])
+
+    @keyword("Collect Virtualized Grid Rows")
+    def collect_virtualized_grid_rows(self,
+                                      selector: str,
+                                      row_selector: str,
+                                      key_attribute: str = "aria-rowindex",
+                                      cell_selector: Optional[str] = None,
+                                      batch_keyword: Optional[str] = None,
+                                      batch_size: str = "100",
+                                      max_pages: str = "1000"
+                                      ) -> list[dict[str, Any]]:
+        """
+        Scrolls a virtualized grid page by page and collects its rows.
+
+        Each page is read and scrolled with a single script call, so the
+        number of round trips follows the number of pages, not rows.
+        Rows are deduplicated by ``key_attribute`` and collection stops
+        once a page adds no new rows or the container cannot scroll.
+
+        Args:
+            selector (str): Browser selector of the scrollable container
+            row_selector (str): CSS selector of the rows inside the container
+            key_attribute (str, optional):
+                            Row attribute that uniquely identifies a row.
+                            Defaults to "aria-rowindex".
+            cell_selector (str, optional):
+                            CSS selector of the cells inside a row.
+                            Defaults to None (whole row text).
+            batch_keyword (str, optional):
+                            Keyword called with each batch of new rows.
+                            Defaults to None.
+            batch_size (str, optional):
+                            Rows per batch passed to ``batch_keyword``.
+                            Defaults to "100".
+            max_pages (str, optional):
+                            Upper limit of scrolled pages.
+                            Defaults to "1000".
+
+        Returns:
+            list[dict[str, Any]]: rows as {"key": str, "cells": list[str]}
+        """
+        argument = {
+            "row_selector": row_selector,
+            "key_attribute": key_attribute,
+            "cell_selector": cell_selector,
+        }
+        collected: dict[str, dict[str, Any]] = {}
+        batch: list[dict[str, Any]] = []
+        for page in range(int(max_pages)):
+            result = self.library.evaluate_javascript(
+                selector, COLLECT_AND_SCROLL_ROWS, arg=argument)
+            new_rows = [row for row in result["rows"]
+                        if row["key"] not in collected]
+            for row in new_rows:
+                collected[row["key"]] = row
+            batch.extend(new_rows)
+            logging.info(f"Page {page}: {len(new_rows)} new rows")
+            if batch_keyword and len(batch) >= int(batch_size):
+                self._flush_row_batch(batch_keyword, batch)
+                batch = []
+            if not new_rows or result["at_end"]:
+                break
+        if batch_keyword and batch:
+            self._flush_row_batch(batch_keyword, batch)
+        return list(collected.values())
+
+    def _flush_row_batch(self,
+                         batch_keyword: str,
+                         batch: list[dict[str, Any]]) -> None:
+        BuiltIn().run_keyword(batch_keyword, batch)
+
+    @keyword("Apply Routing Profile")
+    def apply_routing_profile(self,
+                              profile: dict[str, Any],
+                              cache_directory: str) -> None:
+        """
+        Routes the requests of the current context through a profile.
+
+        Blocks the ``BLOCK_RESOURCE_TYPES`` and ``BLOCK_URL_PATTERNS``
+        (regular expressions) and serves ``CACHE_RESOURCE_TYPES`` from an
+        on-disk cache keyed by URL and revalidated with the stored ETag
+        unless ``CACHE_REVALIDATE`` is false.
+        The JavaScript extension is only loaded on first use.
+
+        Args:
+            profile (dict[str, Any]): routing profile configuration
+            cache_directory (str): directory of the asset cache
+        """
+        if not self.routing_extension_loaded:
+            self.initialize_js_extension(ROUTING_EXTENSION)
+            self.routing_extension_loaded = True
+        self.call_js_keyword("applyRoutingProfile",
+                             profile=profile,
+                             cacheDirectory=cache_directory,
+                             context=None,
+                             logger=None)
+
     @keyword("Drag And Drop Using Mouse Move")
     def drag_and_drop_using_mouse_move(self,
                                        from_x: str,
@@ -0,0 +1,68 @@
+"""
+Keyword library for checking Browser Library storage state files.
+
+Storage state files are created with the ``Save Storage State`` keyword and
+hold the cookies and localStorage of an authenticated context.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from robot.api import logger
+from robot.api.deco import keyword, library
+
+
+@library(scope="GLOBAL", version="1.0")
+class StorageStateUtility():
+    """
+    Utilities for reusing storage state files between contexts.
+    """
+
+    @keyword("Is Storage State Expired")
+    def is_storage_state_expired(self,
+                                 state_file: Optional[str],
+                                 max_age: int = 1800,
+                                 cookie_margin: int = 60) -> bool:
+        """
+        Checks if a storage state file must be captured again.
+
+        A state is expired when the file is missing, when it is older than
+        ``max_age`` or when one of its persistent cookies expires within
+        ``cookie_margin``. Session cookies (expires -1) are ignored.
+
+        Args:
+            state_file (Optional[str]): path returned by Save Storage State
+            max_age (int): maximum file age in seconds. Defaults to 1800.
+            cookie_margin (int): seconds left before a cookie counts as
+                expired. Defaults to 60.
+
+        Returns:
+            bool: True if the state should be refreshed
+        """
+        if state_file is None or not Path(state_file).is_file():
+            logger.info("No storage state file captured yet.")
+            return True
+        now = time.time()
+        age = now - Path(state_file).stat().st_mtime
+        if age > int(max_age):
+            logger.info(f"Storage state is {age:.0f}s old.")
+            return True
+        expiries = [
+            cookie["expires"] for cookie in self._get_cookies(state_file)
+            if cookie.get("expires", -1) > 0
+        ]
+        if expiries and min(expiries) < now + int(cookie_margin):
+            logger.info("Storage state has an expiring cookie.")
+            return True
+        return False
+
+    def _get_cookies(self, state_file: str) -> list[dict[str, Any]]:
+        with open(state_file, encoding="utf-8") as state:
+            return json.load(state).get("cookies", [])
+
+
+if __name__ == "__main__":
+
+    pass
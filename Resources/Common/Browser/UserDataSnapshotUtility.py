@@ -0,0 +1,202 @@
+"""
+Keyword library for snapshots of the persistent context user data directory.
+
+A user data directory prepared once by a login flow is captured as a
+compressed tarball or as a plain directory copy, and restored for every suite
+or parallel worker instead of running the login again.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from robot.api import logger
+from robot.api.deco import keyword, library
+
+# Chromium caches and lock files, not needed to keep the session.
+EXCLUDED_NAMES = {
+    "BrowserMetrics",
+    "Cache",
+    "Code Cache",
+    "component_crx_cache",
+    "Crashpad",
+    "DawnCache",
+    "DawnGraphiteCache",
+    "DawnWebGPUCache",
+    "GPUCache",
+    "GraphiteDawnCache",
+    "GrShaderCache",
+    "lockfile",
+    "ShaderCache",
+    "SingletonCookie",
+    "SingletonLock",
+    "SingletonSocket",
+    "cache2",
+    "startupCache",
+    "parent.lock",
+}
+
+
+@library(scope="GLOBAL", version="1.0")
+class UserDataSnapshotUtility():
+    """
+    Utilities for capturing and restoring user data directory snapshots.
+    """
+
+    @keyword("Create User Data Snapshot")
+    def create_user_data_snapshot(self,
+                                  user_data_directory: str,
+                                  snapshot_path: str,
+                                  mode: str = "tar") -> str:
+        """
+        Captures a user data directory into a snapshot.
+
+        The browser using the directory must be closed. The snapshot is
+        written next to its final path and moved in place at the end, so
+        parallel workers never restore a half written snapshot.
+
+        Args:
+            user_data_directory (str): prepared user data directory
+            snapshot_path (str): tarball file or directory of the snapshot
+            mode (str): ``tar`` for a gzip tarball, ``copy`` for a directory
+                copy. Defaults to tar.
+
+        Returns:
+            str: snapshot path
+        """
+        source = Path(user_data_directory)
+        target = Path(snapshot_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+        started = time.perf_counter()
+        if mode == "tar":
+            # Level 1 compresses profiles nearly as well as the default,
+            # several times faster.
+            with tarfile.open(temporary, "w:gz", compresslevel=1) as tar:
+                tar.add(source, arcname=".", filter=self._exclude_member)
+        elif mode == "copy":
+            shutil.copytree(source, temporary, symlinks=True,
+                            ignore=self._ignore_names)
+        else:
+            raise ValueError(f"Invalid snapshot mode: {mode}")
+        self._replace(temporary, target)
+        logger.info(f"User data snapshot created in "
+                    f"{time.perf_counter() - started:.2f}s: {target}")
+        return str(target)
+
+    @keyword("Restore User Data Snapshot")
+    def restore_user_data_snapshot(self,
+                                   snapshot_path: str,
+                                   user_data_directory: str) -> None:
+        """
+        Replaces a user data directory with the content of a snapshot.
+
+        A tarball snapshot is extracted, a directory snapshot is copied with
+        reflinks where the file system supports them (copy-on-write), so the
+        browser never writes into the snapshot.
+
+        Args:
+            snapshot_path (str): tarball file or directory of the snapshot
+            user_data_directory (str): directory to restore into
+        """
+        source = Path(snapshot_path)
+        target = Path(user_data_directory)
+        started = time.perf_counter()
+        self.remove_user_data_directory(user_data_directory)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if source.is_dir():
+            self._copy_tree(source, target)
+        else:
+            with tarfile.open(source, "r:gz") as tar:
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(target, filter="data")
+                else:
+                    tar.extractall(target)
+        logger.info(f"User data snapshot restored in "
+                    f"{time.perf_counter() - started:.2f}s: {target}")
+
+    @keyword("Is User Data Snapshot Available")
+    def is_user_data_snapshot_available(self,
+                                        snapshot_path: Optional[str],
+                                        max_age: int = 3600) -> bool:
+        """
+        Checks if a snapshot exists and is younger than ``max_age``.
+
+        Args:
+            snapshot_path (Optional[str]): tarball file or directory
+            max_age (int): maximum snapshot age in seconds. Defaults to 3600.
+
+        Returns:
+            bool: True if the snapshot can be restored
+        """
+        if snapshot_path is None or not Path(snapshot_path).exists():
+            logger.info("No user data snapshot captured yet.")
+            return False
+        age = time.time() - Path(snapshot_path).stat().st_mtime
+        if age > int(max_age):
+            logger.info(f"User data snapshot is {age:.0f}s old.")
+            return False
+        return True
+
+    @keyword("Remove User Data Directory")
+    def remove_user_data_directory(self, user_data_directory: str) -> None:
+        """
+        Removes a user data directory.
+
+        The directory is renamed first, which frees its path immediately,
+        and deleted afterwards. Files still locked by a closing browser do
+        not fail the removal.
+
+        Args:
+            user_data_directory (str): directory to remove
+        """
+        directory = Path(user_data_directory)
+        if not directory.exists():
+            return
+        trash = directory.with_name(f".{directory.name}.{uuid.uuid4().hex}")
+        os.replace(directory, trash)
+        shutil.rmtree(trash, ignore_errors=True)
+
+    @staticmethod
+    def _copy_tree(source: Path, target: Path) -> None:
+        if sys.platform.startswith("linux") and shutil.which("cp"):
+            result = subprocess.run(
+                ["cp", "-a", "--reflink=auto", str(source), str(target)],
+                capture_output=True, text=True, check=False)
+            if result.returncode == 0:
+                return
+            logger.info(f"cp failed, copying with Python: {result.stderr}")
+            shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(source, target, symlinks=True)
+
+    @staticmethod
+    def _replace(temporary: Path, target: Path) -> None:
+        if target.is_dir():
+            trash = Path(tempfile.mkdtemp(dir=target.parent))
+            os.replace(target, trash / target.name)
+            os.replace(temporary, target)
+            shutil.rmtree(trash, ignore_errors=True)
+        else:
+            os.replace(temporary, target)
+
+    @staticmethod
+    def _exclude_member(member: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+        if EXCLUDED_NAMES.intersection(Path(member.name).parts):
+            return None
+        return member
+
+    @staticmethod
+    def _ignore_names(directory: str, names: list) -> set:
+        return EXCLUDED_NAMES.intersection(names)
+
+
+if __name__ == "__main__":
+
+    pass
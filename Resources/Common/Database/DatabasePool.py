@@ -0,0 +1,667 @@
+"""
+Keyword library leasing pooled database connections to tests.
+
+One connection pool is created per process and environment, keyed by
+``${SOVOS_ENVIRONMENT}``, with the settings of DatabaseConfiguration.yaml.
+All suites share it, so a test leases an open connection instead of
+connecting from scratch. Leases are returned when the test or suite that
+took them ends.
+
+Oracle environments use an ``oracledb`` session pool. The ``sqlite3``
+driver is a local stand-in with the same interface, used by the LOCAL
+environment and the acceptance tests.
+"""
+
+import csv
+import os
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import yaml
+from robot.api import logger
+from robot.api.deco import keyword, library
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+CONFIGURATION_FILE = Path(__file__).parent / "DatabaseConfiguration.yaml"
+DEFAULT_ALIAS = "default"
+
+
+class ConnectionPool(ABC):
+    """
+    Connection pool interface with lease statistics.
+
+    Subclasses open, hand out and close the connections of one driver.
+    """
+
+    driver = ""
+    concurrent_writes = True
+
+    def __init__(self, environment: str, maximum: int, timeout: float):
+        self.environment = environment
+        self.maximum = maximum
+        self.timeout = timeout
+        self.leases = 0
+        self.peak_busy = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Any:
+        """Lease a connection, waiting up to the acquire timeout."""
+        start = time.perf_counter()
+        connection = self._acquire()
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.leases += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            self.peak_busy = max(self.peak_busy, self.busy)
+        return connection
+
+    def release(self, connection: Any) -> None:
+        """Return a leased connection, rolling back uncommitted work."""
+        try:
+            connection.rollback()
+        except Exception as error:
+            logger.warn(f"Rolling back a {self.environment} connection "
+                        f"failed: {error}")
+        self._release(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, busy connections and lease wait times."""
+        return {
+            "environment": self.environment,
+            "driver": self.driver,
+            "opened": self.opened,
+            "busy": self.busy,
+            "max": self.maximum,
+            "leases": self.leases,
+            "peak_busy": self.peak_busy,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+    def insert_sql(self, table: str, columns: Sequence[str]) -> str:
+        """INSERT statement binding the columns in order."""
+        placeholders = ", ".join(self.placeholder(position) for position
+                                 in range(1, len(columns) + 1))
+        return (f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({placeholders})")
+
+    @abstractmethod
+    def upsert_sql(self, table: str, columns: Sequence[str],
+                   keys: Sequence[str]) -> str:
+        """
+        Statement inserting a row or updating the row with the same keys.
+
+        The columns are bound in order, like ``insert_sql``.
+        """
+
+    @staticmethod
+    @abstractmethod
+    def placeholder(position: int) -> str:
+        """Bind placeholder of the parameter at ``position``, from 1."""
+
+    @property
+    @abstractmethod
+    def opened(self) -> int:
+        """Open connections, leased or idle."""
+
+    @property
+    @abstractmethod
+    def busy(self) -> int:
+        """Leased connections."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Close all connections of the pool."""
+
+    @abstractmethod
+    def _acquire(self) -> Any:
+        """Take a connection from the driver pool."""
+
+    @abstractmethod
+    def _release(self, connection: Any) -> None:
+        """Give a connection back to the driver pool."""
+
+
+class OraclePool(ConnectionPool):
+    """
+    ``oracledb`` session pool, in thin mode unless the client is loaded.
+    """
+
+    driver = "oracledb"
+
+    def __init__(self, environment: str, dsn: str, user: str, password: str,
+                 minimum: int, maximum: int, increment: int,
+                 timeout: float):
+        super().__init__(environment, maximum, timeout)
+        import oracledb
+
+        self._pool = oracledb.create_pool(
+            user=user,
+            password=password,
+            dsn=dsn,
+            min=minimum,
+            max=maximum,
+            increment=increment,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=int(timeout * 1000))
+
+    def upsert_sql(self, table: str, columns: Sequence[str],
+                   keys: Sequence[str]) -> str:
+        selected = ", ".join(f":{position} AS {column}" for position, column
+                             in enumerate(columns, start=1))
+        matches = " AND ".join(f"target.{key} = source.{key}"
+                               for key in keys)
+        updates = ", ".join(f"target.{column} = source.{column}"
+                            for column in columns if column not in keys)
+        sql = (f"MERGE INTO {table} target "
+               f"USING (SELECT {selected} FROM dual) source "
+               f"ON ({matches})")
+        values = ", ".join(f"source.{column}" for column in columns)
+        if updates:
+            sql += f" WHEN MATCHED THEN UPDATE SET {updates}"
+        return (f"{sql} WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) "
+                f"VALUES ({values})")
+
+    @staticmethod
+    def placeholder(position: int) -> str:
+        return f":{position}"
+
+    @property
+    def opened(self) -> int:
+        return self._pool.opened
+
+    @property
+    def busy(self) -> int:
+        return self._pool.busy
+
+    def close(self) -> None:
+        self._pool.close(force=True)
+
+    def _acquire(self) -> Any:
+        return self._pool.acquire()
+
+    def _release(self, connection: Any) -> None:
+        self._pool.release(connection)
+
+
+class SqlitePool(ConnectionPool):
+    """
+    ``sqlite3`` stand-in pool for local runs without an Oracle database.
+
+    Use a shared cache URI, e.g.
+    ``file:name?mode=memory&cache=shared``, for an in-memory database seen
+    by all connections of the pool.
+    """
+
+    driver = "sqlite3"
+    # Writers of a shared cache database lock whole tables.
+    concurrent_writes = False
+
+    def __init__(self, environment: str, dsn: str, minimum: int,
+                 maximum: int, timeout: float):
+        super().__init__(environment, maximum, timeout)
+        self.dsn = dsn
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(maximum)
+        self._opened = 0
+        self._busy = 0
+        for _ in range(minimum):
+            self._idle.put(self._connect())
+
+    def upsert_sql(self, table: str, columns: Sequence[str],
+                   keys: Sequence[str]) -> str:
+        updates = ", ".join(f"{column} = excluded.{column}"
+                            for column in columns if column not in keys)
+        action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        return (f"{self.insert_sql(table, columns)} "
+                f"ON CONFLICT ({', '.join(keys)}) {action}")
+
+    @staticmethod
+    def placeholder(position: int) -> str:
+        return "?"
+
+    @property
+    def opened(self) -> int:
+        return self._opened
+
+    @property
+    def busy(self) -> int:
+        return self._busy
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            self._opened -= 1
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.dsn, uri=True,
+                                     timeout=self.timeout,
+                                     check_same_thread=False)
+        self._opened += 1
+        return connection
+
+    def _acquire(self) -> sqlite3.Connection:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No free {self.environment} database "
+                               f"connection within {self.timeout}s, all "
+                               f"{self.maximum} are leased.")
+        with self._lock:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    self._slots.release()
+                    raise
+            self._busy += 1
+            return connection
+
+    def _release(self, connection: sqlite3.Connection) -> None:
+        with self._lock:
+            self._busy -= 1
+        self._idle.put(connection)
+        self._slots.release()
+
+
+# Pools of the process by environment, shared by every library instance.
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+@library(scope="GLOBAL", version="1.0")
+class DatabasePool():
+    """
+    Pooled database connections leased to tests.
+
+    ``Lease Database Connection`` takes a connection of the pool of
+    ``${SOVOS_ENVIRONMENT}`` under an alias. The SQL keywords use the
+    ``default`` alias unless another is given. A lease taken in a test is
+    returned when the test ends, one taken in a suite setup when the suite
+    ends.
+
+    Use ``?`` placeholders with the LOCAL sqlite3 stand-in and ``:1``,
+    ``:2``... with Oracle. ``Bulk Insert Rows`` creates them itself.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, configuration_file: str = str(CONFIGURATION_FILE)):
+        """
+        Args:
+            configuration_file (str): YAML file with the
+                DATABASE_POOL_CONFIGURATION and DATABASE_ENVIRONMENTS.
+                Defaults to DatabaseConfiguration.yaml next to this library.
+        """
+        self.ROBOT_LIBRARY_LISTENER = self
+        self.configuration_file = Path(configuration_file)
+        with open(self.configuration_file, encoding="utf-8") as file:
+            data = yaml.safe_load(file) or {}
+        self.pool_configuration: Dict[str, Any] = \
+            data.get("DATABASE_POOL_CONFIGURATION") or {}
+        self.environments: Dict[str, dict] = \
+            data.get("DATABASE_ENVIRONMENTS") or {}
+        self._leases: Dict[str, Tuple[ConnectionPool, Any, Optional[str]]] \
+            = {}
+        self._owners: List[str] = []
+
+    @keyword("Lease Database Connection")
+    def lease_database_connection(self, alias: str = DEFAULT_ALIAS,
+                                  environment: Optional[str] = None) -> None:
+        """
+        Leases a connection of the environment pool under ``alias``.
+
+        The pool is created on the first lease of the environment in this
+        process.
+
+        Args:
+            alias (str): name of the lease, defaults to ``default``
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+        """
+        if alias in self._leases:
+            raise ValueError(f"Database connection '{alias}' is already "
+                             f"leased, release it first.")
+        pool = self.get_pool(environment)
+        connection = pool.acquire()
+        owner = self._owners[-1] if self._owners else None
+        self._leases[alias] = (pool, connection, owner)
+        logger.info(f"Leased {pool.environment} database connection "
+                    f"'{alias}' ({pool.busy}/{pool.maximum} busy).")
+
+    @keyword("Release Database Connection")
+    def release_database_connection(self,
+                                    alias: str = DEFAULT_ALIAS) -> None:
+        """
+        Returns the connection leased under ``alias`` to its pool.
+
+        Uncommitted changes are rolled back.
+
+        Args:
+            alias (str): name of the lease, defaults to ``default``
+        """
+        lease = self._leases.pop(alias, None)
+        if lease is None:
+            raise ValueError(f"No database connection '{alias}' is leased.")
+        pool, connection, _ = lease
+        pool.release(connection)
+
+    @keyword("Execute Sql")
+    def execute_sql(self, sql: str, parameters: Optional[Sequence] = None,
+                    alias: str = DEFAULT_ALIAS, commit: bool = True) -> int:
+        """
+        Executes one statement, e.g. an UPDATE or DDL.
+
+        Args:
+            sql (str): the statement
+            parameters (Optional[Sequence]): bind values
+            alias (str): name of the lease, defaults to ``default``
+            commit (bool): commit after the statement, defaults to True
+
+        Returns:
+            int: rows affected
+        """
+        connection = self.get_connection(alias)
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, list(parameters or ()))
+            rowcount = cursor.rowcount
+        finally:
+            cursor.close()
+        if commit:
+            connection.commit()
+        return rowcount
+
+    @keyword("Query Rows")
+    def query_rows(self, sql: str, parameters: Optional[Sequence] = None,
+                   alias: str = DEFAULT_ALIAS) -> List[tuple]:
+        """
+        Returns all rows of a query.
+
+        Use ``Stream Query To Csv`` or ``Run Keyword For Query Batches`` for
+        large results.
+
+        Args:
+            sql (str): the query
+            parameters (Optional[Sequence]): bind values
+            alias (str): name of the lease, defaults to ``default``
+
+        Returns:
+            List[tuple]: rows
+        """
+        return [row for batch in self.stream_query(sql, parameters, alias)
+                for row in batch]
+
+    @keyword("Bulk Insert Rows")
+    def bulk_insert_rows(self, table: str, columns: Sequence[str],
+                         rows: Sequence[Any], alias: str = DEFAULT_ALIAS,
+                         batch_size: Optional[int] = None,
+                         commit: bool = True) -> int:
+        """
+        Inserts rows with array binds, one round trip per batch.
+
+        Args:
+            table (str): table name
+            columns (Sequence[str]): column names
+            rows (Sequence[Any]): rows as lists in column order, or as
+                dictionaries by column name
+            alias (str): name of the lease, defaults to ``default``
+            batch_size (Optional[int]): rows per executemany, defaults to
+                BATCH_SIZE
+            commit (bool): commit after all batches, defaults to True
+
+        Returns:
+            int: rows inserted
+        """
+        pool, connection, _ = self._get_lease(alias)
+        columns = list(columns)
+        batch_size = int(batch_size or self.pool_configuration.get(
+            "BATCH_SIZE", 1000))
+        sql = pool.insert_sql(table, columns)
+        values = [[row[column] for column in columns]
+                  if isinstance(row, dict) else list(row) for row in rows]
+        cursor = connection.cursor()
+        try:
+            for start in range(0, len(values), batch_size):
+                cursor.executemany(sql, values[start:start + batch_size])
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        if commit:
+            connection.commit()
+        logger.info(f"Inserted {len(values)} rows into {table}.")
+        return len(values)
+
+    @keyword("Stream Query To Csv")
+    def stream_query_to_csv(self, sql: str, path: str,
+                            parameters: Optional[Sequence] = None,
+                            alias: str = DEFAULT_ALIAS,
+                            fetch_size: Optional[int] = None) -> int:
+        """
+        Writes the rows of a query to a CSV file, one batch in memory.
+
+        The first line holds the column names.
+
+        Args:
+            sql (str): the query
+            path (str): CSV file to write
+            parameters (Optional[Sequence]): bind values
+            alias (str): name of the lease, defaults to ``default``
+            fetch_size (Optional[int]): rows per fetch, defaults to
+                FETCH_SIZE
+
+        Returns:
+            int: rows written
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            batches = self.stream_query(sql, parameters, alias, fetch_size,
+                                        header=True)
+            writer.writerow(next(batches))
+            for batch in batches:
+                writer.writerows(batch)
+                count += len(batch)
+        return count
+
+    @keyword("Run Keyword For Query Batches")
+    def run_keyword_for_query_batches(self, sql: str, name: str,
+                                      parameters: Optional[Sequence] = None,
+                                      alias: str = DEFAULT_ALIAS,
+                                      fetch_size: Optional[int] = None
+                                      ) -> int:
+        """
+        Runs a keyword with every batch of rows of a query.
+
+        The keyword gets the batch as a list of rows.
+
+        Args:
+            sql (str): the query
+            name (str): keyword to run
+            parameters (Optional[Sequence]): bind values
+            alias (str): name of the lease, defaults to ``default``
+            fetch_size (Optional[int]): rows per batch, defaults to
+                FETCH_SIZE
+
+        Returns:
+            int: rows processed
+        """
+        count = 0
+        for batch in self.stream_query(sql, parameters, alias, fetch_size):
+            BuiltIn().run_keyword(name, batch)
+            count += len(batch)
+        return count
+
+    @keyword("Get Database Pool Stats")
+    def get_database_pool_stats(self, environment: Optional[str] = None
+                                ) -> Dict[str, Any]:
+        """
+        Returns the statistics of the environment pool.
+
+        Args:
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+
+        Returns:
+            Dict[str, Any]: environment, driver, opened, busy, max, leases,
+                peak_busy, wait_seconds and max_wait_seconds
+        """
+        environment = self._get_environment(environment)
+        pool = _pools.get(environment)
+        if pool is None:
+            raise ValueError(f"No database pool of environment "
+                             f"'{environment}' is open.")
+        return pool.stats()
+
+    @keyword("Close Database Pools")
+    def close_database_pools(self) -> None:
+        """
+        Releases all leases and closes the pools of this process.
+        """
+        for alias in list(self._leases):
+            self.release_database_connection(alias)
+        with _pools_lock:
+            for environment, pool in list(_pools.items()):
+                logger.info(f"Closing {environment} database pool: "
+                            f"{pool.stats()}")
+                pool.close()
+                del _pools[environment]
+
+    def get_pool(self, environment: Optional[str] = None) -> ConnectionPool:
+        """
+        Returns the pool of the environment, created once per process.
+
+        Args:
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+        """
+        environment = self._get_environment(environment)
+        with _pools_lock:
+            pool = _pools.get(environment)
+            if pool is None:
+                pool = _pools[environment] = self._create_pool(environment)
+        return pool
+
+    def get_connection(self, alias: str = DEFAULT_ALIAS) -> Any:
+        """Returns the DB API connection leased under ``alias``."""
+        return self._get_lease(alias)[1]
+
+    def stream_query(self, sql: str, parameters: Optional[Sequence] = None,
+                     alias: str = DEFAULT_ALIAS,
+                     fetch_size: Optional[int] = None,
+                     header: bool = False) -> Iterator[Any]:
+        """
+        Yields the rows of a query in batches of ``fetchmany``.
+
+        Args:
+            sql (str): the query
+            parameters (Optional[Sequence]): bind values
+            alias (str): name of the lease, defaults to ``default``
+            fetch_size (Optional[int]): rows per batch, defaults to
+                FETCH_SIZE
+            header (bool): yield the column names first
+
+        Returns:
+            Iterator[Any]: lists of rows, after the column names
+        """
+        fetch_size = int(fetch_size or self.pool_configuration.get(
+            "FETCH_SIZE", 1000))
+        cursor = self.get_connection(alias).cursor()
+        try:
+            cursor.arraysize = fetch_size
+            cursor.execute(sql, list(parameters or ()))
+            if header:
+                yield [column[0] for column in cursor.description or ()]
+            while True:
+                batch = cursor.fetchmany(fetch_size)
+                if not batch:
+                    break
+                yield batch
+        finally:
+            cursor.close()
+
+    def start_suite(self, name: str, attributes: dict) -> None:
+        self._owners.append(attributes["id"])
+
+    def end_suite(self, name: str, attributes: dict) -> None:
+        if self._owners:
+            self._owners.pop()
+        self._release_owned(attributes["id"])
+
+    def start_test(self, name: str, attributes: dict) -> None:
+        self._owners.append(attributes["id"])
+
+    def end_test(self, name: str, attributes: dict) -> None:
+        if self._owners:
+            self._owners.pop()
+        self._release_owned(attributes["id"])
+
+    def _release_owned(self, owner_id: str) -> None:
+        for alias, (_, _, owner) in list(self._leases.items()):
+            if owner == owner_id:
+                self.release_database_connection(alias)
+
+    def _get_lease(self, alias: str) -> Tuple[ConnectionPool, Any,
+                                               Optional[str]]:
+        lease = self._leases.get(alias)
+        if lease is None:
+            raise ValueError(f"No database connection '{alias}' is leased, "
+                             f"use Lease Database Connection first.")
+        return lease
+
+    def _create_pool(self, environment: str) -> ConnectionPool:
+        entry = self.environments.get(environment)
+        if not entry:
+            raise ValueError(f"DATABASE_ENVIRONMENTS has no environment "
+                             f"'{environment}' in "
+                             f"{self.configuration_file.name}.")
+        dsn = entry.get("DSN") or os.environ.get(
+            entry.get("DSN_VARIABLE") or "")
+        if not dsn:
+            raise ValueError(f"Database of environment '{environment}' has "
+                             f"no DSN, set {entry.get('DSN_VARIABLE')} or "
+                             f"DSN in {self.configuration_file.name}.")
+        settings = self.pool_configuration
+        minimum = int(settings.get("MIN", 1))
+        maximum = int(settings.get("MAX", 4))
+        timeout = float(settings.get("ACQUIRE_TIMEOUT", 30))
+        driver = entry.get("DRIVER", "oracledb")
+        logger.info(f"Creating {driver} database pool of environment "
+                    f"'{environment}' ({minimum}-{maximum} connections).")
+        if driver == "sqlite3":
+            return SqlitePool(environment, dsn, minimum, maximum, timeout)
+        if driver == "oracledb":
+            return OraclePool(
+                environment, dsn,
+                os.environ.get(entry.get("USER_VARIABLE") or "", ""),
+                os.environ.get(entry.get("PASSWORD_VARIABLE") or "", ""),
+                minimum, maximum, int(settings.get("INCREMENT", 1)),
+                timeout)
+        raise ValueError(f"Unknown database driver '{driver}' of "
+                         f"environment '{environment}', use oracledb or "
+                         f"sqlite3.")
+
+    @staticmethod
+    def _get_environment(environment: Optional[str]) -> str:
+        if environment is not None:
+            return environment
+        try:
+            return BuiltIn().get_variable_value("${SOVOS_ENVIRONMENT}", "QA")
+        except RobotNotRunningError:
+            return os.environ.get("SOVOS_ENVIRONMENT", "QA")
+
+
+if __name__ == "__main__":
+
+    pass
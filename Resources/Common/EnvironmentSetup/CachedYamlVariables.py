@@ -0,0 +1,234 @@
+"""
+Variable file loading YAML configuration files once per process.
+
+Robot Framework parses a YAML variable file again in every suite importing
+it. This variable file parses each YAML file with the libyaml C loader when
+available, validates it against its schema and keeps the result per file
+and modification time. Every later import returns the same immutable
+values: dictionaries become ``FrozenDotDict`` and lists become tuples.
+
+Usage:
+    Variables    Common/EnvironmentSetup/CachedYamlVariables.py
+    ...          ${CURDIR}${/}BrowserConfiguration.yaml
+    ...          ${CURDIR}${/}..${/}EnvironmentSetup${/}DisplayResolutions.yaml
+
+Use ``Copy Dictionary`` for a mutable copy of a dictionary.
+"""
+
+import copy
+import sys
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import yaml
+from robot.utils import DotDict
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+OPTIONAL = type(None)
+
+
+class FrozenDotDict(DotDict):
+    """
+    DotDict that can not be modified after it is created.
+
+    ``copy()`` and ``copy.deepcopy`` return mutable DotDicts.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        object.__setattr__(self, "_frozen", True)
+
+    def _readonly(self):
+        if getattr(self, "_frozen", False):
+            raise TypeError("Configuration loaded from YAML is read-only, "
+                            "use Copy Dictionary for a modifiable copy.")
+
+    def __setitem__(self, key, value):
+        self._readonly()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._readonly()
+        super().__delitem__(key)
+
+    def __setattr__(self, key, value):
+        self._readonly()
+        super().__setattr__(key, value)
+
+    def pop(self, *args):
+        self._readonly()
+        return super().pop(*args)
+
+    def popitem(self, *args):
+        self._readonly()
+        return super().popitem(*args)
+
+    def setdefault(self, *args):
+        self._readonly()
+        return super().setdefault(*args)
+
+    def update(self, *args, **kwargs):
+        self._readonly()
+        super().update(*args, **kwargs)
+
+    def clear(self):
+        self._readonly()
+        super().clear()
+
+    def move_to_end(self, *args):
+        self._readonly()
+        super().move_to_end(*args)
+
+    def copy(self):
+        return DotDict(self)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return DotDict((key, copy.deepcopy(thaw(value), memo))
+                       for key, value in self.items())
+
+    def __reduce__(self):
+        return DotDict, (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Converts dictionaries to FrozenDotDict and lists to tuples."""
+    if isinstance(value, dict):
+        return FrozenDotDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Converts frozen values back to DotDicts and lists."""
+    if isinstance(value, dict):
+        return DotDict((key, thaw(item)) for key, item in value.items())
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def validate_display_resolutions(value: Any) -> None:
+    for name, resolution in value.items():
+        if not isinstance(resolution, dict) \
+                or not isinstance(resolution.get("WIDTH"), int) \
+                or not isinstance(resolution.get("HEIGHT"), int) \
+                or not isinstance(resolution.get("ASPECT"), (str, OPTIONAL)):
+            raise ValueError(f"Display resolution '{name}' needs an integer "
+                             f"WIDTH and HEIGHT and an ASPECT.")
+
+
+# Required variables of the known files, with their type or a validator.
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "BrowserConfiguration.yaml": {
+        "BROWSER_STRATEGY": str,
+        "WEB_BROWSER": str,
+        "BROWSER_IS_HEADLESS": bool,
+        "BROWSER_TIMEOUT": int,
+        "CHROME_ARGS": list,
+        "BROWSER_ROUTING_PROFILE": dict,
+        "DEFAULT_USER_DATA_DIRECTORY": str,
+        "USER_DATA_SNAPSHOT_CONFIGURATION": dict,
+        "CONTEXT_POOL_CONFIGURATION": dict,
+        "BROWSER_SERVER_CONFIGURATION": dict,
+        "DEFAULT_WINDOW_RESOLUTION": str,
+    },
+    "SeleniumLibraryConfiguration.yaml": {
+        "SELENIUM_STRATEGY": str,
+        "WEB_BROWSER": str,
+        "BROWSER_IS_HEADLESS": bool,
+        "USER_DATA_DIR": str,
+        "CHROME_EXECUTABLE_PATH": (str, OPTIONAL),
+        "CHROME_OPTIONS_CONFIGURATION": dict,
+        "SELENIUM_CONFIGURATION": dict,
+        "SELENIUM_POOL_CONFIGURATION": dict,
+        "REMOTE_WEBDRIVER_CONFIGURATION": dict,
+        "DOCKER_COMPOSE_CONFIGURATION": dict,
+        "DEFAULT_WINDOW_RESOLUTION": str,
+    },
+    "DisplayResolutions.yaml": {
+        "DISPLAY_RESOLUTION_DICT": validate_display_resolutions,
+    },
+    "EnvironmentURL.yaml": {
+        "S1_PLATFORM_URL": dict,
+        "SOVOS_API_GATEWAY_URLS": dict,
+        "S1_URL_EXT": dict,
+    },
+}
+
+_cache: Dict[Tuple[str, int], FrozenDotDict] = {}
+
+
+def validate(path: Path, data: Dict[str, Any]) -> None:
+    """
+    Validates the variables of a file against its schema.
+
+    Args:
+        path (Path): the YAML file, its name selects the schema
+        data (Dict[str, Any]): the parsed variables
+
+    Raises:
+        ValueError: a variable is missing or has a wrong type
+    """
+    for name, expected in SCHEMAS.get(path.name, {}).items():
+        if name not in data:
+            raise ValueError(f"{path.name} has no {name}.")
+        if callable(expected) and not isinstance(expected, (type, tuple)):
+            expected(data[name])
+        elif not isinstance(data[name], expected):
+            raise ValueError(f"{name} in {path.name} has an invalid value: "
+                             f"{data[name]!r}")
+
+
+def load_yaml(path: str) -> FrozenDotDict:
+    """
+    Returns the frozen variables of a YAML file, parsed once per mtime.
+
+    Args:
+        path (str): the YAML file, relative paths are also searched in the
+            python path like other variable files
+
+    Returns:
+        FrozenDotDict: the variables of the file
+    """
+    resolved = _find_file(path)
+    key = (str(resolved), resolved.stat().st_mtime_ns)
+    variables = _cache.get(key)
+    if variables is None:
+        with open(resolved, encoding="utf-8") as file:
+            data = yaml.load(file, Loader=SafeLoader) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"{resolved.name} must contain a mapping.")
+        validate(resolved, data)
+        variables = _cache[key] = freeze(data)
+    return variables
+
+
+def get_variables(*paths: str) -> Dict[str, Any]:
+    """
+    Returns the variables of the YAML files, later files override earlier.
+
+    Args:
+        *paths (str): YAML files
+    """
+    variables: Dict[str, Any] = {}
+    for path in paths:
+        variables.update(load_yaml(path))
+    return variables
+
+
+def _find_file(path: str) -> Path:
+    candidates = [Path(path)]
+    if not Path(path).is_absolute():
+        candidates += [Path(base) / path for base in sys.path if base]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate.resolve()
+    raise FileNotFoundError(f"YAML variable file '{path}' does not exist.")
@@ -44,10 +44,17 @@ class RequestsContextUtility():
     rf_builtin = BuiltIn()
 
     def __init__(self, disable_warnings: bool = False):
-        self.rf_requests = self._get_requests_library_instance()
+        self._rf_requests = None
         if disable_warnings:
             urllib3.disable_warnings()
 
+    @property
+    def rf_requests(self) -> RequestsLibrary:
+        """RequestsLibrary instance, looked up on first use."""
+        if self._rf_requests is None:
+            self._rf_requests = self._get_requests_library_instance()
+        return self._rf_requests
+
     @not_keyword
     def _get_requests_library_instance(self) -> RequestsLibrary:
         try:
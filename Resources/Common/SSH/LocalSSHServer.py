@@ -0,0 +1,186 @@
+"""
+Keyword library starting a local paramiko SSH server as a stand-in host.
+
+The server listens on 127.0.0.1 only, accepts one generated password,
+runs commands with the local shell and serves files over SFTP. It is meant
+for the acceptance tests and for trying SSH keywords without a target
+host, not as a real SSH server.
+"""
+
+import os
+import secrets
+import socket
+import subprocess
+import threading
+from typing import List, Optional
+
+import paramiko
+from robot.api.deco import keyword, library
+from robot.utils import DotDict
+
+
+class LocalSFTPHandle(paramiko.SFTPHandle):
+    """
+    Read-only handle of a local file.
+    """
+
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(
+            os.fstat(self.readfile.fileno()))
+
+
+class LocalSFTPServer(paramiko.SFTPServerInterface):
+    """
+    Read-only SFTP access to the local file system.
+    """
+
+    def open(self, path, flags, attr):
+        if flags & (os.O_WRONLY | os.O_RDWR):
+            return paramiko.SFTP_PERMISSION_DENIED
+        try:
+            handle = LocalSFTPHandle(flags)
+            handle.readfile = open(path, "rb")
+        except OSError as error:
+            return paramiko.SFTPServer.convert_errno(error.errno)
+        handle.filename = path
+        return handle
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(path))
+        except OSError as error:
+            return paramiko.SFTPServer.convert_errno(error.errno)
+
+    def lstat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(path))
+        except OSError as error:
+            return paramiko.SFTPServer.convert_errno(error.errno)
+
+
+class LocalServerInterface(paramiko.ServerInterface):
+    """
+    Password authentication and exec requests run with the local shell.
+    """
+
+    def __init__(self, username: str, password: str):
+        self.username = username
+        self.password = password
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if secrets.compare_digest(f"{username}\0{password}",
+                                  f"{self.username}\0{self.password}"):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(target=self._run, args=(channel, command),
+                         daemon=True).start()
+        return True
+
+    @staticmethod
+    def _run(channel: paramiko.Channel, command: bytes) -> None:
+        process = subprocess.Popen(command.decode("utf-8"), shell=True,
+                                   stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+
+        def forward_stderr():
+            for chunk in iter(lambda: process.stderr.read1(65536), b""):
+                channel.sendall_stderr(chunk)
+
+        stderr = threading.Thread(target=forward_stderr, daemon=True)
+        stderr.start()
+        for chunk in iter(lambda: process.stdout.read1(65536), b""):
+            channel.sendall(chunk)
+        stderr.join()
+        channel.send_exit_status(process.wait())
+        channel.close()
+
+
+@library(scope="GLOBAL", version="1.0")
+class LocalSSHServer():
+    """
+    Local stand-in SSH server for the SSH keywords.
+
+    ``Start Local SSH Server`` returns the host, port, username and
+    password to use with ``Open SSH Connection``.
+    """
+
+    def __init__(self):
+        self._socket: Optional[socket.socket] = None
+        self._transports: List[paramiko.Transport] = []
+        self._host_key: Optional[paramiko.RSAKey] = None
+        self.connections = 0
+
+    @keyword("Start Local SSH Server")
+    def start_local_ssh_server(self, username: str = "robot") -> DotDict:
+        """
+        Starts the server on a free port of 127.0.0.1.
+
+        Args:
+            username (str): user accepted by the server
+
+        Returns:
+            DotDict: host, port, username and the generated password
+        """
+        self.stop_local_ssh_server()
+        if self._host_key is None:
+            self._host_key = paramiko.RSAKey.generate(2048)
+        password = secrets.token_urlsafe(16)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(8)
+        threading.Thread(target=self._accept,
+                         args=(self._socket, username, password),
+                         daemon=True).start()
+        return DotDict(host="127.0.0.1", port=self._socket.getsockname()[1],
+                       username=username, password=password)
+
+    @keyword("Stop Local SSH Server")
+    def stop_local_ssh_server(self) -> None:
+        """
+        Stops the server and closes its connections.
+        """
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
+
+    @keyword("Get Local SSH Server Connections")
+    def get_local_ssh_server_connections(self) -> int:
+        """
+        Returns the number of connections the server accepted.
+        """
+        return self.connections
+
+    def _accept(self, server: socket.socket, username: str,
+                password: str) -> None:
+        while True:
+            try:
+                client, _ = server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self._host_key)
+            transport.set_subsystem_handler("sftp", paramiko.SFTPServer,
+                                            LocalSFTPServer)
+            transport.start_server(server=LocalServerInterface(username,
+                                                               password))
+            self._transports.append(transport)
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,482 @@
+"""
+Keyword library running commands on target hosts over shared SSH
+connections.
+
+One paramiko transport is kept per host, port and user for the whole
+process, so the key exchange and authentication happen once. Every
+command and file transfer opens a channel over it, and commands on many
+hosts run concurrently. Remote log files are read in chunks over SFTP,
+keeping only one chunk and the matching lines in memory.
+"""
+
+import os
+import re
+import select
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import paramiko
+import yaml
+from robot.api import logger
+from robot.api.deco import keyword, library
+from robot.utils import DotDict
+
+CONFIGURATION_FILE = Path(__file__).parent / "SSHConfiguration.yaml"
+HOST_KEY_POLICIES = ("reject", "warn", "accept")
+
+
+class SharedTransport:
+    """
+    Bookkeeping for the transport of one host, port and user.
+    """
+
+    def __init__(self, host: str, port: int, username: str):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.transport: Optional[paramiko.Transport] = None
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self.channels = 0
+        self.bytes_received = 0
+        self.lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.transport is not None and self.transport.is_active()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "port": self.port,
+            "username": self.username,
+            "active": self.active,
+            "connects": self.connects,
+            "connect_seconds": round(self.connect_seconds, 3),
+            "channels": self.channels,
+            "bytes_received": self.bytes_received,
+        }
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+
+# Transports of the process by (host, port, user), shared by every alias.
+_transports: Dict[Tuple[str, int, str], SharedTransport] = {}
+_transports_lock = threading.Lock()
+
+
+@library(scope="GLOBAL", version="1.0")
+class SSHConnectionManager():
+    """
+    Shared SSH connections to target hosts.
+
+    ``Open SSH Connection`` registers a host under an alias, the connection
+    is made by the first command. Aliases of the same host, port and user
+    share one connection, and concurrent commands run on their own
+    channels of it.
+
+    Host keys are checked against ``KNOWN_HOSTS_FILE``. A changed key always
+    fails, an unknown key is handled by ``UNKNOWN_HOST_POLICY`` of
+    SSHConfiguration.yaml or the ``host_key_policy`` argument.
+    """
+
+    def __init__(self, configuration_file: str = str(CONFIGURATION_FILE)):
+        """
+        Args:
+            configuration_file (str): YAML file with the
+                SSH_CONNECTION_CONFIGURATION and SSH_HOSTS. Defaults to
+                SSHConfiguration.yaml next to this library.
+        """
+        self.configuration_file = Path(configuration_file)
+        with open(self.configuration_file, encoding="utf-8") as file:
+            data = yaml.safe_load(file) or {}
+        self.configuration: Dict[str, Any] = \
+            data.get("SSH_CONNECTION_CONFIGURATION") or {}
+        self.hosts: Dict[str, dict] = data.get("SSH_HOSTS") or {}
+        self.chunk_size = int(self.configuration.get("CHUNK_SIZE", 65536))
+        self.max_line_size = int(self.configuration.get("MAX_LINE_SIZE",
+                                                        1048576))
+        self._connections: Dict[str, DotDict] = {}
+
+    @keyword("Open SSH Connection")
+    def open_ssh_connection(self, alias: str, host: Optional[str] = None,
+                            username: Optional[str] = None,
+                            password: Optional[str] = None,
+                            key_file: Optional[str] = None,
+                            port: Optional[int] = None,
+                            host_key_policy: Optional[str] = None) -> None:
+        """
+        Registers a host under ``alias``.
+
+        Without ``host`` the host and its credentials are taken from
+        SSH_HOSTS of the configuration. Without password and key file the
+        keys of the SSH agent are tried.
+
+        Args:
+            alias (str): name of the connection
+            host (Optional[str]): host name or address
+            username (Optional[str]): user to log in
+            password (Optional[str]): password, or passphrase of the key
+            key_file (Optional[str]): private key file
+            port (Optional[int]): defaults to PORT
+            host_key_policy (Optional[str]): reject, warn or accept unknown
+                host keys, defaults to UNKNOWN_HOST_POLICY
+        """
+        if host is None:
+            entry = self.hosts.get(alias)
+            if not entry:
+                raise ValueError(f"SSH_HOSTS has no host '{alias}' in "
+                                 f"{self.configuration_file.name}.")
+            host = entry["HOST"]
+            port = port or entry.get("PORT")
+            username = username or os.environ.get(
+                entry.get("USER_VARIABLE") or "")
+            password = password or os.environ.get(
+                entry.get("PASSWORD_VARIABLE") or "")
+            key_file = key_file or os.environ.get(
+                entry.get("KEY_FILE_VARIABLE") or "")
+        if not username:
+            raise ValueError(f"SSH connection '{alias}' has no username.")
+        policy = host_key_policy or self.configuration.get(
+            "UNKNOWN_HOST_POLICY", "warn")
+        if policy not in HOST_KEY_POLICIES:
+            raise ValueError(f"Unknown host key policy '{policy}', use one "
+                             f"of: {', '.join(HOST_KEY_POLICIES)}")
+        port = int(port or self.configuration.get("PORT", 22))
+        key = (host, port, username)
+        with _transports_lock:
+            _transports.setdefault(key, SharedTransport(*key))
+        self._connections[alias] = DotDict(
+            key=key, password=password or None, key_file=key_file or None,
+            policy=policy)
+
+    @keyword("Execute SSH Command")
+    def execute_ssh_command(self, command: str, alias: str,
+                            timeout: Optional[float] = None,
+                            expected_rc: Optional[int] = None) -> DotDict:
+        """
+        Runs a command on the host of ``alias``.
+
+        Args:
+            command (str): the command
+            alias (str): name of the connection
+            timeout (Optional[float]): seconds, defaults to COMMAND_TIMEOUT
+            expected_rc (Optional[int]): fail when the exit code differs
+
+        Returns:
+            DotDict: alias, host, stdout, stderr, rc and seconds
+        """
+        result = self._execute(command, alias, timeout)
+        if expected_rc is not None and result.rc != int(expected_rc):
+            raise AssertionError(f"Command '{command}' on {result.host} "
+                                 f"returned {result.rc}, expected "
+                                 f"{expected_rc}: {result.stderr.strip()}")
+        return result
+
+    @keyword("Execute SSH Command On Hosts")
+    def execute_ssh_command_on_hosts(self, command: str, *aliases: str,
+                                     timeout: Optional[float] = None,
+                                     parallel: Optional[int] = None
+                                     ) -> Dict[str, DotDict]:
+        """
+        Runs a command on many hosts at the same time.
+
+        A failing connection or an unknown alias is reported as rc -1 with
+        the error in stderr and does not stop the other hosts.
+
+        Args:
+            command (str): the command
+            *aliases (str): names of the connections, defaults to all
+            timeout (Optional[float]): seconds, defaults to COMMAND_TIMEOUT
+            parallel (Optional[int]): hosts at the same time, defaults to
+                PARALLEL
+
+        Returns:
+            Dict[str, DotDict]: results by alias
+        """
+        aliases = aliases or tuple(self._connections)
+
+        def run(alias: str) -> DotDict:
+            try:
+                return self._execute(command, alias, timeout)
+            except (paramiko.SSHException, OSError, ValueError) as error:
+                connection = self._connections.get(alias)
+                host = connection.key[0] if connection else alias
+                return DotDict(alias=alias, host=host, stdout="",
+                               stderr=f"{type(error).__name__}: {error}",
+                               rc=-1, seconds=0.0)
+
+        workers = int(parallel or self.configuration.get("PARALLEL", 8))
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            results = dict(zip(aliases, executor.map(run, aliases)))
+        for alias, result in results.items():
+            logger.info(f"{alias}: rc {result.rc} in {result.seconds}s")
+        return results
+
+    @keyword("Grep Remote File")
+    def grep_remote_file(self, alias: str, path: str, pattern: str,
+                         offset: int = 0,
+                         max_matches: int = 1000) -> DotDict:
+        """
+        Returns the lines of a remote file matching a regular expression.
+
+        The file is read in chunks over SFTP from ``offset``, only one chunk
+        and the matching lines are kept in memory. Pass the returned
+        ``offset`` to read only the lines written since.
+
+        Args:
+            alias (str): name of the connection
+            path (str): remote file
+            pattern (str): regular expression searched in every line
+            offset (int): byte position to start from, defaults to 0
+            max_matches (int): matching lines kept, the last ones win
+
+        Returns:
+            DotDict: matches, count of matching lines, lines read and
+                offset after the last complete line
+        """
+        regex = re.compile(pattern)
+        matches: List[str] = []
+        count = 0
+        lines = 0
+        position = int(offset)
+        for line, position in self._read_lines(alias, path, position):
+            lines += 1
+            if regex.search(line):
+                count += 1
+                matches.append(line)
+                if len(matches) > int(max_matches):
+                    matches.pop(0)
+        return DotDict(matches=matches, count=count, lines=lines,
+                       offset=position)
+
+    @keyword("Download Remote File")
+    def download_remote_file(self, alias: str, path: str, local_path: str,
+                             offset: int = 0) -> int:
+        """
+        Copies a remote file in chunks, e.g. a large log file.
+
+        Args:
+            alias (str): name of the connection
+            path (str): remote file
+            local_path (str): file to write
+            offset (int): byte position to start from, defaults to 0
+
+        Returns:
+            int: bytes written
+        """
+        Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with open(local_path, "wb") as file:
+            for chunk in self._read_chunks(alias, path, int(offset)):
+                file.write(chunk)
+                written += len(chunk)
+        return written
+
+    @keyword("Get SSH Connection Stats")
+    def get_ssh_connection_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the statistics of every connection by alias.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: host, port, username, active,
+                connects, connect_seconds, channels and bytes_received
+        """
+        return {alias: _transports[connection.key].stats()
+                for alias, connection in self._connections.items()}
+
+    @keyword("Close SSH Connections")
+    def close_ssh_connections(self) -> None:
+        """
+        Closes the connections of this process.
+        """
+        with _transports_lock:
+            for shared in _transports.values():
+                if shared.active:
+                    logger.info(f"Closing SSH connection to {shared.host}: "
+                                f"{shared.stats()}")
+                shared.close()
+
+    def get_transport(self, alias: str) -> paramiko.Transport:
+        """
+        Returns the connected transport of ``alias``, connecting it first.
+
+        Args:
+            alias (str): name of the connection
+        """
+        connection = self._connections.get(alias)
+        if connection is None:
+            raise ValueError(f"No SSH connection '{alias}' is open, use "
+                             f"Open SSH Connection first.")
+        shared = _transports[connection.key]
+        with shared.lock:
+            if not shared.active:
+                shared.close()
+                start = time.perf_counter()
+                shared.transport = self._connect(shared, connection)
+                shared.connects += 1
+                shared.connect_seconds += time.perf_counter() - start
+        return shared.transport
+
+    def _connect(self, shared: SharedTransport,
+                 connection: DotDict) -> paramiko.Transport:
+        timeout = float(self.configuration.get("CONNECT_TIMEOUT", 30))
+        sock = socket.create_connection((shared.host, shared.port),
+                                        timeout=timeout)
+        transport = paramiko.Transport(sock)
+        try:
+            transport.banner_timeout = timeout
+            transport.auth_timeout = timeout
+            transport.start_client(timeout=timeout)
+            self._check_host_key(shared, transport, connection.policy)
+            self._authenticate(shared, transport, connection)
+        except Exception:
+            transport.close()
+            raise
+        transport.set_keepalive(int(self.configuration.get("KEEPALIVE",
+                                                           30)))
+        logger.info(f"Connected to {shared.username}@{shared.host}:"
+                    f"{shared.port}.")
+        return transport
+
+    def _check_host_key(self, shared: SharedTransport,
+                        transport: paramiko.Transport, policy: str) -> None:
+        server_key = transport.get_remote_server_key()
+        name = shared.host if shared.port == 22 \
+            else f"[{shared.host}]:{shared.port}"
+        known_hosts = paramiko.HostKeys()
+        path = os.path.expanduser(self.configuration.get(
+            "KNOWN_HOSTS_FILE", "~/.ssh/known_hosts"))
+        if os.path.isfile(path):
+            known_hosts.load(path)
+        known = (known_hosts.lookup(name) or {}).get(server_key.get_name())
+        if known is not None:
+            if known != server_key:
+                raise paramiko.BadHostKeyException(name, server_key, known)
+            return
+        message = (f"Host key {server_key.get_name()} "
+                   f"{server_key.fingerprint} of {name} is not in {path}.")
+        if policy == "reject":
+            raise paramiko.SSHException(message)
+        if policy == "warn":
+            logger.warn(message)
+
+    @staticmethod
+    def _authenticate(shared: SharedTransport,
+                      transport: paramiko.Transport,
+                      connection: DotDict) -> None:
+        if connection.key_file:
+            key = paramiko.PKey.from_path(connection.key_file,
+                                          connection.password)
+            transport.auth_publickey(shared.username, key)
+        elif connection.password:
+            transport.auth_password(shared.username, connection.password)
+        else:
+            for key in paramiko.Agent().get_keys():
+                try:
+                    transport.auth_publickey(shared.username, key)
+                    break
+                except paramiko.AuthenticationException:
+                    continue
+        if not transport.is_authenticated():
+            raise paramiko.AuthenticationException(
+                f"Authentication of {shared.username}@{shared.host} failed.")
+
+    def _execute(self, command: str, alias: str,
+                 timeout: Optional[float]) -> DotDict:
+        transport = self.get_transport(alias)
+        shared = _transports[self._connections[alias].key]
+        timeout = float(timeout or self.configuration.get("COMMAND_TIMEOUT",
+                                                          300))
+        start = time.perf_counter()
+        channel = transport.open_session(timeout=timeout)
+        with shared.lock:
+            shared.channels += 1
+        stdout: List[bytes] = []
+        stderr: List[bytes] = []
+        try:
+            channel.exec_command(command)
+            deadline = time.monotonic() + timeout
+            while True:
+                self._drain(channel, stdout, stderr)
+                if channel.exit_status_ready():
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Command '{command}' on "
+                                       f"{shared.host} did not finish "
+                                       f"within {timeout}s.")
+                select.select([channel], [], [], min(remaining, 1))
+            # Output received with the exit status is still buffered.
+            self._drain(channel, stdout, stderr)
+            rc = channel.recv_exit_status()
+        finally:
+            channel.close()
+        received = sum(map(len, stdout)) + sum(map(len, stderr))
+        with shared.lock:
+            shared.bytes_received += received
+        return DotDict(alias=alias, host=shared.host,
+                       stdout=b"".join(stdout).decode("utf-8", "replace"),
+                       stderr=b"".join(stderr).decode("utf-8", "replace"),
+                       rc=rc, seconds=round(time.perf_counter() - start, 3))
+
+    def _drain(self, channel: paramiko.Channel, stdout: List[bytes],
+               stderr: List[bytes]) -> None:
+        while channel.recv_ready() or channel.recv_stderr_ready():
+            if channel.recv_ready():
+                stdout.append(channel.recv(self.chunk_size))
+            if channel.recv_stderr_ready():
+                stderr.append(channel.recv_stderr(self.chunk_size))
+
+    def _read_chunks(self, alias: str, path: str, offset: int):
+        transport = self.get_transport(alias)
+        shared = _transports[self._connections[alias].key]
+        sftp = paramiko.SFTPClient.from_transport(transport)
+        with shared.lock:
+            shared.channels += 1
+        try:
+            with sftp.open(path, "rb") as remote:
+                remote.seek(offset)
+                while True:
+                    chunk = remote.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    with shared.lock:
+                        shared.bytes_received += len(chunk)
+                    yield chunk
+        finally:
+            sftp.close()
+
+    def _read_lines(self, alias: str, path: str, offset: int):
+        """
+        Yields complete lines and the offset after each of them.
+
+        Lines are cut after ``max_line_size`` bytes, the rest of a longer
+        line is skipped instead of kept in memory.
+        """
+        rest = b""
+        skipped = 0
+        position = offset
+        for chunk in self._read_chunks(alias, path, offset):
+            lines = (rest + chunk).split(b"\n")
+            rest = lines.pop()
+            for line in lines:
+                position += len(line) + skipped + 1
+                skipped = 0
+                yield (line[:self.max_line_size].rstrip(b"\r")
+                       .decode("utf-8", "replace"), position)
+            if len(rest) > self.max_line_size:
+                skipped += len(rest) - self.max_line_size
+                rest = rest[:self.max_line_size]
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,53 @@
+import re
+from pathlib import Path
+
+from SeleniumLibrary.base import LibraryComponent, keyword
+from typing import Optional, Union
+from selenium.webdriver.remote.webelement import WebElement
+
+# Serialises a table or ARIA grid into a list of {header: cell text} rows,
+# shared with the Browser BrowserUtilitiesPlugin.
+TABLE_TO_ROWS = "return ({})(arguments[0], arguments[1]);".format(re.sub(
+    r"^/\*.*?\*/\s*", "",
+    (Path(__file__).parent.parent / "TableToRows.js").read_text(
+        encoding="utf-8"),
+    flags=re.DOTALL).strip())
+
+
+class TableDataPlugin(LibraryComponent):
+    """
+    This plugin is used to read tables and grids in a single script call.
+    """
+
+    def __init__(self, ctx):
+        LibraryComponent.__init__(self, ctx)
+
+    @keyword
+    def get_table_data(
+            self,
+            locator: Union[WebElement, str],
+            columns: Optional[list[str]] = None
+    ) -> list[dict[str, Optional[str]]]:
+        """Returns the rows of the table or grid ``locator`` as a list of
+        dictionaries mapping header to cell text.
+
+        Headers are read from ``thead th`` or ``columnheader`` roles,
+        falling back to the first row. The whole table is read with one
+        script call, so the result can be compared to expected data
+        directly, e.g. with ``Lists Should Be Equal``.
+
+        See the `Locating elements` section for details about the locator
+        syntax.
+
+        Args:
+            locator (Union[WebElement, str]): The locator of the table or
+                                              grid.
+            columns (Optional[list[str]]): Headers to keep, in this order.
+                                           Defaults to all columns.
+
+        Returns:
+            (list[dict[str, Optional[str]]]): rows as {header: cell text}
+        """
+        element = self.find_element(locator)
+        return self.driver.execute_script(
+            TABLE_TO_ROWS, element, columns or [])
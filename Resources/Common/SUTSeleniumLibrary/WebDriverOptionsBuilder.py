@@ -0,0 +1,81 @@
+"""
+Keyword library for building webdriver options objects.
+
+Options are built once per configuration and strategy and cached for the
+rest of the run, so every Open Browser reuses a ready options object.
+"""
+
+import json
+from typing import Any
+
+from robot.api import logger
+from robot.api.deco import keyword, library
+from selenium.webdriver import ChromeOptions
+
+
+@library(scope="GLOBAL", version="1.0")
+class WebDriverOptionsBuilder():
+    """
+    Builds and caches webdriver options from SeleniumLibraryConfiguration.
+    """
+
+    def __init__(self):
+        self._chrome_options: dict[str, ChromeOptions] = {}
+
+    @keyword("Get Chrome Options")
+    def get_chrome_options(self,
+                           configuration: dict[str, Any],
+                           strategy: str,
+                           download_path: str,
+                           is_headless: bool = True) -> ChromeOptions:
+        """
+        Returns the chrome options for a strategy, built on first use.
+
+        Args:
+            configuration (dict[str, Any]): CHROME_OPTIONS_CONFIGURATION
+            strategy (str): webdriver strategy (local, remote,
+                docker-compose)
+            download_path (str): browser download directory
+            is_headless (bool): adds the HEADLESS_ARGUMENTS.
+                Defaults to True.
+
+        Returns:
+            ChromeOptions: chrome options object
+        """
+        cache_key = json.dumps(
+            [configuration, strategy, download_path, bool(is_headless)],
+            sort_keys=True)
+        if cache_key not in self._chrome_options:
+            self._chrome_options[cache_key] = self._build_chrome_options(
+                configuration, strategy, download_path, is_headless)
+        return self._chrome_options[cache_key]
+
+    def _build_chrome_options(self,
+                              configuration: dict[str, Any],
+                              strategy: str,
+                              download_path: str,
+                              is_headless: bool) -> ChromeOptions:
+        options = ChromeOptions()
+        options.page_load_strategy = configuration.get(
+            "PAGE_LOAD_STRATEGY", "normal")
+        arguments = [
+            *configuration.get("ARGUMENTS", []),
+            *configuration.get("PERFORMANCE_ARGUMENTS", []),
+        ]
+        if is_headless:
+            arguments.extend(configuration.get("HEADLESS_ARGUMENTS", []))
+        for argument in arguments:
+            options.add_argument(argument)
+        if strategy == "local":
+            options.add_experimental_option(
+                "excludeSwitches", ["enable-logging"])
+        if strategy in ["local", "remote"]:
+            options.add_experimental_option(
+                "prefs", {"download.default_directory": download_path})
+        logger.info(f"Built chrome options for {strategy}: {arguments}")
+        return options
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,184 @@
+from SeleniumLibrary.base import LibraryComponent, keyword
+from typing import Optional
+from selenium.common.exceptions import WebDriverException
+from robot.api.logger import logging
+
+# Clears the web storage of the current window and returns its origin.
+CLEAR_WINDOW_STORAGE = """
+try { localStorage.clear(); sessionStorage.clear(); } catch (error) {}
+return window.location.origin;
+"""
+
+
+class PooledDriver:
+    """
+    Bookkeeping for one pooled webdriver session.
+    """
+
+    def __init__(self, driver, strategy: str):
+        self.driver = driver
+        self.strategy = strategy
+        self.uses = 1
+        self.in_use = True
+
+
+class WebDriverPoolPlugin(LibraryComponent):
+    """
+    This plugin keeps warm webdriver sessions and hands them to suites.
+    """
+
+    def __init__(self, ctx):
+        LibraryComponent.__init__(self, ctx)
+        self.pool: list[PooledDriver] = []
+
+    @keyword
+    def get_browser_from_pool(
+            self,
+            strategy: str,
+            max_reuse: int = 20) -> Optional[int]:
+        """Switches to an idle pooled browser of ``strategy``.
+
+        Idle sessions that fail the health check or reached ``max_reuse``
+        are quit and dropped from the pool.
+
+        Args:
+            strategy (str): The webdriver strategy of the session.
+            max_reuse (int): How many times a session can be handed out.
+
+        Returns:
+            (Optional[int]): The browser index, None if no session is idle.
+        """
+        for pooled in [p for p in self.pool
+                       if p.strategy == strategy and not p.in_use]:
+            if pooled.uses >= int(max_reuse) or not self._is_healthy(pooled):
+                self._discard(pooled)
+                continue
+            index = self.drivers.get_connection_index(pooled.driver)
+            self.drivers.switch(index)
+            pooled.uses += 1
+            pooled.in_use = True
+            logging.info(f"Reusing pooled browser {index} ({pooled.uses}x)")
+            return index
+        return None
+
+    @keyword
+    def add_browser_to_pool(self, strategy: str) -> int:
+        """Adds the current browser to the pool as in use.
+
+        Args:
+            strategy (str): The webdriver strategy of the session.
+
+        Returns:
+            (int): The browser index.
+        """
+        self.pool.append(PooledDriver(self.driver, strategy))
+        return self.drivers.current_index
+
+    @keyword
+    def return_browser_to_pool(self, pool_size: int = 2) -> None:
+        """Resets the current pooled browser and marks it idle.
+
+        Cookies, storage and extra tabs are removed. Chromium browsers
+        clear all cookies and the storage of every origin of an open tab or
+        a cookie with the DevTools protocol, other browsers clear the
+        cookies and web storage of every open tab.
+        The browser is quit instead when ``pool_size`` idle sessions of its
+        strategy already exist or when the reset fails.
+
+        Args:
+            pool_size (int): Idle sessions kept per strategy.
+        """
+        pooled = self._get_pooled(self.driver)
+        if pooled is None:
+            logging.warning("Current browser is not pooled, closing it.")
+            self.drivers.close()
+            return
+        idle = [p for p in self.pool
+                if p.strategy == pooled.strategy and not p.in_use]
+        if len(idle) >= int(pool_size):
+            self._discard(pooled)
+            return
+        try:
+            self._reset(pooled.driver)
+        except WebDriverException as error:
+            logging.warning(f"Pooled browser reset failed: {error}")
+            self._discard(pooled)
+            return
+        pooled.in_use = False
+
+    @keyword
+    def close_browser_pool(self) -> None:
+        """Quits every pooled browser."""
+        for pooled in list(self.pool):
+            self._discard(pooled)
+
+    @keyword
+    def get_browser_pool_stats(self) -> dict[str, dict[str, int]]:
+        """Returns the pooled session counts per strategy.
+
+        Returns:
+            (dict[str, dict[str, int]]): {strategy: {"in_use", "idle",
+                                          "uses"}}
+        """
+        stats: dict[str, dict[str, int]] = {}
+        for pooled in self.pool:
+            counts = stats.setdefault(
+                pooled.strategy, {"in_use": 0, "idle": 0, "uses": 0})
+            counts["in_use" if pooled.in_use else "idle"] += 1
+            counts["uses"] += pooled.uses
+        return stats
+
+    def _get_pooled(self, driver) -> Optional[PooledDriver]:
+        for pooled in self.pool:
+            if pooled.driver is driver:
+                return pooled
+        return None
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        if pooled.driver not in self.drivers.active_drivers:
+            return False
+        try:
+            return pooled.driver.execute_script("return 1;") == 1
+        except WebDriverException as error:
+            logging.info(f"Pooled browser failed health check: {error}")
+            return False
+
+    def _reset(self, driver) -> None:
+        cdp = hasattr(driver, "execute_cdp_cmd")
+        handles = driver.window_handles
+        origins = set()
+        for handle in reversed(handles):
+            driver.switch_to.window(handle)
+            origins.add(driver.execute_script(CLEAR_WINDOW_STORAGE))
+            if not cdp:
+                driver.delete_all_cookies()
+            if handle != handles[0]:
+                driver.close()
+        driver.switch_to.window(handles[0])
+        if cdp:
+            self._clear_browser_data(driver, origins)
+        driver.get("about:blank")
+
+    @staticmethod
+    def _clear_browser_data(driver, origins: set) -> None:
+        """Clears all cookies and the storage of the known origins."""
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})
+        for cookie in cookies.get("cookies", []):
+            domain = cookie["domain"].lstrip(".")
+            origins.update((f"https://{domain}", f"http://{domain}"))
+        for origin in sorted(o for o in origins
+                             if o and o.startswith("http")):
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                   {"origin": origin, "storageTypes": "all"})
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+    def _discard(self, pooled: PooledDriver) -> None:
+        self.pool.remove(pooled)
+        index = self.drivers.get_index(pooled.driver)
+        if index is None:
+            return
+        current = self.drivers.current_index
+        self.drivers.switch(index)
+        self.drivers.close()
+        if current is not None and current != index:
+            self.drivers.switch(current)
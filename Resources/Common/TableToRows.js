@@ -0,0 +1,35 @@
+/*
+ * Serialises a table or ARIA grid into a list of {header: cell text} rows.
+ *
+ * Shared by the Get Table Data keywords of the Browser BrowserUtilitiesPlugin
+ * and the SeleniumLibrary TableDataPlugin. The file holds one function
+ * expression taking the root element and the wanted columns.
+ */
+(root, columns) => {
+    const text = (cell) => cell.innerText.trim();
+    const cellSelector = 'td, th, [role="gridcell"], [role="cell"]';
+    const headerCells = root.querySelectorAll(
+        'thead th, [role="columnheader"]');
+    let headers = Array.from(headerCells, text);
+    let rows = Array.from(root.querySelectorAll(
+        'tbody tr, [role="rowgroup"] [role="row"]'));
+    if (rows.length === 0) {
+        // ARIA grids may have their rows directly inside the grid.
+        rows = Array.from(root.children).filter(
+            (child) => child.getAttribute('role') === 'row');
+    }
+    if (headers.length === 0) {
+        const allRows = Array.from(root.querySelectorAll('tr, [role="row"]'));
+        headers = allRows.length ? Array.from(
+            allRows[0].querySelectorAll(cellSelector), text) : [];
+        rows = allRows.slice(1);
+    }
+    const wanted = columns && columns.length ? columns : headers;
+    const indexes = wanted.map((column) => headers.indexOf(column));
+    return rows
+        .map((row) => Array.from(row.querySelectorAll(cellSelector), text))
+        .filter((cells) => cells.length > 0)
+        .map((cells) => Object.fromEntries(wanted.map(
+            (column, i) => [column,
+                            indexes[i] < 0 ? null : cells[indexes[i]] ?? null])));
+}
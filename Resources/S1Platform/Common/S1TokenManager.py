@@ -0,0 +1,341 @@
+"""
+Keyword library caching the access tokens of S1 users.
+
+A token is requested once per user and environment and kept in memory,
+optionally also in a cache file reused by later runs. The expiry is read
+from the JWT ``exp`` claim with PyJWT once, when the token is received,
+without verifying the signature. A background thread requests a new token
+before the expiry and updates the ``Authorization`` header of the
+RequestsLibrary sessions using it, so tests never log in again.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import jwt
+import requests
+import yaml
+from robot.api import logger
+from robot.api.deco import keyword, library
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+from robot.utils import DotDict
+
+CONFIGURATION_FILE = Path(__file__).parent / "S1TokenConfiguration.yaml"
+
+
+class CachedToken:
+    """
+    Token of one user and environment with the credentials to renew it.
+    """
+
+    def __init__(self, token: str, expires_at: float,
+                 token_url: Optional[str] = None,
+                 password: Optional[str] = None):
+        self.token = token
+        self.expires_at = expires_at
+        self.token_url = token_url
+        self.password = password
+        self.refreshes = 0
+        self.error: Optional[str] = None
+
+    @property
+    def seconds_left(self) -> float:
+        return self.expires_at - time.time()
+
+
+@library(scope="GLOBAL", version="1.0")
+class S1TokenManager():
+    """
+    Cached S1 access tokens, renewed in the background.
+
+    ``Get S1 Token`` requests a token from ``TOKEN_URL`` of
+    S1TokenConfiguration.yaml only when no valid token of the user and
+    environment is cached. ``Set S1 Session Authorization`` sets the
+    ``Authorization: Bearer`` header of a RequestsLibrary session, and
+    keeps it up to date when the token is renewed.
+
+    The environment defaults to ``${SOVOS_ENVIRONMENT}``.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, configuration_file: str = str(CONFIGURATION_FILE)):
+        """
+        Args:
+            configuration_file (str): YAML file with the
+                S1_TOKEN_CONFIGURATION. Defaults to S1TokenConfiguration.yaml
+                next to this library.
+        """
+        self.ROBOT_LIBRARY_LISTENER = self
+        self.configuration_file = Path(configuration_file)
+        with open(self.configuration_file, encoding="utf-8") as file:
+            data = yaml.safe_load(file) or {}
+        self.configuration: Dict[str, Any] = \
+            data.get("S1_TOKEN_CONFIGURATION") or {}
+        cache_file = self.configuration.get("CACHE_FILE")
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.margin = float(self.configuration.get("REFRESH_MARGIN", 60))
+        self._tokens: Dict[Tuple[str, str], CachedToken] = \
+            self._load_cache_file()
+        self._sessions: Dict[str, Tuple[Any, Tuple[str, str]]] = {}
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    @keyword("Get S1 Token")
+    def get_s1_token(self, username: str, password: Optional[str] = None,
+                     environment: Optional[str] = None,
+                     token_url: Optional[str] = None) -> str:
+        """
+        Returns a valid token of the user, requesting it only when needed.
+
+        Args:
+            username (str): the user
+            password (Optional[str]): password of the user, needed when no
+                valid token is cached and to renew a token read from the
+                cache file in the background
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+            token_url (Optional[str]): defaults to TOKEN_URL
+
+        Returns:
+            str: the access token
+        """
+        key = (self._get_environment(environment), username)
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached and cached.error:
+                logger.warn(f"Renewing the S1 token of {username} in the "
+                            f"background failed: {cached.error}")
+                cached.error = None
+            if cached and cached.seconds_left > self.margin:
+                if password:
+                    cached.password = password
+                    cached.token_url = self._get_token_url(key[0], token_url)
+            else:
+                password = password or (cached.password if cached else None)
+                if not password:
+                    raise ValueError(f"The S1 token of {username} in "
+                                     f"{key[0]} expired, a password is "
+                                     f"needed to renew it.")
+                url = self._get_token_url(key[0], token_url)
+                cached = self._request_token(username, password, url)
+                self._tokens[key] = cached
+                self._save_cache_file()
+                logger.info(f"Received S1 token of {username} in {key[0]}, "
+                            f"valid for {cached.seconds_left:.0f}s.")
+        if cached.password and cached.token_url:
+            self._start_refresher()
+        return cached.token
+
+    @keyword("Add S1 Token")
+    def add_s1_token(self, username: str, token: str,
+                     environment: Optional[str] = None) -> None:
+        """
+        Caches a token received in another way, e.g. from a UI login.
+
+        The token is not renewed, add a new one or use ``Get S1 Token``
+        with the password before it expires.
+
+        Args:
+            username (str): the user
+            token (str): the access token
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+        """
+        key = (self._get_environment(environment), username)
+        with self._lock:
+            self._tokens[key] = CachedToken(token, self._get_expiry(token))
+            self._save_cache_file()
+            self._update_sessions(key)
+
+    @keyword("Set S1 Session Authorization")
+    def set_s1_session_authorization(self, alias: str, username: str,
+                                     password: Optional[str] = None,
+                                     environment: Optional[str] = None
+                                     ) -> None:
+        """
+        Sets the Authorization header of a session to the user token.
+
+        The header is updated whenever the token is renewed.
+
+        Args:
+            alias (str): RequestsLibrary session alias
+            username (str): the user
+            password (Optional[str]): password of the user, needed when no
+                valid token is cached
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+        """
+        key = (self._get_environment(environment), username)
+        self.get_s1_token(username, password, key[0])
+        session = BuiltIn().get_library_instance(
+            "RequestsLibrary")._cache.switch(alias)
+        with self._lock:
+            self._sessions[alias] = (session, key)
+            self._update_sessions(key)
+
+    @keyword("Get S1 Token Info")
+    def get_s1_token_info(self, username: str,
+                          environment: Optional[str] = None) -> DotDict:
+        """
+        Returns the expiry of the cached token of a user.
+
+        Args:
+            username (str): the user
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+
+        Returns:
+            DotDict: username, environment, expires_at, seconds_left,
+                refreshes and whether it is renewed in the background
+        """
+        key = (self._get_environment(environment), username)
+        cached = self._tokens.get(key)
+        if cached is None:
+            raise ValueError(f"No S1 token of {username} in {key[0]} is "
+                             f"cached.")
+        return DotDict(username=username, environment=key[0],
+                       expires_at=cached.expires_at,
+                       seconds_left=round(cached.seconds_left),
+                       refreshes=cached.refreshes,
+                       renewed=bool(cached.password and cached.token_url))
+
+    @keyword("Clear S1 Tokens")
+    def clear_s1_tokens(self) -> None:
+        """
+        Removes all cached tokens, also from the cache file.
+        """
+        with self._lock:
+            self._tokens.clear()
+            self._save_cache_file()
+
+    def close(self) -> None:
+        self._stopped.set()
+
+    def _start_refresher(self) -> None:
+        """Starts the refresh thread, again when an error stopped it."""
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh_tokens, name="S1TokenRefresher",
+                daemon=True)
+            self._refresher.start()
+
+    def _refresh_tokens(self) -> None:
+        interval = float(self.configuration.get("REFRESH_INTERVAL", 15))
+        while not self._stopped.wait(interval):
+            with self._lock:
+                expiring = [(key, cached) for key, cached
+                            in self._tokens.items()
+                            if cached.password and cached.token_url
+                            and cached.seconds_left <= self.margin + interval]
+            for key, cached in expiring:
+                try:
+                    renewed = self._request_token(key[1], cached.password,
+                                                  cached.token_url)
+                    renewed.refreshes = cached.refreshes + 1
+                    with self._lock:
+                        self._tokens[key] = renewed
+                        self._update_sessions(key)
+                        self._save_cache_file()
+                except Exception as error:
+                    cached.error = f"{type(error).__name__}: {error}"
+
+    def _request_token(self, username: str, password: str,
+                       token_url: str) -> CachedToken:
+        form = {"grant_type": self.configuration.get("GRANT_TYPE",
+                                                     "password")}
+        if form["grant_type"] == "password":
+            form.update(username=username, password=password)
+        for field, name in (("client_id", "CLIENT_ID_VARIABLE"),
+                            ("client_secret", "CLIENT_SECRET_VARIABLE")):
+            value = os.environ.get(self.configuration.get(name) or "")
+            if value:
+                form[field] = value
+        response = requests.post(
+            token_url, data=form,
+            timeout=float(self.configuration.get("REQUEST_TIMEOUT", 30)))
+        response.raise_for_status()
+        body = response.json()
+        field = self.configuration.get("TOKEN_FIELD", "access_token")
+        token = body.get(field)
+        if not token:
+            raise ValueError(f"The token response of {token_url} has no "
+                             f"'{field}'.")
+        return CachedToken(token, self._get_expiry(token,
+                                                   body.get("expires_in")),
+                           token_url, password)
+
+    def _get_expiry(self, token: str,
+                    expires_in: Optional[float] = None) -> float:
+        """Expiry of a token, decoded once without verifying it."""
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            claims = {}
+        if isinstance(claims.get("exp"), (int, float)):
+            return float(claims["exp"])
+        lifetime = expires_in or self.configuration.get("DEFAULT_LIFETIME",
+                                                        300)
+        return time.time() + float(lifetime)
+
+    def _update_sessions(self, key: Tuple[str, str]) -> None:
+        token = self._tokens[key].token
+        for session, session_key in self._sessions.values():
+            if session_key == key:
+                session.headers["Authorization"] = f"Bearer {token}"
+
+    def _get_token_url(self, environment: str,
+                       token_url: Optional[str]) -> str:
+        url = token_url or self.configuration.get("TOKEN_URL")
+        if not url:
+            raise ValueError(f"S1_TOKEN_CONFIGURATION has no TOKEN_URL in "
+                             f"{self.configuration_file.name}.")
+        if url.startswith(("http://", "https://")):
+            return url
+        gateway = BuiltIn().get_library_instance(
+            "S1UrlResolver").resolve_s1_api_gateway_url(environment)
+        return f"{gateway}/{url.lstrip('/')}"
+
+    def _load_cache_file(self) -> Dict[Tuple[str, str], CachedToken]:
+        if not self.cache_file:
+            return {}
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {(entry["environment"], entry["username"]):
+                CachedToken(entry["token"], entry["expires_at"])
+                for entry in data if entry["expires_at"] > time.time()}
+
+    def _save_cache_file(self) -> None:
+        """Writes the tokens, never the passwords, readable by the owner."""
+        if not self.cache_file:
+            return
+        entries: List[Dict[str, Any]] = [
+            {"environment": environment, "username": username,
+             "token": cached.token, "expires_at": cached.expires_at}
+            for (environment, username), cached in self._tokens.items()]
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT
+                             | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(entries, file, indent=2)
+        os.replace(temporary, self.cache_file)
+
+    @staticmethod
+    def _get_environment(environment: Optional[str]) -> str:
+        if environment is not None:
+            return environment
+        try:
+            return BuiltIn().get_variable_value("${SOVOS_ENVIRONMENT}", "QA")
+        except RobotNotRunningError:
+            return os.environ.get("SOVOS_ENVIRONMENT", "QA")
+
+
+if __name__ == "__main__":
+
+    pass
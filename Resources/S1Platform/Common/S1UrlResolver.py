@@ -0,0 +1,165 @@
+"""
+Keyword library resolving the S1 Platform URLs of every environment.
+
+The URL tables of ``EnvironmentURL.yaml`` are loaded once and the full URLs,
+with port and extension, are computed for every environment when the
+library is imported. Lookups are dictionary reads.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import yaml
+from robot.api import logger
+from robot.api.deco import keyword, library
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+URL_FILE = Path(__file__).parent / "EnvironmentURL.yaml"
+URL_TABLES = ("S1_PLATFORM_URL", "SOVOS_API_GATEWAY_URLS")
+
+
+@library(scope="GLOBAL", version="1.0")
+class S1UrlResolver():
+    """
+    Precomputed S1 Platform and API gateway URLs.
+
+    Environments with missing or null entries are reported when the library
+    is imported, and fail with a clear message when a test looks them up.
+    The environment defaults to ``${SOVOS_ENVIRONMENT}``.
+    """
+
+    def __init__(self, url_file: str = str(URL_FILE)):
+        """
+        Args:
+            url_file (str): YAML file with the S1_PLATFORM_URL,
+                SOVOS_API_GATEWAY_URLS and S1_URL_EXT tables. Defaults to
+                EnvironmentURL.yaml next to this library.
+        """
+        self.url_file = Path(url_file)
+        with open(self.url_file, encoding="utf-8") as file:
+            data = yaml.safe_load(file) or {}
+        self.urls: Dict[Tuple[str, str], str] = {}
+        self.domains: Dict[Tuple[str, str], str] = {}
+        self.extension_urls: Dict[Tuple[str, str], str] = {}
+        self.errors: Dict[Tuple[str, str], str] = {}
+        self.extensions: Dict[str, str] = data.get("S1_URL_EXT") or {}
+        for table in URL_TABLES:
+            for environment, entry in (data.get(table) or {}).items():
+                self._add_environment(table, environment, entry or {})
+        for (table, environment), url in self.urls.items():
+            if table != "S1_PLATFORM_URL":
+                continue
+            for name, extension in self.extensions.items():
+                self.extension_urls[(environment, name)] = f"{url}{extension}"
+        self._warn_current_environment()
+
+    @keyword("Resolve S1 Platform Domain")
+    def resolve_s1_platform_domain(self,
+                                   environment: Optional[str] = None) -> str:
+        """
+        Returns the S1 Platform cookie domain of the environment.
+
+        Args:
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+
+        Returns:
+            str: domain
+        """
+        return self._lookup(self.domains, "S1_PLATFORM_URL", environment)
+
+    @keyword("Resolve S1 Platform UI URL")
+    def resolve_s1_platform_ui_url(self,
+                                   environment: Optional[str] = None) -> str:
+        """
+        Returns the S1 Platform URL of the environment, with NGINX port.
+
+        Args:
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+
+        Returns:
+            str: url
+        """
+        return self._lookup(self.urls, "S1_PLATFORM_URL", environment)
+
+    @keyword("Resolve S1 Platform UI URL With Extension")
+    def resolve_s1_platform_ui_url_with_extension(
+            self,
+            url_ext_name: Optional[str] = None,
+            environment: Optional[str] = None) -> str:
+        """
+        Returns the S1 Platform URL of the environment with a page extension.
+
+        Args:
+            url_ext_name (Optional[str]): name in S1_URL_EXT, None returns
+                the URL without extension
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+
+        Returns:
+            str: url with extension
+        """
+        url = self.resolve_s1_platform_ui_url(environment)
+        if url_ext_name is None:
+            return url
+        if url_ext_name not in self.extensions:
+            raise ValueError(f"Unknown S1 URL extension '{url_ext_name}', "
+                             f"use one of: "
+                             f"{', '.join(sorted(self.extensions))}")
+        return self.extension_urls[(self._get_environment(environment),
+                                    url_ext_name)]
+
+    @keyword("Resolve S1 API Gateway URL")
+    def resolve_s1_api_gateway_url(self,
+                                   environment: Optional[str] = None) -> str:
+        """
+        Returns the Sovos API gateway URL of the environment, with port.
+
+        Args:
+            environment (Optional[str]): defaults to ${SOVOS_ENVIRONMENT}
+
+        Returns:
+            str: url
+        """
+        return self._lookup(self.urls, "SOVOS_API_GATEWAY_URLS", environment)
+
+    def _add_environment(self, table: str, environment: str,
+                         entry: dict) -> None:
+        missing = [name for name in ("DOMAIN", "URL") if not entry.get(name)]
+        if missing:
+            self.errors[(table, environment)] = (
+                f"{table} of environment '{environment}' has no "
+                f"{' and '.join(missing)} in {self.url_file.name}.")
+            return
+        url = str(entry["URL"]).rstrip("/")
+        port = entry.get("NGINX_PORT")
+        self.urls[(table, environment)] = url if port is None \
+            else f"{url}:{port}"
+        self.domains[(table, environment)] = str(entry["DOMAIN"])
+
+    def _lookup(self, values: Dict[Tuple[str, str], str], table: str,
+                environment: Optional[str]) -> str:
+        key = (table, self._get_environment(environment))
+        value = values.get(key)
+        if value is None:
+            raise ValueError(self.errors.get(
+                key, f"{table} has no environment '{key[1]}'."))
+        return value
+
+    @staticmethod
+    def _get_environment(environment: Optional[str]) -> str:
+        if environment is not None:
+            return environment
+        return BuiltIn().get_variable_value("${SOVOS_ENVIRONMENT}", "QA")
+
+    def _warn_current_environment(self) -> None:
+        try:
+            environment = self._get_environment(None)
+        except RobotNotRunningError:
+            return
+        for table, name in self.errors:
+            if name == environment:
+                logger.warn(self.errors[(table, name)])
+
+
+if __name__ == "__main__":
+
+    pass
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Shared Browser Server Coordinator
+
+This script launches one Playwright browser server with the Browser Library
+and shares it with all parallel workers. The workers connect to it over its
+websocket endpoint with the ``shared-server`` browser strategy and create
+their own isolated contexts, instead of every worker starting its own
+Node.js process and browser.
+
+The endpoint is written to the state file of BROWSER_SERVER_CONFIGURATION
+in Resources/Common/Browser/BrowserConfiguration.yaml and printed as
+``BROWSER_SERVER_ENDPOINT=<wsEndpoint>``. The server runs until it is
+stopped, then the browser and the state file are removed.
+
+Usage:
+    python Scripts/browser_server.py serve
+    python Scripts/browser_server.py start --browser firefox
+    python Scripts/browser_server.py status
+    python Scripts/browser_server.py stop
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+CONFIGURATION_FILE = "Resources/Common/Browser/BrowserConfiguration.yaml"
+ENDPOINT_VARIABLE = "BROWSER_SERVER_ENDPOINT"
+
+
+class BrowserServerCoordinator:
+    def __init__(self,
+                 configuration_file: str = CONFIGURATION_FILE,
+                 browser: Optional[str] = None,
+                 headless: Optional[bool] = None,
+                 state_file: Optional[str] = None):
+        self.configuration_file = configuration_file
+        with open(configuration_file, encoding="utf-8") as file:
+            configuration = yaml.safe_load(file)
+        self.server_configuration = configuration[
+            "BROWSER_SERVER_CONFIGURATION"]
+        self.browser = browser or configuration["WEB_BROWSER"]
+        self.headless = configuration["BROWSER_IS_HEADLESS"] \
+            if headless is None else headless
+        self.state_file = Path(state_file
+                               or self.server_configuration["STATE_FILE"])
+        self.started = False
+
+        # Setup logging
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Setup logging configuration for console output."""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(message)s',
+            handlers=[
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def read_state(self) -> Optional[dict]:
+        """
+        Read the state of the running server.
+
+        Returns:
+            Optional[dict]: wsEndpoint, pid and browser of the server, None
+                when no server is running.
+        """
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not self.is_alive(state.get("pid")):
+            return None
+        return state
+
+    @staticmethod
+    def is_alive(pid: Optional[int]) -> bool:
+        """Check whether a process is still running."""
+        if not pid:
+            return False
+        if os.name == "nt":
+            process = subprocess.run(
+                ["tasklist", "/FI", f"PID eq {pid}", "/NH"],
+                capture_output=True, text=True)
+            return str(pid) in process.stdout
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def serve(self) -> int:
+        """
+        Launch the browser server in this process and wait until stopped.
+
+        The Browser Library Node.js process and the browser end with this
+        process, which is stopped with SIGTERM, Ctrl-C or Ctrl-Break.
+
+        Returns:
+            int: The return code.
+        """
+        state = self.read_state()
+        if state:
+            self.logger.error(f"A browser server is already running at "
+                              f"{state['wsEndpoint']} (pid {state['pid']}).")
+            return 1
+        from Browser import Browser, SupportedBrowsers
+
+        stopped = threading.Event()
+        for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name),
+                              lambda *_: stopped.set())
+        browser_library = Browser()
+        endpoint = browser_library.launch_browser_server(
+            browser=SupportedBrowsers[self.browser],
+            headless=self.headless,
+            port=self.server_configuration["PORT"] or None,
+            wsPath=self.server_configuration["WS_PATH"],
+            reuse_existing=False)
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.state_file.with_suffix(".tmp")
+            temporary.write_text(json.dumps({
+                "wsEndpoint": endpoint,
+                "pid": os.getpid(),
+                "browser": self.browser,
+                "headless": self.headless,
+                "started": time.time(),
+            }, indent=2), encoding="utf-8")
+            os.replace(temporary, self.state_file)
+            self.logger.info(f"{ENDPOINT_VARIABLE}={endpoint}")
+            self.logger.info(f"{self.browser} browser server running, "
+                             f"stop it with Ctrl-C or the stop command.")
+            while not stopped.wait(1):
+                pass
+        finally:
+            self.logger.info("Stopping the browser server ...")
+            try:
+                browser_library.close_browser_server(endpoint)
+            finally:
+                browser_library.playwright.close()
+                self.state_file.unlink(missing_ok=True)
+        return 0
+
+    def start(self) -> Optional[str]:
+        """
+        Start the server in a background process.
+
+        A server that is already running is reused and ``started`` stays
+        False, so it is not stopped by the caller.
+
+        Returns:
+            Optional[str]: The wsEndpoint, None when the server did not start
+                within the startup timeout.
+        """
+        state = self.read_state()
+        if state:
+            self.logger.info(f"Using the running browser server (pid "
+                             f"{state['pid']}).")
+            return state["wsEndpoint"]
+        self.state_file.unlink(missing_ok=True)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        log_file = self.state_file.with_suffix(".log")
+        command = [sys.executable, os.path.abspath(__file__), "serve",
+                   "--browser", self.browser,
+                   "--state-file", str(self.state_file),
+                   "--configuration", self.configuration_file,
+                   "--headless" if self.headless else "--headed"]
+        if os.name == "nt":
+            options = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            options = {"start_new_session": True}
+        with log_file.open("w", encoding="utf-8") as log:
+            process = subprocess.Popen(command, stdout=log,
+                                       stderr=subprocess.STDOUT,
+                                       stdin=subprocess.DEVNULL, **options)
+        deadline = time.monotonic() + self.server_configuration[
+            "STARTUP_TIMEOUT"]
+        while time.monotonic() < deadline:
+            state = self.read_state()
+            if state:
+                self.logger.info(f"Browser server started (pid "
+                                 f"{state['pid']}), log in {log_file}.")
+                self.started = True
+                return state["wsEndpoint"]
+            if process.poll() is not None:
+                break
+            time.sleep(0.5)
+        self.logger.error(f"The browser server did not start, see "
+                          f"{log_file}.")
+        if process.poll() is None:
+            self.terminate(process.pid)
+        return None
+
+    def stop(self, timeout: float = 30) -> bool:
+        """
+        Stop the running server and wait until it removed its state file.
+
+        Args:
+            timeout (float): Seconds to wait for the server to stop.
+
+        Returns:
+            bool: False when a running server did not stop in time.
+        """
+        state = self.read_state()
+        if not state:
+            self.logger.info("No browser server is running.")
+            self.state_file.unlink(missing_ok=True)
+            return True
+        self.terminate(state["pid"])
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.is_alive(state["pid"]):
+                self.state_file.unlink(missing_ok=True)
+                self.logger.info("Browser server stopped.")
+                return True
+            time.sleep(0.5)
+        self.logger.error(f"Browser server (pid {state['pid']}) did not "
+                          f"stop within {timeout:.0f}s.")
+        return False
+
+    @staticmethod
+    def terminate(pid: int) -> None:
+        """Ask the serve process to close the browser server and exit."""
+        os.kill(pid, signal.CTRL_BREAK_EVENT if os.name == "nt"
+                else signal.SIGTERM)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Share one Playwright browser server with all workers.")
+    parser.add_argument("command", choices=["serve", "start", "stop",
+                                            "status"],
+                        help="serve in the foreground, start in the "
+                             "background, stop or show the running server.")
+    parser.add_argument("--browser", choices=["chromium", "firefox",
+                                              "webkit"],
+                        help="Browser of the server, defaults to WEB_BROWSER.")
+    parser.add_argument("--headless", dest="headless", action="store_true",
+                        default=None,
+                        help="Run headless, defaults to BROWSER_IS_HEADLESS.")
+    parser.add_argument("--headed", dest="headless", action="store_false")
+    parser.add_argument("--state-file",
+                        help="State file with the wsEndpoint, defaults to "
+                             "BROWSER_SERVER_CONFIGURATION.STATE_FILE.")
+    parser.add_argument("--configuration", default=CONFIGURATION_FILE,
+                        help="Browser configuration YAML file.")
+    arguments = parser.parse_args()
+    coordinator = BrowserServerCoordinator(
+        configuration_file=arguments.configuration,
+        browser=arguments.browser,
+        headless=arguments.headless,
+        state_file=arguments.state_file)
+    if arguments.command == "serve":
+        sys.exit(coordinator.serve())
+    if arguments.command == "start":
+        endpoint = coordinator.start()
+        if endpoint:
+            print(f"{ENDPOINT_VARIABLE}={endpoint}")
+        sys.exit(0 if endpoint else 1)
+    if arguments.command == "stop":
+        sys.exit(0 if coordinator.stop() else 1)
+    state = coordinator.read_state()
+    if state:
+        print(f"{ENDPOINT_VARIABLE}={state['wsEndpoint']}")
+    else:
+        coordinator.logger.info("No browser server is running.")
+    sys.exit(0 if state else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Import Time Report
+
+This script measures the import time of every Python module under
+Resources/ and CustomLibraries/ with ``python -X importtime``, each in a
+fresh interpreter, and reports the slowest modules and their heaviest
+dependencies.
+
+With a budget the script exits with 1 when a module imports slower, to
+catch a library pulling in a heavy dependency at import time in CI.
+
+Usage:
+    python Scripts/import_time_report.py
+    python Scripts/import_time_report.py --budget-file Data/ImportTimeBudget.json
+    python Scripts/import_time_report.py --budget 300 --json Results/import_times.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PYTHON_PATHS = (".", "CustomLibraries", "Resources")
+SOURCE_DIRECTORIES = ("Resources", "CustomLibraries")
+IMPORT_TIME_LINE = re.compile(
+    r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+class ImportTimeReport:
+    def __init__(self, root: str, repeat: int = 3, dependencies: int = 3):
+        self.root = Path(root).resolve()
+        self.repeat = repeat
+        self.dependency_count = dependencies
+
+        # Setup logging
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Setup logging configuration for console output."""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(message)s',
+            handlers=[
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def find_modules(self) -> List[Tuple[str, Path]]:
+        """
+        Find the modules like Robot Framework imports them.
+
+        Packages of CustomLibraries are imported by name, files of
+        Resources by path, with their directory in the python path.
+
+        Returns:
+            List[Tuple[str, Path]]: Module name and directory to import from.
+        """
+        modules = []
+        for directory in SOURCE_DIRECTORIES:
+            for path in sorted((self.root / directory).rglob("*.py")):
+                if path.name == "__init__.py":
+                    modules.append((path.parent.name, path.parent.parent))
+                elif not (path.parent / "__init__.py").exists():
+                    modules.append((path.stem, path.parent))
+        return modules
+
+    def measure(self, module: str, directory: Path) -> Optional[dict]:
+        """
+        Import a module in fresh interpreters and keep the fastest run.
+
+        Args:
+            module (str): Module name.
+            directory (Path): Directory added first to the python path.
+
+        Returns:
+            Optional[dict]: Cumulative and self milliseconds and the
+                heaviest dependencies, None when the import failed.
+        """
+        python_path = [str(directory)] + [str(self.root / path)
+                                          for path in PYTHON_PATHS]
+        environment = dict(os.environ,
+                           PYTHONPATH=os.pathsep.join(python_path))
+        best = None
+        for _ in range(self.repeat):
+            process = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                cwd=self.root, env=environment, capture_output=True,
+                text=True)
+            if process.returncode != 0:
+                error = process.stderr.strip().splitlines()
+                self.logger.warning(f"Importing {module} failed: "
+                                    f"{error[-1] if error else ''}")
+                return None
+            result = self.parse(module, process.stderr)
+            if result and (best is None
+                           or result["cumulative_ms"] < best["cumulative_ms"]):
+                best = result
+        return best
+
+    def parse(self, module: str, output: str) -> Optional[dict]:
+        """
+        Parse the ``-X importtime`` output of one import.
+
+        The imported module is the last line without indentation, the
+        dependencies it triggered are the lines before it, back to the
+        previous line without indentation.
+        """
+        lines = [IMPORT_TIME_LINE.match(line) for line in output.splitlines()]
+        lines = [match for match in lines if match]
+        for index in range(len(lines) - 1, -1, -1):
+            self_us, cumulative_us, indent, name = lines[index].groups()
+            if name == module and not indent:
+                break
+        else:
+            return None
+        dependencies = []
+        for match in reversed(lines[:index]):
+            if not match.group(3):
+                break
+            # Direct dependencies are indented by two spaces.
+            if len(match.group(3)) == 2:
+                dependencies.append((int(match.group(2)) / 1000,
+                                     match.group(4)))
+        dependencies.sort(reverse=True)
+        return {
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "self_ms": int(self_us) / 1000,
+            "dependencies": [
+                {"name": name, "cumulative_ms": milliseconds}
+                for milliseconds, name in dependencies[:self.dependency_count]
+            ],
+        }
+
+    def run(self, budgets: Dict[str, float], default_budget: Optional[float],
+            json_file: Optional[str]) -> int:
+        """Main run method."""
+        results = {}
+        for module, directory in self.find_modules():
+            result = self.measure(module, directory)
+            if result is None:
+                continue
+            relative = directory.relative_to(self.root).as_posix()
+            results[module] = {"directory": relative, **result}
+        exceeded = []
+        self.logger.info(f"{'Module':<40} {'Import ms':>10} {'Budget':>8}  "
+                         f"Heaviest dependencies")
+        for module, result in sorted(results.items(),
+                                     key=lambda item: -item[1]
+                                     ["cumulative_ms"]):
+            budget = budgets.get(module, default_budget)
+            result["budget_ms"] = budget
+            over = budget is not None and result["cumulative_ms"] > budget
+            if over:
+                exceeded.append(module)
+            dependencies = ", ".join(
+                f"{dependency['name']} {dependency['cumulative_ms']:.0f}"
+                for dependency in result["dependencies"])
+            self.logger.info(
+                f"{module:<40} {result['cumulative_ms']:>10.1f} "
+                f"{'-' if budget is None else f'{budget:.0f}':>8}"
+                f"{' !' if over else '  '}{dependencies}")
+        if json_file:
+            Path(json_file).parent.mkdir(parents=True, exist_ok=True)
+            Path(json_file).write_text(json.dumps(results, indent=2),
+                                       encoding="utf-8")
+        if exceeded:
+            self.logger.error(f"Import time budget exceeded: "
+                              f"{', '.join(exceeded)}")
+            return 1
+        return 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Report the import time of the project modules.")
+    parser.add_argument("--budget", type=float,
+                        help="Default import time budget in milliseconds.")
+    parser.add_argument("--budget-file",
+                        help="JSON file with 'default' and per 'modules' "
+                             "budgets in milliseconds.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Imports per module, the fastest is kept.")
+    parser.add_argument("--json", help="Write the report as JSON.")
+    arguments = parser.parse_args()
+    budgets: Dict[str, float] = {}
+    default_budget = arguments.budget
+    if arguments.budget_file:
+        data = json.loads(Path(arguments.budget_file).read_text(
+            encoding="utf-8"))
+        budgets = data.get("modules", {})
+        if default_budget is None:
+            default_budget = data.get("default")
+    report = ImportTimeReport(".", repeat=arguments.repeat)
+    sys.exit(report.run(budgets, default_budget, arguments.json))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Streaming Output Post-Processor
+
+This script reads a Robot Framework output.xml once with lxml iterparse and
+writes, without loading the whole file into memory:
+    - output_pruned.xml: the output with the keyword bodies of passing tests
+      removed, for rebot to build a small log and report
+    - junit.xml: one testsuite per suite with tests
+    - summary.json: totals, suite, tag and slowest test statistics for
+      dashboards
+    - failures.json: failed tests with their message and failing keywords
+
+Only one test is kept in memory at a time.
+
+Usage:
+    python Scripts/output_postprocessor.py Results/output.xml
+    python Scripts/output_postprocessor.py Results/output.xml --outputdir Results/processed --no-prune
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import sys
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from lxml import etree
+
+BODY_TAGS = {"kw", "for", "iter", "if", "branch", "try", "while", "group",
+             "variable", "return", "break", "continue", "error", "msg"}
+CONTAINER_TAGS = {"robot", "suite"}
+STATUSES = ("PASS", "FAIL", "SKIP")
+LEGACY_TIME_FORMAT = "%Y%m%d %H:%M:%S.%f"
+
+
+def get_elapsed(status) -> float:
+    """
+    Get the elapsed seconds of a status element, RF 7 or legacy format.
+
+    Args:
+        status: The status element or its attributes.
+
+    Returns:
+        float: Elapsed seconds.
+    """
+    if status is None:
+        return 0.0
+    if status.get("elapsed") is not None:
+        return float(status.get("elapsed"))
+    try:
+        start = datetime.strptime(status.get("starttime"), LEGACY_TIME_FORMAT)
+        end = datetime.strptime(status.get("endtime"), LEGACY_TIME_FORMAT)
+    except (TypeError, ValueError):
+        return 0.0
+    return (end - start).total_seconds()
+
+
+class OutputPostProcessor:
+    def __init__(self,
+                 output: str,
+                 output_dir: str,
+                 prune: bool = True,
+                 slowest: int = 20):
+        self.output = Path(output)
+        self.output_dir = Path(output_dir)
+        self.prune = prune
+        self.slowest_count = slowest
+        self.totals = dict.fromkeys(STATUSES, 0)
+        self.suites: Dict[str, Dict[str, float]] = {}
+        self.tags: Dict[str, Dict[str, int]] = {}
+        self.slowest: List[tuple] = []
+        self.failures: List[dict] = []
+        self.suite_names: List[str] = []
+        self.testcases: List[List[etree._Element]] = []
+        self.suite_statuses: List[Dict[str, str]] = []
+
+        # Setup logging
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Setup logging configuration for console output."""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(message)s',
+            handlers=[
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def process(self) -> int:
+        """
+        Process the output.xml in a single pass.
+
+        Returns:
+            int: The number of failed tests, like rebot.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with ExitStack() as stack:
+            pruned = stack.enter_context(etree.xmlfile(
+                str(self.output_dir / "output_pruned.xml"), encoding="UTF-8"))
+            junit = stack.enter_context(etree.xmlfile(
+                str(self.output_dir / "junit.xml"), encoding="UTF-8"))
+            pruned.write_declaration()
+            junit.write_declaration()
+            stack.enter_context(junit.element("testsuites"))
+            elements: List = []
+            for event, element in etree.iterparse(str(self.output),
+                                                  events=("start", "end"),
+                                                  huge_tree=True):
+                if event == "start":
+                    if self._is_container(element):
+                        self._start_container(element, pruned, elements)
+                    continue
+                if self._is_container(element):
+                    self._end_container(element, junit, elements)
+                elif element.tag == "test":
+                    self._end_test(element)
+                    self._write(pruned, element)
+                elif self._is_container(element.getparent()):
+                    if element.tag == "kw":
+                        self._prune_if_passed(element)
+                    elif element.tag == "status" and self.suite_statuses:
+                        self.suite_statuses[-1] = dict(element.attrib)
+                    self._write(pruned, element)
+        self._write_json()
+        self.logger.info(f"{sum(self.totals.values())} tests, "
+                         f"{self.totals['PASS']} passed, "
+                         f"{self.totals['FAIL']} failed, "
+                         f"{self.totals['SKIP']} skipped.")
+        self.logger.info(f"Output:  {self.output_dir}")
+        return self.totals["FAIL"]
+
+    @staticmethod
+    def _is_container(element) -> bool:
+        """Robot and suite elements, not the suite statistics."""
+        if element is None or element.tag not in CONTAINER_TAGS:
+            return False
+        parent = element.getparent()
+        return parent is None or parent.tag in CONTAINER_TAGS
+
+    def _start_container(self, element, pruned, elements: List) -> None:
+        context = pruned.element(element.tag, dict(element.attrib))
+        context.__enter__()
+        elements.append(context)
+        if element.tag == "suite":
+            self.suite_names.append(element.get("name", ""))
+            self.testcases.append([])
+            self.suite_statuses.append({})
+
+    def _end_container(self, element, junit, elements: List) -> None:
+        elements.pop().__exit__(None, None, None)
+        if element.tag == "suite":
+            testcases = self.testcases.pop()
+            status = self.suite_statuses.pop()
+            if testcases:
+                junit.write(self._create_testsuite(status, testcases))
+            self.suite_names.pop()
+        parent = element.getparent()
+        if parent is not None:
+            parent.remove(element)
+
+    def _end_test(self, element) -> None:
+        status = element.find("status")
+        result = status.get("status") if status is not None else "FAIL"
+        elapsed = get_elapsed(status)
+        suite = ".".join(self.suite_names)
+        full_name = f"{suite}.{element.get('name')}"
+        self.totals[result] = self.totals.get(result, 0) + 1
+        for depth in range(1, len(self.suite_names) + 1):
+            name = ".".join(self.suite_names[:depth])
+            stats = self.suites.setdefault(
+                name, {**dict.fromkeys(STATUSES, 0), "elapsed": 0.0})
+            stats[result] = stats.get(result, 0) + 1
+            stats["elapsed"] += elapsed
+        for tag in element.iterchildren("tag"):
+            stats = self.tags.setdefault(tag.text or "",
+                                         dict.fromkeys(STATUSES, 0))
+            stats[result] = stats.get(result, 0) + 1
+        entry = (elapsed, full_name)
+        if len(self.slowest) < self.slowest_count:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+        message = status.text if status is not None else ""
+        if result == "FAIL":
+            self.failures.append({
+                "name": full_name,
+                "message": message or "",
+                "elapsed": elapsed,
+                "tags": [tag.text for tag in element.iterchildren("tag")],
+                "keywords": self._get_failing_keywords(element),
+            })
+        self.testcases[-1].append(
+            self._create_testcase(element, suite, result, elapsed, message))
+        if result == "PASS":
+            for item in element:
+                if item.tag in BODY_TAGS:
+                    self._prune_body(item)
+
+    def _prune_if_passed(self, element) -> None:
+        status = element.find("status")
+        if status is not None and status.get("status") == "PASS":
+            self._prune_body(element)
+
+    def _prune_body(self, element) -> None:
+        """Removes the body of a keyword, keeping its arguments and status."""
+        if not self.prune:
+            return
+        for child in list(element):
+            if child.tag in BODY_TAGS:
+                element.remove(child)
+
+    def _get_failing_keywords(self, element) -> List[dict]:
+        """Follows the failed body items down to the innermost keyword."""
+        keywords = []
+        while True:
+            failed = None
+            for item in element:
+                status = item.find("status")
+                if item.tag in BODY_TAGS and status is not None \
+                        and status.get("status") == "FAIL":
+                    failed = item
+                    break
+            if failed is None:
+                return keywords
+            if failed.tag == "kw":
+                owner = failed.get("owner") or failed.get("library")
+                keywords.append({
+                    "name": f"{owner}.{failed.get('name')}" if owner
+                    else failed.get("name"),
+                    "arguments": [arg.text for arg in
+                                  failed.iterchildren("arg")],
+                    "messages": [msg.text for msg in failed.iterchildren("msg")
+                                 if msg.get("level") in ("FAIL", "ERROR")],
+                })
+            element = failed
+
+    @staticmethod
+    def _create_testcase(element, suite, result, elapsed, message):
+        testcase = etree.Element("testcase",
+                                 classname=suite,
+                                 name=element.get("name", ""),
+                                 time=f"{elapsed:.3f}")
+        if result == "FAIL":
+            etree.SubElement(testcase, "failure", message=message or "",
+                             type="AssertionError")
+        elif result == "SKIP":
+            etree.SubElement(testcase, "skipped", message=message or "")
+        return testcase
+
+    @staticmethod
+    def _create_testsuite(status, testcases):
+        failures = sum(1 for case in testcases
+                       if case.find("failure") is not None)
+        skipped = sum(1 for case in testcases
+                      if case.find("skipped") is not None)
+        testsuite = etree.Element("testsuite",
+                                  name=testcases[0].get("classname"),
+                                  tests=str(len(testcases)),
+                                  errors="0",
+                                  failures=str(failures),
+                                  skipped=str(skipped),
+                                  time=f"{get_elapsed(status):.3f}",
+                                  timestamp=status.get("start")
+                                  or status.get("starttime", ""))
+        testsuite.extend(testcases)
+        return testsuite
+
+    @staticmethod
+    def _write(xml_file, element) -> None:
+        element.tail = None
+        xml_file.write(element)
+        element.getparent().remove(element)
+
+    def _write_json(self) -> None:
+        summary = {
+            "source": str(self.output),
+            "totals": self.totals,
+            "suites": self.suites,
+            "tags": self.tags,
+            "slowest": [{"name": name, "elapsed": elapsed}
+                        for elapsed, name in sorted(self.slowest,
+                                                    reverse=True)],
+        }
+        (self.output_dir / "summary.json").write_text(
+            json.dumps(summary, indent=2), encoding="utf-8")
+        (self.output_dir / "failures.json").write_text(
+            json.dumps(self.failures, indent=2), encoding="utf-8")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Process a Robot Framework output.xml in one pass.")
+    parser.add_argument("output", help="The output.xml file.")
+    parser.add_argument("-d", "--outputdir",
+                        help="Directory of the processed files, defaults to "
+                             "'processed' next to the output.xml.")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="Keep the keyword bodies of passing tests.")
+    parser.add_argument("--slowest", type=int, default=20,
+                        help="Number of slowest tests in summary.json.")
+    arguments = parser.parse_args()
+    output_dir = arguments.outputdir or \
+        str(Path(arguments.output).parent / "processed")
+    processor = OutputPostProcessor(arguments.output,
+                                    output_dir,
+                                    prune=not arguments.no_prune,
+                                    slowest=arguments.slowest)
+    sys.exit(min(processor.process(), 250))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Parallel Robot Framework Runner
+
+This script splits the test suites into shards, runs one robot process per
+shard and merges the outputs into a single output.xml, log and report.
+
+Shards are built with a longest-processing-time-first scheduler, using the
+test durations recorded by previous runs in Results/test_durations.json.
+
+Usage:
+    python Scripts/parallel_runner.py
+    python Scripts/parallel_runner.py --processes 4 Tests
+    python Scripts/parallel_runner.py -s BrowserTest -s RequestsTest Tests -- --include smoke
+    python Scripts/parallel_runner.py --shared-browser-server Tests
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from robot import rebot
+from robot.api import ExecutionResult, ResultVisitor, TestSuiteBuilder
+
+from browser_server import ENDPOINT_VARIABLE, BrowserServerCoordinator
+
+DEFAULT_DURATION = 10.0
+HISTORY_FILE = "test_durations.json"
+PYTHON_PATH_ARGUMENTS = "Data/ArgumentsFiles/Common/PythonPathArguments.robot"
+
+
+class DurationCollector(ResultVisitor):
+    """Collects the elapsed seconds of every test in an output.xml."""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    def visit_test(self, test):
+        if hasattr(test, "elapsed_time"):
+            elapsed = test.elapsed_time.total_seconds()
+        else:
+            elapsed = test.elapsedtime / 1000
+        self.durations[test.full_name if hasattr(test, "full_name")
+                       else test.longname] = elapsed
+
+
+class ParallelRunner:
+    def __init__(self,
+                 paths: List[str],
+                 suites: List[str],
+                 processes: int,
+                 output_dir: str,
+                 robot_arguments: List[str],
+                 shared_browser_server: bool = False):
+        self.paths = paths
+        self.suites = suites
+        self.processes = processes
+        self.output_dir = Path(output_dir)
+        self.robot_arguments = robot_arguments
+        self.history_file = self.output_dir / HISTORY_FILE
+        self.shared_browser_server = shared_browser_server
+
+        # Setup logging
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Setup logging configuration for console output."""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(message)s',
+            handlers=[
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def load_history(self) -> Dict[str, float]:
+        """
+        Load the test durations of previous runs.
+
+        Without a history file, the durations are read from the last
+        output.xml in the output directory, if there is one.
+
+        Returns:
+            Dict[str, float]: Elapsed seconds by test full name.
+        """
+        if self.history_file.is_file():
+            return json.loads(self.history_file.read_text(encoding="utf-8"))
+        output = self.output_dir / "output.xml"
+        if output.is_file():
+            return self.read_durations(output)
+        return {}
+
+    def read_durations(self, output: Path) -> Dict[str, float]:
+        """
+        Read the test durations from an output.xml.
+
+        Args:
+            output (Path): The output.xml file.
+
+        Returns:
+            Dict[str, float]: Elapsed seconds by test full name.
+        """
+        collector = DurationCollector()
+        ExecutionResult(str(output)).visit(collector)
+        return collector.durations
+
+    def save_history(self, history: Dict[str, float], output: Path) -> None:
+        """
+        Update the history with the durations of the merged output.
+
+        Args:
+            history (Dict[str, float]): The durations used for scheduling.
+            output (Path): The merged output.xml file.
+        """
+        history.update(self.read_durations(output))
+        self.history_file.write_text(json.dumps(history, indent=2,
+                                                sort_keys=True),
+                                     encoding="utf-8")
+
+    def get_suite_durations(self,
+                            history: Dict[str, float]
+                            ) -> List[Tuple[str, float]]:
+        """
+        Find the suites with tests and estimate their duration.
+
+        Tests without history count with the median of the known durations.
+
+        Args:
+            history (Dict[str, float]): Elapsed seconds by test full name.
+
+        Returns:
+            List[Tuple[str, float]]: Suite full name and estimated seconds.
+        """
+        suite = TestSuiteBuilder().build(*self.paths)
+        if self.suites:
+            suite.filter(included_suites=self.suites)
+        default = statistics.median(history.values()) if history \
+            else DEFAULT_DURATION
+        durations: Dict[str, float] = {}
+        for test in suite.all_tests:
+            parent = test.parent.full_name
+            durations[parent] = durations.get(parent, 0.0) + history.get(
+                test.full_name, default)
+        return list(durations.items())
+
+    def schedule(self,
+                 suite_durations: List[Tuple[str, float]]
+                 ) -> List[Tuple[float, List[str]]]:
+        """
+        Distribute the suites with longest-processing-time-first.
+
+        The longest suite is given to the shard with the least work, until
+        all suites are assigned.
+
+        Args:
+            suite_durations (List[Tuple[str, float]]): Suites and seconds.
+
+        Returns:
+            List[Tuple[float, List[str]]]: Estimated seconds and suites per
+                shard, without empty shards.
+        """
+        shard_count = max(1, min(self.processes, len(suite_durations)))
+        heap = [(0.0, index) for index in range(shard_count)]
+        shards: List[List[str]] = [[] for _ in range(shard_count)]
+        loads = [0.0] * shard_count
+        for name, duration in sorted(suite_durations,
+                                     key=lambda item: item[1],
+                                     reverse=True):
+            load, index = heapq.heappop(heap)
+            shards[index].append(name)
+            loads[index] = load + duration
+            heapq.heappush(heap, (loads[index], index))
+        return [(loads[index], shards[index]) for index in range(shard_count)
+                if shards[index]]
+
+    def run_shards(self, shards: List[Tuple[float, List[str]]],
+                   browser_server_endpoint: Optional[str] = None
+                   ) -> List[Path]:
+        """
+        Run one robot process per shard and wait for all of them.
+
+        Every worker gets its own output directory and the WORKER_ID
+        variable, used e.g. for isolated browser user data directories.
+        With a shared browser server the workers use the shared-server
+        browser strategy and connect to its endpoint.
+
+        Args:
+            shards (List[Tuple[float, List[str]]]): Suites per shard.
+            browser_server_endpoint (Optional[str]): wsEndpoint of the
+                shared browser server.
+
+        Returns:
+            List[Path]: The output.xml files of the workers.
+        """
+        workers_dir = self.output_dir / "workers"
+        shutil.rmtree(workers_dir, ignore_errors=True)
+        processes = []
+        for worker_id, (estimate, suites) in enumerate(shards):
+            worker_dir = workers_dir / f"worker_{worker_id}"
+            worker_dir.mkdir(parents=True)
+            command = [sys.executable, "-m", "robot"]
+            command += self.robot_arguments
+            command += ["--outputdir", str(worker_dir),
+                        "--output", "output.xml",
+                        "--log", "NONE",
+                        "--report", "NONE",
+                        "--xunit", "NONE",
+                        "--console", "dotted",
+                        "--runemptysuite",
+                        "--variable", f"WORKER_ID:{worker_id}"]
+            if browser_server_endpoint:
+                command += ["--variable", "BROWSER_STRATEGY:shared-server",
+                            "--variable", f"{ENDPOINT_VARIABLE}:"
+                                          f"{browser_server_endpoint}"]
+            for suite in suites:
+                command += ["--suite", suite]
+            command += self.paths
+            self.logger.info(f"Worker {worker_id}: {len(suites)} suite(s), "
+                             f"estimated {estimate:.0f}s")
+            environment = dict(os.environ, WORKER_ID=str(worker_id))
+            if browser_server_endpoint:
+                environment[ENDPOINT_VARIABLE] = browser_server_endpoint
+            log = (worker_dir / "console.txt").open("w", encoding="utf-8")
+            processes.append((worker_id, worker_dir, log, subprocess.Popen(
+                command, stdout=log, stderr=subprocess.STDOUT,
+                env=environment)))
+        outputs = []
+        for worker_id, worker_dir, log, process in processes:
+            return_code = process.wait()
+            log.close()
+            output = worker_dir / "output.xml"
+            self.logger.info(f"Worker {worker_id} finished with return "
+                             f"code {return_code}.")
+            if output.is_file():
+                outputs.append(output)
+            else:
+                self.logger.error(f"Worker {worker_id} wrote no output, see "
+                                  f"{worker_dir / 'console.txt'}")
+        return outputs
+
+    def merge_outputs(self, outputs: List[Path]) -> int:
+        """
+        Merge the worker outputs into one output.xml, log, report and xunit.
+
+        Args:
+            outputs (List[Path]): The output.xml files of the workers.
+
+        Returns:
+            int: The rebot return code, the number of failed tests.
+        """
+        return rebot(*[str(output) for output in outputs],
+                     merge=True,
+                     outputdir=str(self.output_dir),
+                     output="output.xml",
+                     xunit="junit.xml",
+                     reporttitle="Report of Project",
+                     logtitle="Log of Project",
+                     stdout=sys.stdout)
+
+    def run(self) -> int:
+        """Main run method."""
+        started = time.monotonic()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        history = self.load_history()
+        suite_durations = self.get_suite_durations(history)
+        if not suite_durations:
+            self.logger.error("No tests found.")
+            return 252
+        shards = self.schedule(suite_durations)
+        total = sum(duration for _, duration in suite_durations)
+        self.logger.info(f"{len(suite_durations)} suite(s) in {len(shards)} "
+                         f"shard(s), estimated {total:.0f}s serial, "
+                         f"{max(load for load, _ in shards):.0f}s parallel.")
+        coordinator = None
+        endpoint = None
+        if self.shared_browser_server:
+            coordinator = BrowserServerCoordinator()
+            endpoint = coordinator.start()
+            if not endpoint:
+                return 252
+        try:
+            outputs = self.run_shards(shards, endpoint)
+        finally:
+            if coordinator and coordinator.started:
+                coordinator.stop()
+        if not outputs:
+            return 252
+        return_code = self.merge_outputs(outputs)
+        self.save_history(history, self.output_dir / "output.xml")
+        self.logger.info(f"Finished in {time.monotonic() - started:.0f}s.")
+        return return_code
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Run Robot Framework suites in parallel shards.")
+    parser.add_argument("-p", "--processes", type=int,
+                        default=os.cpu_count() or 1,
+                        help="Number of parallel robot processes.")
+    parser.add_argument("-s", "--suite", action="append", default=[],
+                        help="Only run suites matching this name.")
+    parser.add_argument("-d", "--outputdir", default="Results",
+                        help="Output directory of the merged results.")
+    parser.add_argument("-A", "--argumentfile", action="append",
+                        default=[PYTHON_PATH_ARGUMENTS],
+                        help="Robot arguments file given to every worker.")
+    parser.add_argument("paths", nargs="*", default=["Tests"],
+                        help="Test paths, robot options for the workers "
+                             "can be given after --.")
+    parser.add_argument("--shared-browser-server", action="store_true",
+                        help="Share one Playwright browser server with all "
+                             "workers, see Scripts/browser_server.py.")
+    argv = sys.argv[1:]
+    robot_arguments = []
+    if "--" in argv:
+        index = argv.index("--")
+        argv, robot_arguments = argv[:index], argv[index + 1:]
+    arguments = parser.parse_args(argv)
+    for argument_file in reversed(arguments.argumentfile):
+        robot_arguments = ["--argumentfile", argument_file] + robot_arguments
+    runner = ParallelRunner(paths=arguments.paths,
+                            suites=arguments.suite,
+                            processes=arguments.processes,
+                            output_dir=arguments.outputdir,
+                            robot_arguments=robot_arguments,
+                            shared_browser_server=arguments
+                            .shared_browser_server)
+    sys.exit(runner.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1051 @@
+#!/usr/bin/env python3
+"""
+Static Check
+
+This script validates the Tests and Resources without running or importing
+them, as a fast alternative to ``robot --dryrun``.
+
+Every .robot and .resource file is parsed with the Robot Framework parsing
+API. Keywords are indexed from the resource files, the project Python
+libraries and plugins (read with ``ast``, e.g. the ``@keyword`` names of
+CommonLibrary or GetSessionData) and the libdoc metadata of external
+libraries. The checker reports:
+
+- unknown-keyword: a called keyword is not found in the imports
+- keyword-arguments: a keyword is called with a wrong number of arguments
+- missing-variable: a variable is not defined in the imports, the keyword
+  or test, the arguments files or by a Set Suite/Global Variable anywhere
+- import-error: a resource or library can not be found or read
+
+Resource files are checked with the imports of the suites using them.
+Parsed files, library metadata and results are cached in
+Results/static_check_cache.json, a re-run only checks the files whose own
+content or imports changed.
+
+Usage:
+    python Scripts/static_check.py
+    python Scripts/static_check.py Tests/BrowserTest.robot
+    python Scripts/static_check.py --json Results/static_check.json
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import logging
+import re
+import shlex
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+from robot.api import get_model, get_resource_model
+from robot.api.parsing import ModelVisitor, Token
+from robot.libdocpkg import LibraryDocumentation
+from robot.libraries import STDLIBS
+from robot.running.arguments.embedded import EmbeddedArguments
+from robot.variables.search import search_variable
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = "Results/static_check_cache.json"
+SOURCE_DIRECTORIES = ("Tests", "Resources")
+PYTHON_PATHS = (".", "Resources", "CustomLibraries")
+ARGUMENTS_FILES = "Data/ArgumentsFiles"
+DATA_FILE_SUFFIXES = (".yaml", ".yml", ".json")
+LIBRARY_PROXIES = {"lazylibrary"}
+BUILTIN_VARIABLES = {
+    "/", ":", "\\n", "curdir", "execdir", "tempdir", "space", "empty",
+    "true", "false", "none", "null", "options", "outputdir", "outputfile",
+    "reportfile", "logfile", "debugfile", "loglevel", "prevtestname",
+    "prevteststatus", "prevtestmessage", "suitename", "suitesource",
+    "suitedocumentation", "suitemetadata", "suitestatus", "suitemessage",
+    "testname", "testdocumentation", "testtags", "teststatus",
+    "testmessage", "keywordstatus", "keywordmessage",
+}
+# BuiltIn keywords running the keyword at the given argument index.
+RUN_KEYWORD_VARIANTS = {
+    "runkeyword": 0,
+    "runkeywordandcontinueonfailure": 0,
+    "runkeywordandexpecterror": 1,
+    "runkeywordandignoreerror": 0,
+    "runkeywordandreturn": 0,
+    "runkeywordandreturnif": 1,
+    "runkeywordandreturnstatus": 0,
+    "runkeywordandwarnonfailure": 0,
+    "runkeywordifalltestspassed": 0,
+    "runkeywordifanytestsfailed": 0,
+    "runkeywordiftestfailed": 0,
+    "runkeywordiftestpassed": 0,
+    "runkeywordiftimeoutoccurred": 0,
+    "repeatkeyword": 1,
+    "waituntilkeywordsucceeds": 2,
+}
+# BuiltIn keywords taking a variable name as the first argument.
+SET_VARIABLE_KEYWORDS = {"settestvariable", "settaskvariable",
+                         "setsuitevariable", "setglobalvariable"}
+VARIABLE_NAME_KEYWORDS = SET_VARIABLE_KEYWORDS | {
+    "setlocalvariable", "getvariablevalue", "variableshouldexist",
+    "variableshouldnotexist"}
+EXPRESSION_KEYWORDS = {"evaluate", "shouldbetrue", "shouldnotbetrue",
+                       "skipif", "passexecutionif", "setvariableif"}
+EXPRESSION_STATEMENTS = ("IfHeader", "ElseIfHeader", "WhileHeader",
+                         "InlineIfHeader")
+DEFINING_STATEMENTS = ("ForHeader", "ExceptHeader", "Var")
+IGNORED_STATEMENTS = ("Documentation", "Metadata", "Comment", "EmptyLine",
+                      "Arguments")
+CALL_SETTINGS = ("SuiteSetup", "SuiteTeardown", "TestSetup", "TestTeardown",
+                 "Setup", "Teardown")
+PYTHON_VARIABLE = re.compile(r"(?<![\w\\])\$([A-Za-z_]\w*)(?!\{)")
+EXTENDED_SYNTAX = re.compile(r"[.\[\]()+\-*/%<>=!,'\"]")
+BDD_PREFIX = re.compile(r"^(given|when|then|and|but)\s+", re.IGNORECASE)
+
+
+def normalize(name: str) -> str:
+    """Normalize a keyword or variable name like Robot Framework does."""
+    return re.sub(r"[\s_]", "", name).lower()
+
+
+def variable_base(value: str) -> Optional[str]:
+    """
+    Get the normalized name of a scalar, list or dict variable.
+
+    Returns:
+        Optional[str]: The name without extended syntax and items, None for
+            environment variables, inline Python and nested variables.
+    """
+    match = search_variable(value.rstrip("= "), ignore_errors=True)
+    if not match.base or match.identifier not in "$@&" \
+            or match.base.startswith("{") or "{" in match.base:
+        return None
+    base = EXTENDED_SYNTAX.split(match.base, 1)[0]
+    return normalize(base) or None
+
+
+def is_number(name: str) -> bool:
+    try:
+        int(name, 0)
+    except ValueError:
+        try:
+            float(name)
+        except ValueError:
+            return False
+    return True
+
+
+class FileVisitor(ModelVisitor):
+    """Collects the imports, keywords, variables and blocks of one file."""
+
+    def __init__(self):
+        self.imports: List[dict] = []
+        self.keywords: Dict[str, dict] = {}
+        self.variables: Set[str] = set()
+        self.set_variables: Set[str] = set()
+        self.suite_template: Optional[str] = None
+        self.blocks: List[dict] = []
+        self.settings = self._new_block("Settings", "settings")
+        self.variable_block = self._new_block("Variables", "variables")
+        self.current = self.settings
+
+    @staticmethod
+    def _new_block(name: str, kind: str) -> dict:
+        return {"name": name, "kind": kind, "locals": set(), "calls": [],
+                "uses": [], "template": None}
+
+    def visit_SettingSection(self, node):
+        self.current = self.settings
+        self.generic_visit(node)
+
+    def visit_VariableSection(self, node):
+        self.current = self.variable_block
+        self.generic_visit(node)
+
+    def visit_ResourceImport(self, node):
+        self._add_import("Resource", node)
+
+    def visit_LibraryImport(self, node):
+        self._add_import("Library", node)
+
+    def visit_VariablesImport(self, node):
+        self._add_import("Variables", node)
+
+    def visit_TestTemplate(self, node):
+        self.suite_template = node.value
+
+    def visit_Variable(self, node):
+        name = variable_base(node.name or "")
+        if name:
+            self.variables.add(name)
+        self._collect_uses(node.get_tokens(Token.ARGUMENT))
+
+    def visit_Keyword(self, node):
+        self.current = self._new_block(node.name, "keyword")
+        self.keywords[node.name] = {"line": node.lineno,
+                                    "args": self._get_argument_spec(node)}
+        for token in node.header.get_tokens(Token.KEYWORD_NAME):
+            self._collect_definitions(token)
+        self.generic_visit(node)
+        self.blocks.append(self.current)
+
+    def visit_TestCase(self, node):
+        self.current = self._new_block(node.name, "test")
+        self.generic_visit(node)
+        self.blocks.append(self.current)
+
+    def visit_Template(self, node):
+        self.current["template"] = node.value or "NONE"
+
+    def visit_Arguments(self, node):
+        for token in node.get_tokens(Token.ARGUMENT):
+            name, _, default = token.value.partition("=")
+            self._collect_definitions(Token(Token.ASSIGN, name))
+            if default:
+                self._collect_uses([Token(Token.ARGUMENT, default,
+                                          token.lineno, token.col_offset)])
+
+    def generic_visit(self, node):
+        statement = type(node).__name__
+        if statement in IGNORED_STATEMENTS or not hasattr(node, "tokens") \
+                or statement in ("Variable", "Template", "TestTemplate"):
+            super().generic_visit(node)
+            return
+        tokens = list(node.tokens)
+        for token in tokens:
+            if token.type == Token.ASSIGN or (
+                    statement in DEFINING_STATEMENTS
+                    and token.type == Token.VARIABLE):
+                self._collect_definitions(token)
+        if statement == "Var" and (node.scope or "LOCAL").upper() != "LOCAL":
+            name = variable_base(node.name or "")
+            if name:
+                self.set_variables.add(name)
+        skipped = None
+        if statement == "KeywordCall" or statement in CALL_SETTINGS:
+            skipped = self._collect_call(node, statement)
+        self._collect_uses(token for token in tokens
+                           if token.type in (Token.ARGUMENT, Token.KEYWORD,
+                                             Token.NAME, Token.OPTION)
+                           and token is not skipped)
+        if statement in EXPRESSION_STATEMENTS:
+            self._collect_expression_uses(node.get_tokens(Token.ARGUMENT))
+        super().generic_visit(node)
+
+    def _collect_call(self, node, statement: str) -> Optional[Token]:
+        """Collect a keyword call, returns a variable name argument."""
+        name = node.keyword if statement == "KeywordCall" else node.name
+        arguments = list(node.get_tokens(Token.ARGUMENT))
+        if not name or name.upper() == "NONE":
+            return None
+        token = node.get_token(Token.KEYWORD, Token.NAME)
+        self.current["calls"].append({
+            "name": name,
+            "args": [argument.value for argument in arguments],
+            "line": token.lineno,
+            "col": token.col_offset + 1,
+        })
+        normalized = normalize(name.split(".")[-1])
+        if normalized in EXPRESSION_KEYWORDS and arguments:
+            self._collect_expression_uses(arguments[:1])
+        if normalized in VARIABLE_NAME_KEYWORDS and arguments:
+            variable = variable_base(arguments[0].value.lstrip("\\")) \
+                or normalize(arguments[0].value)
+            if normalized in SET_VARIABLE_KEYWORDS:
+                self.set_variables.add(variable)
+            if normalized.startswith("set"):
+                self.current["locals"].add(variable)
+            return arguments[0]
+        return None
+
+    def _collect_definitions(self, token: Token) -> None:
+        # Embedded arguments are found like variables in an argument.
+        for part in Token(Token.ARGUMENT, token.value).tokenize_variables():
+            if part.type == Token.VARIABLE:
+                name = variable_base(part.value)
+                if name:
+                    self.current["locals"].add(name)
+
+    def _collect_uses(self, tokens: Iterable[Token]) -> None:
+        for token in tokens:
+            for part in token.tokenize_variables():
+                if part.type != Token.VARIABLE:
+                    continue
+                name = variable_base(part.value)
+                if name:
+                    self.current["uses"].append({
+                        "name": name,
+                        "text": part.value,
+                        "line": part.lineno,
+                        "col": part.col_offset + 1,
+                    })
+
+    def _collect_expression_uses(self, tokens: Iterable[Token]) -> None:
+        """Collect the $name variables of Python expressions."""
+        for token in tokens:
+            for match in PYTHON_VARIABLE.finditer(token.value):
+                self.current["uses"].append({
+                    "name": normalize(match.group(1)),
+                    "text": match.group(0),
+                    "line": token.lineno,
+                    "col": token.col_offset + match.start() + 1,
+                })
+
+    def _add_import(self, kind: str, node) -> None:
+        self.imports.append({"type": kind,
+                             "name": node.name or "",
+                             "args": list(getattr(node, "args", ())),
+                             "alias": getattr(node, "alias", None),
+                             "line": node.lineno})
+
+    @staticmethod
+    def _get_argument_spec(node) -> List[list]:
+        """Argument kinds, names and required flags of a user keyword."""
+        spec = []
+        named_only = False
+        if "${" in node.name:
+            return spec
+        for statement in node.body:
+            if type(statement).__name__ != "Arguments":
+                continue
+            for value in statement.values:
+                name, has_default, _ = value.partition("=")
+                base = search_variable(name, ignore_errors=True)
+                argument = (base.base or "").split(":")[0].strip()
+                if base.identifier == "@":
+                    spec.append(["VAR_POSITIONAL", argument, False])
+                    named_only = True
+                elif base.identifier == "&":
+                    spec.append(["VAR_NAMED", argument, False])
+                elif not base.base:
+                    named_only = True
+                else:
+                    spec.append(["NAMED_ONLY" if named_only
+                                 else "POSITIONAL_OR_NAMED", argument,
+                                 not has_default])
+        return spec
+
+    def get_result(self) -> dict:
+        blocks = [self.settings, self.variable_block] + self.blocks
+        for block in blocks:
+            if block["kind"] == "test" and block["template"] is None:
+                block["template"] = self.suite_template
+            if block["template"] and block["template"].upper() != "NONE":
+                block["calls"] = [{"name": block["template"], "args": None,
+                                   "line": block["calls"][0]["line"]
+                                   if block["calls"] else 0, "col": 1}]
+            block["locals"] = sorted(block["locals"])
+        return {
+            "imports": self.imports,
+            "keywords": self.keywords,
+            "variables": sorted(self.variables),
+            "set_variables": sorted(self.set_variables),
+            "blocks": blocks,
+        }
+
+
+class PythonVisitor(ast.NodeVisitor):
+    """Collects the keywords and variables of a Python library file."""
+
+    def __init__(self):
+        self.classes: Dict[str, dict] = {}
+        self.functions: List[dict] = []
+        self.variables: List[str] = []
+        self.get_variables = False
+
+    def visit_Module(self, node):
+        for statement in node.body:
+            if isinstance(statement, ast.ClassDef):
+                self.classes[statement.name] = self.read_class(statement)
+            elif isinstance(statement, (ast.FunctionDef,
+                                        ast.AsyncFunctionDef)):
+                if statement.name in ("get_variables", "getVariables"):
+                    self.get_variables = True
+                keyword = self.read_function(statement, auto=True)
+                if keyword:
+                    self.functions.append(keyword)
+            elif isinstance(statement, (ast.Assign, ast.AnnAssign)):
+                targets = statement.targets \
+                    if isinstance(statement, ast.Assign) \
+                    else [statement.target]
+                self.variables += [target.id for target in targets
+                                   if isinstance(target, ast.Name)
+                                   and not target.id.startswith("_")]
+
+    def read_class(self, node: ast.ClassDef) -> dict:
+        auto = True
+        for decorator in node.decorator_list:
+            if self.decorator_name(decorator) == "library":
+                auto = any(keyword.arg == "auto_keywords"
+                           and getattr(keyword.value, "value", False)
+                           for keyword in getattr(decorator, "keywords", []))
+        for statement in node.body:
+            if isinstance(statement, ast.Assign) and any(
+                    getattr(target, "id", None) == "ROBOT_AUTO_KEYWORDS"
+                    for target in statement.targets):
+                auto = bool(getattr(statement.value, "value", True))
+        methods = [statement for statement in node.body
+                   if isinstance(statement, (ast.FunctionDef,
+                                             ast.AsyncFunctionDef))]
+        return {
+            "keywords": [keyword for keyword in
+                         (self.read_function(method, auto, method=True)
+                          for method in methods) if keyword],
+            "dynamic": any(method.name in ("get_keyword_names",
+                                           "getKeywordNames")
+                           for method in methods),
+        }
+
+    def read_function(self, node, auto: bool,
+                      method: bool = False) -> Optional[dict]:
+        name = None
+        decorated = False
+        decorators = [self.decorator_name(decorator)
+                      for decorator in node.decorator_list]
+        if "property" in decorators or "not_keyword" in decorators:
+            return None
+        for decorator in node.decorator_list:
+            if self.decorator_name(decorator) != "keyword":
+                continue
+            name = node.name
+            decorated = True
+            if isinstance(decorator, ast.Call):
+                values = [argument.value for argument in decorator.args
+                          if isinstance(argument, ast.Constant)]
+                values += [keyword.value.value
+                           for keyword in decorator.keywords
+                           if keyword.arg == "name"
+                           and isinstance(keyword.value, ast.Constant)]
+                name = next((value for value in values if value), name)
+        if name is None:
+            if not auto or node.name.startswith("_"):
+                return None
+            name = node.name
+        return {"name": name,
+                "decorated": decorated,
+                "args": self.read_arguments(
+                    node.args, skip_first=method
+                    and "staticmethod" not in decorators)}
+
+    @staticmethod
+    def read_arguments(arguments: ast.arguments,
+                       skip_first: bool) -> List[list]:
+        positional = arguments.posonlyargs + arguments.args
+        defaults = [None] * (len(positional) - len(arguments.defaults)) \
+            + list(arguments.defaults)
+        spec = []
+        for index, (argument, default) in enumerate(zip(positional,
+                                                        defaults)):
+            if skip_first and index == 0:
+                continue
+            kind = "POSITIONAL_ONLY" if argument in arguments.posonlyargs \
+                else "POSITIONAL_OR_NAMED"
+            spec.append([kind, argument.arg, default is None])
+        if arguments.vararg:
+            spec.append(["VAR_POSITIONAL", arguments.vararg.arg, False])
+        for argument, default in zip(arguments.kwonlyargs,
+                                     arguments.kw_defaults):
+            spec.append(["NAMED_ONLY", argument.arg, default is None])
+        if arguments.kwarg:
+            spec.append(["VAR_NAMED", arguments.kwarg.arg, False])
+        return spec
+
+    @staticmethod
+    def decorator_name(decorator) -> Optional[str]:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        if isinstance(decorator, ast.Attribute):
+            return decorator.attr
+        if isinstance(decorator, ast.Name):
+            return decorator.id
+        return None
+
+
+class StaticChecker:
+    def __init__(self, root: str, cache: Optional[str],
+                 variables: List[str]):
+        self.root = Path(root).resolve()
+        self.cache_file = self.root / cache if cache else None
+        self.extra_variables = {normalize(name) for name in variables}
+        self.cache: Dict[str, Any] = {"files": {}, "python": {},
+                                      "libraries": {}, "results": {}}
+        self.files: Dict[str, dict] = {}
+        self.digests: Dict[str, Optional[str]] = {}
+        self.checked = 0
+
+        # Setup logging
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Setup logging configuration for console output."""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(message)s',
+            handlers=[
+                logging.StreamHandler(sys.stderr)
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def load_cache(self) -> None:
+        if self.cache_file and self.cache_file.is_file():
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                self.cache = data
+
+    def save_cache(self) -> None:
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_file.write_text(json.dumps({"version": CACHE_VERSION,
+                                               **self.cache}),
+                                   encoding="utf-8")
+
+    def relative(self, path: Path) -> str:
+        return path.resolve().relative_to(self.root).as_posix()
+
+    def digest(self, relative: str) -> Optional[str]:
+        """sha1 of a file of the repository, None when it is missing."""
+        if relative not in self.digests:
+            path = self.root / relative
+            self.digests[relative] = hashlib.sha1(
+                path.read_bytes()).hexdigest() if path.is_file() else None
+        return self.digests[relative]
+
+    def get_file(self, relative: str) -> dict:
+        """Parse a .robot or .resource file, cached by its sha1."""
+        if relative in self.files:
+            return self.files[relative]
+        digest = self.digest(relative)
+        cached = self.cache["files"].get(relative)
+        if cached and cached["sha1"] == digest:
+            node = cached
+        else:
+            path = self.root / relative
+            model = get_resource_model(path) if path.suffix == ".resource" \
+                else get_model(path)
+            visitor = FileVisitor()
+            visitor.visit(model)
+            node = {"sha1": digest, **visitor.get_result()}
+            self.cache["files"][relative] = node
+        self.files[relative] = node
+        return node
+
+    def get_python(self, relative: str) -> dict:
+        """Read the keywords and variables of a Python file with ast."""
+        digest = self.digest(relative)
+        cached = self.cache["python"].get(relative)
+        if cached and cached["sha1"] == digest:
+            return cached
+        visitor = PythonVisitor()
+        visitor.visit(ast.parse((self.root / relative).read_bytes()))
+        node = {"sha1": digest,
+                "classes": visitor.classes,
+                "functions": visitor.functions,
+                "variables": visitor.variables,
+                "get_variables": visitor.get_variables}
+        self.cache["python"][relative] = node
+        return node
+
+    def expand(self, source: str, value: str) -> Optional[str]:
+        """Replace the path variables of an import, None for others."""
+        value = value.replace("${CURDIR}", str((self.root / source).parent)) \
+            .replace("${EXECDIR}", str(self.root)).replace("${/}", "/")
+        return None if "${" in value else value
+
+    def resolve_path(self, source: str, value: str) -> Optional[str]:
+        """Resolve a path relative to the file and the python paths."""
+        if Path(value).is_absolute():
+            candidates = [Path(value)]
+        else:
+            candidates = [(self.root / source).parent / value]
+            candidates += [self.root / base / value for base in PYTHON_PATHS]
+        for candidate in candidates:
+            candidate = candidate.resolve()
+            if candidate.exists() and self.root in candidate.parents:
+                return self.relative(candidate)
+        return None
+
+    def resolve_module(self, name: str) -> Optional[Tuple[List[str], str]]:
+        """
+        Resolve a library module name to its Python files and class.
+
+        Returns:
+            Optional[Tuple[List[str], str]]: Files of the module or package
+                and the class name to use.
+        """
+        parts = name.split(".")
+        for count in range(len(parts), 0, -1):
+            module = "/".join(parts[:count])
+            class_name = parts[count] if count < len(parts) else parts[-1]
+            if count < len(parts) - 1:
+                break
+            for base in PYTHON_PATHS:
+                file = self.root / base / f"{module}.py"
+                package = self.root / base / module
+                if file.is_file():
+                    return [self.relative(file)], class_name
+                if (package / "__init__.py").is_file():
+                    return sorted(self.relative(path) for path in
+                                  package.glob("*.py")), class_name
+        return None
+
+    def get_library(self, source: str, name: str,
+                    args: List[str]) -> dict:
+        """
+        Get the keywords of a library import.
+
+        Returns:
+            dict: name, keywords with their argument specs, the files the
+                keywords were read from and an error message.
+        """
+        if normalize(name) in LIBRARY_PROXIES and args:
+            name, args = args[0], args[1:]
+        library = {"name": name, "keywords": [], "files": [], "error": None}
+        expanded = self.expand(source, name)
+        if expanded is None:
+            library["error"] = f"Library name '{name}' contains variables."
+            return library
+        if expanded.endswith(".py") or "/" in expanded:
+            path = self.resolve_path(source, expanded)
+            resolved = ([path], Path(expanded).stem) if path else None
+        else:
+            resolved = self.resolve_module(expanded)
+        if resolved:
+            files, class_name = resolved
+            library["files"] = files
+            python = [self.get_python(file) for file in files]
+            classes = [node["classes"][class_name] for node in python
+                       if class_name in node["classes"]]
+            if classes and classes[0]["dynamic"]:
+                self.add_libdoc(library, expanded)
+            elif classes:
+                library["keywords"] = classes[0]["keywords"]
+            else:
+                library["keywords"] = [keyword for node in python
+                                       for keyword in node["functions"]]
+        else:
+            self.add_libdoc(library, expanded)
+        for argument in args:
+            if not argument.startswith("plugins="):
+                continue
+            for plugin in argument[len("plugins="):].split(","):
+                plugin = self.expand(source, plugin.split(";")[0].strip())
+                path = self.resolve_path(source, plugin) if plugin else None
+                if not path:
+                    continue
+                library["files"].append(path)
+                for node in self.get_python(path)["classes"].values():
+                    library["keywords"] += [
+                        keyword for keyword in node["keywords"]
+                        if keyword["decorated"]]
+        return library
+
+    def add_libdoc(self, library: dict, name: str) -> None:
+        """Add the keywords of an external library from its libdoc."""
+        module = f"robot.libraries.{name}" if name in STDLIBS else name
+        try:
+            spec = find_spec(module.split(".")[0])
+        except (ImportError, ValueError):
+            spec = None
+        origin = Path(spec.origin) if spec and spec.origin else None
+        key = f"{name}|{origin.stat().st_mtime_ns if origin else None}"
+        cached = self.cache["libraries"].get(key)
+        if cached is None:
+            try:
+                documentation = LibraryDocumentation(name)
+                cached = {"keywords": [
+                    {"name": keyword.name,
+                     "args": [[argument.kind, argument.name,
+                               argument.required]
+                              for argument in keyword.args]}
+                    for keyword in documentation.keywords], "error": None}
+            except Exception as error:  # libdoc raises DataError and others
+                cached = {"keywords": [], "error": str(error).splitlines()[0]}
+            self.cache["libraries"][key] = cached
+        library["keywords"] = cached["keywords"]
+        library["error"] = cached["error"]
+        library["key"] = key
+
+    def get_closure(self, relative: str) -> List[str]:
+        """The file and all resource files it imports, transitively."""
+        closure = [relative]
+        index = 0
+        while index < len(closure):
+            current = closure[index]
+            index += 1
+            for item in self.get_file(current)["imports"]:
+                if item["type"] != "Resource":
+                    continue
+                expanded = self.expand(current, item["name"])
+                path = self.resolve_path(current, expanded) \
+                    if expanded else None
+                if path and path not in closure and \
+                        path.endswith((".resource", ".robot")):
+                    closure.append(path)
+        return closure
+
+    def get_namespace(self, relative: str, contexts: List[str]) -> dict:
+        """
+        Collect the keywords and variables visible in a file.
+
+        Args:
+            relative (str): The checked file.
+            contexts (List[str]): Suites whose imports are also visible, used
+                for resource files relying on the imports of their suites.
+        """
+        files: List[str] = []
+        for context in [relative] + contexts:
+            for path in self.get_closure(context):
+                if path not in files:
+                    files.append(path)
+        namespace = {"files": files, "keywords": {}, "embedded": [],
+                     "qualified": {}, "variables": set(BUILTIN_VARIABLES),
+                     "opaque_keywords": False, "opaque_variables": False,
+                     "issues": [], "dependencies": set(files),
+                     "libraries": []}
+        # Keywords of the own file and resources win over library keywords.
+        for path in files:
+            node = self.get_file(path)
+            namespace["variables"].update(node["variables"])
+            self.add_keywords(namespace, [
+                {"name": name, "args": keyword["args"]}
+                for name, keyword in node["keywords"].items()],
+                Path(path).stem, path)
+        for path in files:
+            for item in self.get_file(path)["imports"]:
+                self.add_import(namespace, path, item,
+                                report=path == relative)
+        builtin = self.get_library(relative, "BuiltIn", [])
+        namespace["libraries"].append(builtin.get("key"))
+        self.add_keywords(namespace, builtin["keywords"], "BuiltIn",
+                          "BuiltIn")
+        return namespace
+
+    def add_import(self, namespace: dict, source: str, item: dict,
+                   report: bool) -> None:
+        """Add the keywords or variables of a library or variable import."""
+        issue = None
+        if item["type"] == "Resource":
+            expanded = self.expand(source, item["name"])
+            if expanded and not self.resolve_path(source, expanded):
+                issue = f"Resource file '{item['name']}' does not exist."
+        elif item["type"] == "Library":
+            library = self.get_library(source, item["name"], item["args"])
+            namespace["dependencies"].update(library["files"])
+            namespace["libraries"].append(library.get("key"))
+            if library["error"]:
+                namespace["opaque_keywords"] = True
+                issue = f"Importing library '{item['name']}' failed: " \
+                        f"{library['error']}"
+            alias = item["alias"] or library["name"]
+            self.add_keywords(namespace, library["keywords"],
+                              Path(alias).stem.split(".")[-1], alias)
+        else:
+            issue = self.add_variables(namespace, source, item)
+        if issue and report:
+            namespace["issues"].append({"line": item["line"], "col": 1,
+                                        "code": "import-error",
+                                        "message": issue})
+
+    def add_variables(self, namespace: dict, source: str,
+                      item: dict) -> Optional[str]:
+        """Add the variables of a variable file import."""
+        expanded = self.expand(source, item["name"])
+        path = self.resolve_path(source, expanded) if expanded else None
+        if not path:
+            namespace["opaque_variables"] = True
+            return None if expanded is None else \
+                f"Variable file '{item['name']}' does not exist."
+        namespace["dependencies"].add(path)
+        data_files = [path]
+        if path.endswith(".py"):
+            python = self.get_python(path)
+            namespace["variables"].update(normalize(name) for name
+                                          in python["variables"])
+            data_files = []
+            if python["get_variables"]:
+                # Loaders like CachedYamlVariables.py get data files.
+                for argument in item["args"]:
+                    argument = self.expand(source, argument)
+                    data = self.resolve_path(source, argument) \
+                        if argument else None
+                    if data and data.endswith(DATA_FILE_SUFFIXES):
+                        data_files.append(data)
+                    else:
+                        namespace["opaque_variables"] = True
+                if not item["args"]:
+                    namespace["opaque_variables"] = True
+        for data in data_files:
+            namespace["dependencies"].add(data)
+            try:
+                content = yaml.safe_load((self.root / data).read_text(
+                    encoding="utf-8")) or {}
+            except (OSError, yaml.YAMLError) as error:
+                return f"Reading variable file '{data}' failed: {error}"
+            namespace["variables"].update(
+                normalize(str(name).split(" ", 1)[-1]
+                          if str(name).startswith(("LIST__", "DICT__"))
+                          else str(name))
+                for name in content)
+        return None
+
+    @staticmethod
+    def add_keywords(namespace: dict, keywords: List[dict], owner: str,
+                     source: str) -> None:
+        qualified = namespace["qualified"].setdefault(normalize(owner), {})
+        for keyword in keywords:
+            embedded = EmbeddedArguments.from_name(keyword["name"]) \
+                if "${" in keyword["name"] else None
+            entry = {**keyword, "source": source}
+            if embedded:
+                namespace["embedded"].append((embedded.name, entry))
+                qualified.setdefault("", []).append((embedded.name, entry))
+            else:
+                namespace["keywords"].setdefault(normalize(keyword["name"]),
+                                                 entry)
+                qualified.setdefault(normalize(keyword["name"]), entry)
+
+    def find_keyword(self, namespace: dict, name: str) -> Optional[dict]:
+        """Find a keyword by name, Library.Keyword or embedded arguments."""
+        keyword = namespace["keywords"].get(normalize(name))
+        if keyword:
+            return keyword
+        for pattern, entry in namespace["embedded"]:
+            if pattern.fullmatch(name):
+                return {**entry, "args": None}
+        if "." in name:
+            parts = name.split(".")
+            for index in range(1, len(parts)):
+                owner = namespace["qualified"].get(
+                    normalize(".".join(parts[:index]).split(".")[-1]))
+                rest = ".".join(parts[index:])
+                if owner is None:
+                    continue
+                if normalize(rest) in owner:
+                    return owner[normalize(rest)]
+                for pattern, entry in owner.get("", []):
+                    if pattern.fullmatch(rest):
+                        return {**entry, "args": None}
+        if BDD_PREFIX.match(name):
+            return self.find_keyword(namespace, BDD_PREFIX.sub("", name))
+        return None
+
+    @staticmethod
+    def check_arguments(name: str, spec: List[list],
+                        values: List[str]) -> Optional[str]:
+        """
+        Check the arguments of a call against the keyword argument spec.
+
+        Returns:
+            Optional[str]: The error message, None when the call is valid.
+        """
+        if any(search_variable(value, ignore_errors=True).is_list_variable()
+               or search_variable(value, ignore_errors=True)
+               .is_dict_variable() for value in values):
+            return None
+        positional_names = [argument for argument in spec
+                            if argument[0] in ("POSITIONAL_ONLY",
+                                               "POSITIONAL_OR_NAMED")]
+        named_names = {argument[1] for argument in spec
+                       if argument[0] in ("POSITIONAL_OR_NAMED",
+                                          "NAMED_ONLY")}
+        varargs = any(argument[0] == "VAR_POSITIONAL" for argument in spec)
+        kwargs = any(argument[0] == "VAR_NAMED" for argument in spec)
+        positional = 0
+        named: Set[str] = set()
+        for value in values:
+            argument, separator, _ = value.partition("=")
+            if separator and not argument.endswith("\\") and (
+                    argument in named_names or (kwargs and argument)):
+                named.add(argument)
+            else:
+                positional += 1
+        minimum = sum(1 for argument in positional_names if argument[2])
+        maximum = len(positional_names)
+        missing = [argument[1] for index, argument
+                   in enumerate(positional_names)
+                   if argument[2] and index >= positional
+                   and argument[1] not in named]
+        if (positional > maximum and not varargs) or missing:
+            count = positional + len(named)
+            if varargs:
+                expected = f"at least {minimum}"
+            elif minimum == maximum:
+                expected = str(minimum)
+            else:
+                expected = f"{minimum} to {maximum}"
+            plural = "" if expected.endswith(" 1") or expected == "1" \
+                else "s"
+            return f"Keyword '{name}' expected {expected} argument{plural}, " \
+                   f"got {count}."
+        for argument in spec:
+            if argument[0] == "NAMED_ONLY" and argument[2] \
+                    and argument[1] not in named:
+                return f"Keyword '{name}' missing named-only argument " \
+                       f"'{argument[1]}'."
+        return None
+
+    def check_call(self, namespace: dict, call: dict,
+                   issues: List[dict]) -> None:
+        name = call["name"]
+        if "{" in name:
+            return
+        keyword = self.find_keyword(namespace, name)
+        if keyword is None:
+            if not namespace["opaque_keywords"]:
+                issues.append({"line": call["line"], "col": call["col"],
+                               "code": "unknown-keyword",
+                               "message": f"No keyword with name '{name}' "
+                                          f"found."})
+            return
+        if call["args"] is None:
+            return
+        if keyword["args"] is not None:
+            error = self.check_arguments(name, keyword["args"], call["args"])
+            if error:
+                issues.append({"line": call["line"], "col": call["col"],
+                               "code": "keyword-arguments",
+                               "message": error})
+        if keyword["source"] != "BuiltIn":
+            return
+        index = RUN_KEYWORD_VARIANTS.get(normalize(keyword["name"]))
+        if index is not None and len(call["args"]) > index:
+            self.check_call(namespace, {**call,
+                                        "name": call["args"][index],
+                                        "args": call["args"][index + 1:]},
+                            issues)
+        if normalize(keyword["name"]) == "runkeywords":
+            self.check_run_keywords(namespace, call, issues)
+
+    def check_run_keywords(self, namespace: dict, call: dict,
+                           issues: List[dict]) -> None:
+        """Check the keywords of Run Keywords, with or without AND."""
+        if "AND" not in call["args"]:
+            for name in call["args"]:
+                self.check_call(namespace, {**call, "name": name,
+                                            "args": []}, issues)
+            return
+        current: List[str] = []
+        for value in call["args"] + ["AND"]:
+            if value == "AND":
+                if current:
+                    self.check_call(namespace, {**call, "name": current[0],
+                                                "args": current[1:]}, issues)
+                current = []
+            else:
+                current.append(value)
+
+    def check_file(self, relative: str, namespace: dict,
+                   global_variables: Set[str]) -> List[dict]:
+        """Check the calls and variables of one file."""
+        issues = list(namespace["issues"])
+        node = self.get_file(relative)
+        for block in node["blocks"]:
+            for call in block["calls"]:
+                self.check_call(namespace, call, issues)
+            if namespace["opaque_variables"]:
+                continue
+            known = set(block["locals"]) | global_variables \
+                | namespace["variables"]
+            for use in block["uses"]:
+                if use["name"] not in known and not is_number(use["name"]):
+                    issues.append({"line": use["line"], "col": use["col"],
+                                   "code": "missing-variable",
+                                   "message": f"Variable '{use['text']}' "
+                                              f"not found."})
+        return sorted(issues, key=lambda issue: (issue["line"],
+                                                 issue["col"]))
+
+    def read_argument_file_variables(self) -> Set[str]:
+        """Variables given with --variable in the arguments files."""
+        variables = set()
+        for path in sorted((self.root / ARGUMENTS_FILES).rglob("*.robot")):
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    parts = shlex.split(line, comments=True)
+                except ValueError:
+                    continue
+                for option, value in zip(parts, parts[1:]):
+                    if option in ("-v", "--variable"):
+                        variables.add(normalize(value.split(":", 1)[0]))
+        return variables
+
+    def run(self, paths: List[str], json_file: Optional[str]) -> int:
+        """Main run method."""
+        self.load_cache()
+        all_files = []
+        for directory in SOURCE_DIRECTORIES:
+            all_files += [self.relative(path) for path in
+                          sorted((self.root / directory).rglob("*"))
+                          if path.suffix in (".robot", ".resource")]
+        selected = []
+        for path in paths:
+            path = (self.root / path).resolve()
+            selected += [file for file in all_files
+                         if (self.root / file) == path
+                         or path in (self.root / file).parents]
+        suites = [file for file in all_files if file.endswith(".robot")
+                  and any(block["kind"] == "test"
+                          for block in self.get_file(file)["blocks"])]
+        closures = {suite: self.get_closure(suite) for suite in suites}
+        global_variables = self.read_argument_file_variables() \
+            | self.extra_variables
+        for file in all_files:
+            global_variables.update(self.get_file(file)["set_variables"])
+        results = {}
+        for file in selected:
+            contexts = [suite for suite, closure in closures.items()
+                        if file in closure and suite != file]
+            namespace = self.get_namespace(file, contexts)
+            key = hashlib.sha1(json.dumps([
+                sorted((path, self.digest(path))
+                       for path in namespace["dependencies"]),
+                sorted(str(library) for library in namespace["libraries"]),
+                sorted(global_variables),
+            ]).encode("utf-8")).hexdigest()
+            cached = self.cache["results"].get(file)
+            if cached and cached["key"] == key:
+                results[file] = cached["issues"]
+                continue
+            self.checked += 1
+            results[file] = self.check_file(file, namespace,
+                                            global_variables)
+            self.cache["results"][file] = {"key": key,
+                                           "issues": results[file]}
+        self.save_cache()
+        count = 0
+        for file, issues in results.items():
+            for issue in issues:
+                count += 1
+                print(f"{file}:{issue['line']}:{issue['col']}: "
+                      f"{issue['code']}: {issue['message']}")
+        self.logger.info(f"{len(results)} file(s), {self.checked} checked, "
+                         f"{count} issue(s).")
+        if json_file:
+            Path(json_file).parent.mkdir(parents=True, exist_ok=True)
+            Path(json_file).write_text(json.dumps(results, indent=2),
+                                       encoding="utf-8")
+        return 1 if count else 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Check the Robot Framework files without running them.")
+    parser.add_argument("paths", nargs="*", default=list(SOURCE_DIRECTORIES),
+                        help="Files or directories to report on.")
+    parser.add_argument("--cache", default=DEFAULT_CACHE,
+                        help="Cache file, re-runs only check changed files.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Check all files without reading the cache.")
+    parser.add_argument("-v", "--variable", action="append", default=[],
+                        help="Name of a variable given on the command line.")
+    parser.add_argument("--json", help="Write the issues as JSON.")
+    arguments = parser.parse_args()
+    checker = StaticChecker(".", None if arguments.no_cache
+                            else arguments.cache, arguments.variable)
+    sys.exit(checker.run(arguments.paths, arguments.json))
+
+
+if __name__ == "__main__":
+    main()
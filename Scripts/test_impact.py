@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Test Impact Analysis
+
+This script selects the suites and tests affected by a git diff, so a change
+to a Browser resource does not re-run the REST suites.
+
+Every .robot and .resource file is parsed into a dependency graph of its
+Resource, Library and Variables imports and the keywords it defines and
+calls. The graph is cached by file hash, only changed files are parsed again.
+
+- A change inside a keyword selects the tests calling it, directly or
+  through other keywords.
+- A change inside a test case selects that test.
+- Any other change (settings, variables, Python libraries, YAML files)
+  selects all suites importing the file.
+- A changed file no suite imports, e.g. a script read by a plugin or a
+  module imported by Python code only, selects everything. Documentation
+  (.md, .rst) and the Results output directory are ignored.
+- Nothing affected writes a selection matching no test, so robot runs
+  nothing instead of the whole tests root.
+
+Usage:
+    python Scripts/test_impact.py
+    python Scripts/test_impact.py --base origin/main --output Results/impact.args
+    robot -A Results/impact.args Tests
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from robot.api import get_model, get_resource_model
+from robot.api.parsing import ModelVisitor, Token
+from robot.model import TestSuite
+
+CACHE_VERSION = 2
+DEFAULT_CACHE = "Results/test_impact_cache.json"
+GLOBAL_FILES = ("robot.toml", "pyproject.toml", "poetry.lock",
+                "Data/ArgumentsFiles/")
+PYTHON_PATHS = (".", "Resources", "CustomLibraries")
+DOCUMENTATION_SUFFIXES = (".md", ".rst")
+OUTPUT_DIRECTORY = "Results/"
+NO_SELECTION = ["--include __no_impact__", "--runemptysuite"]
+CALL_STATEMENTS = ("KeywordCall", "Setup", "Teardown", "Template",
+                   "SuiteSetup", "SuiteTeardown", "TestSetup",
+                   "TestTeardown", "TestTemplate")
+
+
+def normalize(name: str) -> str:
+    """Normalize a keyword name like Robot Framework does."""
+    return re.sub(r"[\s_]", "", name).lower()
+
+
+class FileVisitor(ModelVisitor):
+    """Collects the imports, keywords and test cases of one file."""
+
+    def __init__(self):
+        self.imports: List[Tuple[str, List[str]]] = []
+        self.suite_calls: Set[str] = set()
+        self.keywords: Dict[str, dict] = {}
+        self.tests: Dict[str, dict] = {}
+        self.current: Optional[dict] = None
+
+    def visit_ResourceImport(self, node):
+        self.imports.append((node.name, []))
+
+    def visit_LibraryImport(self, node):
+        self.imports.append((node.name, list(node.args)))
+
+    def visit_VariablesImport(self, node):
+        self.imports.append((node.name, list(node.args)))
+
+    def visit_Keyword(self, node):
+        self._visit_block(node, self.keywords)
+
+    def visit_TestCase(self, node):
+        self._visit_block(node, self.tests)
+
+    def generic_visit(self, node):
+        if type(node).__name__ in CALL_STATEMENTS:
+            calls = self.current["calls"] if self.current is not None \
+                else self.suite_calls
+            for token in node.get_tokens(Token.KEYWORD, Token.NAME,
+                                         Token.ARGUMENT):
+                # Keywords given as arguments, e.g. to Run Keyword, count
+                # as calls as well.
+                if token.value and not token.value.startswith(("${", "@{",
+                                                               "&{")):
+                    calls.add(token.value)
+        super().generic_visit(node)
+
+    def _visit_block(self, node, blocks: Dict[str, dict]) -> None:
+        self.current = {"start": node.lineno,
+                        "end": node.end_lineno,
+                        "calls": set()}
+        self.generic_visit(node)
+        blocks[node.name] = self.current
+        self.current = None
+
+
+class TestImpactAnalyzer:
+    def __init__(self, root: str, tests: str, cache: str):
+        self.root = Path(root).resolve()
+        self.tests = (self.root / tests).resolve()
+        self.cache_file = self.root / cache
+        self.graph: Dict[str, dict] = {}
+
+        # Setup logging
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Setup logging configuration for console output."""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(message)s',
+            handlers=[
+                logging.StreamHandler(sys.stderr)
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def build_graph(self) -> None:
+        """Parse the changed .robot and .resource files into the graph."""
+        cache = {}
+        if self.cache_file.is_file():
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                cache = data["files"]
+        parsed = 0
+        for directory in (self.tests, self.root / "Resources"):
+            for path in sorted(directory.rglob("*")):
+                if path.suffix not in (".robot", ".resource"):
+                    continue
+                relative = path.relative_to(self.root).as_posix()
+                digest = hashlib.sha1(path.read_bytes()).hexdigest()
+                if cache.get(relative, {}).get("sha1") == digest:
+                    self.graph[relative] = cache[relative]
+                else:
+                    self.graph[relative] = self.parse_file(path, digest)
+                    parsed += 1
+        self.logger.info(f"{len(self.graph)} file(s) in the graph, "
+                         f"{parsed} parsed.")
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_file.write_text(json.dumps({"version": CACHE_VERSION,
+                                               "files": self.graph}),
+                                   encoding="utf-8")
+
+    def parse_file(self, path: Path, digest: str) -> dict:
+        """
+        Parse one file into its node of the graph.
+
+        Args:
+            path (Path): The .robot or .resource file.
+            digest (str): sha1 of the file content.
+
+        Returns:
+            dict: Imported files, keywords and tests with line ranges and
+                called keyword names.
+        """
+        model = get_resource_model(path) if path.suffix == ".resource" \
+            else get_model(path)
+        visitor = FileVisitor()
+        visitor.visit(model)
+        imports = set()
+        for name, args in visitor.imports:
+            for value in [name] + args:
+                imports.update(self.resolve_import(path, value))
+        return {
+            "sha1": digest,
+            "imports": sorted(imports),
+            "suite_calls": sorted(visitor.suite_calls),
+            "keywords": {name: {**block, "calls": sorted(block["calls"])}
+                         for name, block in visitor.keywords.items()},
+            "tests": {name: {**block, "calls": sorted(block["calls"])}
+                      for name, block in visitor.tests.items()},
+        }
+
+    def resolve_import(self, source: Path, value: str) -> List[str]:
+        """
+        Resolve an import name or argument to files of the repository.
+
+        Paths are tried relative to the importing file and the python
+        paths, module names (Package.Module) as .py files or packages, also
+        without their last part for ``Module.Class`` imports. A value of a
+        ``name=`` argument is split at commas, e.g. ``plugins=a.py,b.py``.
+
+        Returns:
+            List[str]: Paths relative to the root, empty for external
+                libraries and plain arguments.
+        """
+        value = value.split("=", 1)[-1]
+        resolved = []
+        for part in value.split(","):
+            path = self.resolve_path(source, part.strip())
+            if path:
+                resolved.append(path)
+        return resolved
+
+    def resolve_path(self, source: Path, value: str) -> Optional[str]:
+        """Resolve a single import path or module name, see resolve_import."""
+        value = value.replace("${CURDIR}", str(source.parent)) \
+            .replace("${EXECDIR}", str(self.root)).replace("${/}", "/")
+        if "${" in value or not value:
+            return None
+        candidates = [Path(value)] if Path(value).is_absolute() else \
+            [source.parent / value] + [self.root / base / value
+                                       for base in PYTHON_PATHS]
+        if not Path(value).suffix or "/" not in value:
+            parts = value.split(".")
+            modules = ["/".join(parts[:end])
+                       for end in (len(parts), len(parts) - 1) if end]
+            for module in modules:
+                for base in PYTHON_PATHS:
+                    candidates += [self.root / base / f"{module}.py",
+                                   self.root / base / module]
+        for candidate in candidates:
+            candidate = candidate.resolve()
+            if candidate.exists() and self.root in candidate.parents:
+                return candidate.relative_to(self.root).as_posix()
+        return None
+
+    def get_changed_lines(self, base: str) -> Dict[str, Optional[Set[int]]]:
+        """
+        Get the changed lines per file from git diff.
+
+        Args:
+            base (str): Commit to compare the working tree with.
+
+        Returns:
+            Dict[str, Optional[Set[int]]]: Changed line numbers of the new
+                file, None for deleted and untracked files.
+        """
+        diff = subprocess.run(["git", "diff", "--unified=0",
+                               "--no-renames", base],
+                              cwd=self.root, capture_output=True,
+                              text=True, check=True).stdout
+        untracked = subprocess.run(["git", "ls-files", "--others",
+                                    "--exclude-standard"],
+                                   cwd=self.root, capture_output=True,
+                                   text=True, check=True).stdout
+        changes: Dict[str, Optional[Set[int]]] = {}
+        current = None
+        for line in diff.splitlines():
+            if line.startswith("--- a/"):
+                current = line[6:]
+                changes[current] = None
+            elif line.startswith("+++ b/"):
+                current = line[6:]
+                changes[current] = set()
+            elif line.startswith("@@") and changes.get(current) is not None:
+                match = re.match(r"@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@",
+                                 line)
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                changes[current].update(range(start, start + max(count, 1)))
+        for path in untracked.splitlines():
+            changes[path] = None
+        return changes
+
+    def select(self, base: str) -> Tuple[Set[str], Set[Tuple[str, str]]]:
+        """
+        Select the affected suites and tests.
+
+        Returns:
+            Tuple[Set[str], Set[Tuple[str, str]]]: Suite files to run
+                completely, and (suite file, test name) pairs.
+        """
+        changes = self.get_changed_lines(base)
+        if any(path.startswith(GLOBAL_FILES) for path in changes):
+            self.logger.info("Global configuration changed, running all.")
+            return set(self.get_suites()), set()
+        changed_files: Set[str] = set()
+        changed_keywords: Set[Tuple[str, str]] = set()
+        suites: Set[str] = set()
+        tests: Set[Tuple[str, str]] = set()
+        for path, lines in changes.items():
+            node = self.graph.get(path)
+            if node is None or lines is None:
+                changed_files.add(path)
+                continue
+            blocks = self.get_changed_blocks(node, lines)
+            if blocks is None:
+                changed_files.add(path)
+                continue
+            keywords, changed_tests = blocks
+            changed_keywords.update((path, normalize(name))
+                                    for name in keywords)
+            tests.update((path, name) for name in changed_tests)
+        affected_keywords = self.get_callers(changed_keywords)
+        seen: Set[str] = set()
+        for suite in self.get_suites():
+            dependencies = self.get_dependencies(suite)
+            seen.update(dependencies)
+            if dependencies & changed_files:
+                suites.add(suite)
+                continue
+            visible = {keyword for path, keyword in affected_keywords
+                       if path in dependencies}
+            node = self.graph[suite]
+            if self.calls_any(node["suite_calls"], visible):
+                suites.add(suite)
+                continue
+            for name, test in node["tests"].items():
+                if self.calls_any(test["calls"], visible):
+                    tests.add((suite, name))
+        unseen = sorted(path for path in changed_files
+                        if path not in self.graph and path not in seen
+                        and not path.endswith(DOCUMENTATION_SUFFIXES)
+                        and not path.startswith(OUTPUT_DIRECTORY))
+        if unseen:
+            self.logger.info(f"No suite imports {', '.join(unseen)}, it may "
+                             f"be read by Python code only, running all.")
+            return set(self.get_suites()), set()
+        tests = {(suite, name) for suite, name in tests if suite not in suites}
+        return suites, tests
+
+    def get_changed_blocks(self, node: dict, lines: Set[int]
+                           ) -> Optional[Tuple[Set[str], Set[str]]]:
+        """
+        Map changed lines to keywords and tests.
+
+        Returns:
+            Optional[Tuple[Set[str], Set[str]]]: Changed keywords and tests,
+                None when a line outside of them changed.
+        """
+        keywords, tests = set(), set()
+        for line in lines:
+            found = False
+            for blocks, names in ((node["keywords"], keywords),
+                                  (node["tests"], tests)):
+                for name, block in blocks.items():
+                    if block["start"] <= line <= block["end"]:
+                        names.add(name)
+                        found = True
+            if not found:
+                return None
+        return keywords, tests
+
+    def get_callers(self, keywords: Set[Tuple[str, str]]
+                    ) -> Set[Tuple[str, str]]:
+        """
+        Expand changed keywords with all keywords calling them.
+
+        A call only matches keywords of the files its own file imports, so
+        keywords with the same name in other resources are not affected.
+
+        Args:
+            keywords (Set[Tuple[str, str]]): Changed (file, normalized
+                keyword name) pairs.
+
+        Returns:
+            Set[Tuple[str, str]]: The changed keywords and their callers.
+        """
+        dependencies = {path: self.get_dependencies(path)
+                        for path in self.graph}
+        affected = set(keywords)
+        pending = list(keywords)
+        while pending:
+            source, keyword = pending.pop()
+            for path, node in self.graph.items():
+                if source not in dependencies[path]:
+                    continue
+                for name, block in node["keywords"].items():
+                    caller = (path, normalize(name))
+                    if caller not in affected and \
+                            self.calls_any(block["calls"], {keyword}):
+                        affected.add(caller)
+                        pending.append(caller)
+        return affected
+
+    @staticmethod
+    def matches(call: str, keyword: str) -> bool:
+        """Match a normalized call, optionally prefixed, to a keyword."""
+        if call == keyword or call.endswith(f".{keyword}"):
+            return True
+        if "${" in keyword:
+            pattern = re.sub(r"\\\$\\\{[^}]*\\\}", ".*?", re.escape(keyword))
+            return re.fullmatch(f"(.*\\.)?{pattern}", call) is not None
+        return False
+
+    def calls_any(self, calls: List[str], keywords: Set[str]) -> bool:
+        return any(self.matches(normalize(call), keyword)
+                   for call in calls for keyword in keywords)
+
+    def get_suites(self) -> List[str]:
+        return [path for path in self.graph if path.endswith(".robot")
+                and (self.root / path).resolve().is_relative_to(self.tests)]
+
+    def get_dependencies(self, path: str) -> Set[str]:
+        """All files imported by a file, directly or transitively."""
+        dependencies = {path}
+        pending = [path]
+        while pending:
+            node = self.graph.get(pending.pop())
+            for imported in node["imports"] if node else []:
+                if imported in dependencies:
+                    continue
+                dependencies.add(imported)
+                if imported in self.graph:
+                    pending.append(imported)
+                elif (self.root / imported).is_dir():
+                    dependencies.update(
+                        file.relative_to(self.root).as_posix()
+                        for file in (self.root / imported).rglob("*.py"))
+        return dependencies
+
+    def get_suite_name(self, path: str) -> str:
+        """Full suite name of a test file when running the tests root."""
+        relative = (self.root / path).relative_to(self.tests)
+        names = [TestSuite.name_from_source(self.tests)]
+        names += [TestSuite.name_from_source(part)
+                  for part in relative.parts]
+        return ".".join(names)
+
+    def get_arguments(self, suites: Set[str],
+                      tests: Set[Tuple[str, str]]) -> List[str]:
+        arguments = [f"--suite {self.get_suite_name(suite)}"
+                     for suite in sorted(suites)]
+        arguments += [f"--test {self.get_suite_name(suite)}.{name}"
+                      for suite, name in sorted(tests)]
+        return arguments
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Select the suites and tests affected by a git diff.")
+    parser.add_argument("--base", default="HEAD",
+                        help="Commit to compare the working tree with.")
+    parser.add_argument("--tests", default="Tests",
+                        help="Tests root directory.")
+    parser.add_argument("--cache", default=DEFAULT_CACHE,
+                        help="Graph cache file.")
+    parser.add_argument("--output",
+                        help="Write the selection as a robot arguments file.")
+    arguments = parser.parse_args()
+    analyzer = TestImpactAnalyzer(".", arguments.tests, arguments.cache)
+    analyzer.build_graph()
+    suites, tests = analyzer.select(arguments.base)
+    selection = analyzer.get_arguments(suites, tests)
+    analyzer.logger.info(f"{len(suites)} suite(s) and {len(tests)} test(s) "
+                         f"affected.")
+    if not selection:
+        selection = NO_SELECTION
+    if arguments.output:
+        Path(arguments.output).write_text(
+            "".join(f"{line}\n" for line in selection), encoding="utf-8")
+    else:
+        for line in selection:
+            print(line)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Test Timing Database
+
+This script keeps the durations of every run in a local SQLite database, to
+follow trends over time and to flag tests that became slower.
+
+Usage:
+    python Scripts/timing_database.py ingest Results/output.xml
+    python Scripts/timing_database.py ingest Results/junit.xml --environment QA
+    python Scripts/timing_database.py stats --kind keyword --top 20
+    python Scripts/timing_database.py trend "Tests.RequestsTest.S1 Platform Test > With Session"
+    python Scripts/timing_database.py regressions --threshold 1.5
+"""
+
+import argparse
+import logging
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_DATABASE = "Results/test_timings.db"
+LEGACY_TIME_FORMAT = "%Y%m%d %H:%M:%S.%f"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    generated TEXT NOT NULL,
+    source TEXT NOT NULL,
+    environment TEXT,
+    strategy TEXT,
+    commit_sha TEXT,
+    ingested TEXT NOT NULL,
+    UNIQUE (generated, source)
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+-- One row per keyword and run, duration is the total of all its calls.
+CREATE TABLE IF NOT EXISTS keywords (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_environment ON runs (environment, generated);
+CREATE INDEX IF NOT EXISTS tests_name ON tests (name, run_id, duration);
+CREATE INDEX IF NOT EXISTS keywords_name ON keywords (name, run_id, duration);
+"""
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a Robot Framework timestamp, ISO 8601 (RF 7) or legacy format.
+
+    Args:
+        value (Optional[str]): The timestamp.
+
+    Returns:
+        Optional[datetime]: The time, None for missing values.
+    """
+    if not value or value == "N/A":
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, LEGACY_TIME_FORMAT)
+
+
+def get_elapsed(status: Dict[str, str]) -> float:
+    """
+    Get the elapsed seconds of a status element.
+
+    Args:
+        status (Dict[str, str]): Attributes of the status element.
+
+    Returns:
+        float: Elapsed seconds, RF 7 ``elapsed`` or ``endtime - starttime``.
+    """
+    if "elapsed" in status:
+        return float(status["elapsed"])
+    start = parse_time(status.get("starttime"))
+    end = parse_time(status.get("endtime"))
+    if start is None or end is None:
+        return 0.0
+    return (end - start).total_seconds()
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+
+    Args:
+        values (List[float]): Sorted values.
+        percent (float): Percentile from 0 to 100.
+
+    Returns:
+        float: The percentile.
+    """
+    index = max(0, min(len(values) - 1,
+                       math.ceil(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+class OutputReader:
+    """
+    Streams test and keyword durations from an output.xml or junit.xml.
+
+    Elements are cleared as soon as they are read, so the memory use does
+    not grow with the size of the file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.generated = ""
+        self.metadata: Dict[str, str] = {}
+        self.keywords: Dict[str, List[float]] = {}
+
+    def read_tests(self) -> Iterator[Tuple[str, str, str, float]]:
+        """
+        Yield name, suite, status and duration of every test.
+
+        Keyword durations are aggregated into ``keywords`` while reading.
+        """
+        suites: List[str] = []
+        statuses: List[Dict[str, str]] = []
+        depth = 0
+        junit = False
+        for event, element in ET.iterparse(self.path, ("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if not depth:
+                    junit = tag != "robot"
+                    generated = parse_time(element.get("generated")
+                                           or element.get("timestamp"))
+                    self.generated = generated.isoformat() if generated \
+                        else ""
+                if junit:
+                    if tag == "testsuite" and not self.generated:
+                        # Merged junit files have no timestamp on the root.
+                        generated = parse_time(element.get("timestamp"))
+                        self.generated = generated.isoformat() if generated \
+                            else ""
+                    elif tag == "testcase":
+                        statuses.append({"status": "PASS"})
+                    elif tag in ("failure", "error") and statuses:
+                        statuses[-1]["status"] = "FAIL"
+                    elif tag == "skipped" and statuses:
+                        statuses[-1]["status"] = "SKIP"
+                elif tag == "suite":
+                    suites.append(element.get("name", ""))
+                depth += 1
+                continue
+            depth -= 1
+            if junit:
+                if tag == "testcase":
+                    status = statuses.pop()
+                    yield (f"{element.get('classname')}.{element.get('name')}",
+                           element.get("classname", ""),
+                           status["status"],
+                           float(element.get("time") or 0))
+                    element.clear()
+                continue
+            if tag == "meta" and len(suites) == 1:
+                self.metadata[element.get("name", "")] = element.text or ""
+            elif tag == "test":
+                status = self._get_own_status(element)
+                yield (f"{'.'.join(suites)}.{element.get('name')}",
+                       ".".join(suites),
+                       status.get("status", ""),
+                       get_elapsed(status))
+                element.clear()
+            elif tag == "kw":
+                status = self._get_own_status(element)
+                owner = element.get("owner") or element.get("library")
+                name = f"{owner}.{element.get('name')}" if owner \
+                    else element.get("name", "")
+                self.keywords.setdefault(name, []).append(
+                    get_elapsed(status))
+                element.clear()
+            elif tag == "suite":
+                suites.pop()
+                element.clear()
+        if not self.generated:
+            self.generated = datetime.fromtimestamp(
+                self.path.stat().st_mtime).isoformat()
+
+    @staticmethod
+    def _get_own_status(element: ET.Element) -> Dict[str, str]:
+        status = element.find("status")
+        return dict(status.attrib) if status is not None else {}
+
+
+class TimingDatabase:
+    def __init__(self, database: str):
+        self.database = Path(database)
+        self.database.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.database)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+        # Setup logging
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Setup logging configuration for console output."""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(message)s',
+            handlers=[
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def ingest(self,
+               output: str,
+               environment: Optional[str],
+               strategy: Optional[str],
+               commit_sha: Optional[str]) -> int:
+        """
+        Store the durations of one run.
+
+        Metadata not given falls back to the suite metadata of the run, then
+        to the SOVOS_ENVIRONMENT and BROWSER_STRATEGY environment variables
+        and the current git commit.
+
+        Args:
+            output (str): Path of an output.xml or junit.xml.
+            environment (Optional[str]): SOVOS_ENVIRONMENT of the run.
+            strategy (Optional[str]): Browser strategy of the run.
+            commit_sha (Optional[str]): Commit the run tested.
+
+        Returns:
+            int: 0 when stored, 1 when the run was already ingested.
+        """
+        reader = OutputReader(Path(output))
+        tests = list(reader.read_tests())
+        environment = environment \
+            or reader.metadata.get("SOVOS_ENVIRONMENT") \
+            or os.environ.get("SOVOS_ENVIRONMENT")
+        strategy = strategy \
+            or reader.metadata.get("BROWSER_STRATEGY") \
+            or os.environ.get("BROWSER_STRATEGY")
+        commit_sha = commit_sha or self.get_commit_sha()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO runs (generated, source, environment, "
+                "strategy, commit_sha, ingested) VALUES (?, ?, ?, ?, ?, ?)",
+                (reader.generated, str(Path(output).resolve()), environment,
+                 strategy, commit_sha, datetime.now().isoformat()))
+            if not cursor.rowcount:
+                self.logger.warning(f"{output} is already ingested.")
+                return 1
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO tests (run_id, name, suite, status, duration) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *test) for test in tests])
+            self.connection.executemany(
+                "INSERT INTO keywords (run_id, name, calls, duration) "
+                "VALUES (?, ?, ?, ?)",
+                [(run_id, name, len(durations), sum(durations))
+                 for name, durations in reader.keywords.items()])
+        self.logger.info(f"Run {run_id}: {len(tests)} test(s), "
+                         f"{len(reader.keywords)} keyword(s), "
+                         f"environment {environment}, strategy {strategy}, "
+                         f"commit {commit_sha}.")
+        return 0
+
+    def get_commit_sha(self) -> Optional[str]:
+        """Get the current git commit, None outside of a git repository."""
+        try:
+            result = subprocess.run(["git", "rev-parse", "HEAD"],
+                                    capture_output=True, text=True,
+                                    check=False)
+        except FileNotFoundError:
+            return None
+        return result.stdout.strip() or None
+
+    def get_durations(self,
+                      kind: str,
+                      environment: Optional[str],
+                      last_runs: int) -> Dict[str, List[float]]:
+        """
+        Get the sorted durations per test or keyword of the last runs.
+
+        Args:
+            kind (str): ``test`` or ``keyword``.
+            environment (Optional[str]): Only runs of this environment.
+            last_runs (int): Number of most recent runs.
+
+        Returns:
+            Dict[str, List[float]]: Sorted durations by name.
+        """
+        table = "tests" if kind == "test" else "keywords"
+        rows = self.connection.execute(
+            f"SELECT t.name, t.duration FROM {table} t "
+            "WHERE t.run_id IN (SELECT id FROM runs "
+            "WHERE ? IS NULL OR environment = ? "
+            "ORDER BY generated DESC LIMIT ?) "
+            "ORDER BY t.name, t.duration",
+            (environment, environment, last_runs))
+        durations: Dict[str, List[float]] = {}
+        for name, duration in rows:
+            durations.setdefault(name, []).append(duration)
+        return durations
+
+    def get_call_averages(self,
+                          environment: Optional[str],
+                          last_runs: int) -> Dict[str, Tuple[int, float]]:
+        """
+        Get the calls and the average seconds per call of every keyword.
+
+        Args:
+            environment (Optional[str]): Only runs of this environment.
+            last_runs (int): Number of most recent runs.
+
+        Returns:
+            Dict[str, Tuple[int, float]]: Calls and seconds per call by name.
+        """
+        rows = self.connection.execute(
+            "SELECT name, SUM(calls), SUM(duration) FROM keywords "
+            "WHERE run_id IN (SELECT id FROM runs "
+            "WHERE ? IS NULL OR environment = ? "
+            "ORDER BY generated DESC LIMIT ?) GROUP BY name",
+            (environment, environment, last_runs))
+        return {name: (calls, duration / calls if calls else 0.0)
+                for name, calls, duration in rows}
+
+    def print_stats(self,
+                    kind: str,
+                    environment: Optional[str],
+                    last_runs: int,
+                    top: int) -> int:
+        """
+        Print p50 and p95 of the slowest tests or keywords.
+
+        Keyword durations are stored per run, as the total of all calls, so
+        their p50 and p95 are of the run totals. The calls and the average
+        seconds per call are printed alongside.
+        """
+        durations = self.get_durations(kind, environment, last_runs)
+        ranked = sorted(durations.items(),
+                        key=lambda item: percentile(item[1], 95),
+                        reverse=True)
+        if kind == "test":
+            self.logger.info(f"{'runs':>6} {'p50 s':>10} {'p95 s':>10}  "
+                             f"{kind}")
+            for name, values in ranked[:top]:
+                self.logger.info(f"{len(values):>6} "
+                                 f"{percentile(values, 50):>10.3f} "
+                                 f"{percentile(values, 95):>10.3f}  {name}")
+            return 0
+        averages = self.get_call_averages(environment, last_runs)
+        self.logger.info(f"{'runs':>6} {'p50 run s':>10} {'p95 run s':>10} "
+                         f"{'calls':>8} {'s/call':>10}  {kind}")
+        for name, values in ranked[:top]:
+            calls, average = averages[name]
+            self.logger.info(f"{len(values):>6} "
+                             f"{percentile(values, 50):>10.3f} "
+                             f"{percentile(values, 95):>10.3f} "
+                             f"{calls:>8} {average:>10.3f}  {name}")
+        return 0
+
+    def print_trend(self, name: str, environment: Optional[str]) -> int:
+        """Print the duration of a test in every run."""
+        rows = self.connection.execute(
+            "SELECT r.generated, r.environment, r.commit_sha, t.status, "
+            "t.duration FROM tests t JOIN runs r ON r.id = t.run_id "
+            "WHERE t.name = ? AND (? IS NULL OR r.environment = ?) "
+            "ORDER BY r.generated",
+            (name, environment, environment)).fetchall()
+        if not rows:
+            self.logger.error(f"No durations for test '{name}'.")
+            return 1
+        for generated, run_environment, commit_sha, status, duration in rows:
+            self.logger.info(f"{generated}  {run_environment or '-':<6} "
+                             f"{(commit_sha or '-')[:10]:<10} {status:<5} "
+                             f"{duration:>10.3f}")
+        return 0
+
+    def find_regressions(self,
+                         environment: Optional[str],
+                         baseline_runs: int,
+                         threshold: float,
+                         min_duration: float) -> int:
+        """
+        Flag tests of the latest run slower than ``threshold`` times the
+        p50 of the previous runs.
+
+        Returns:
+            int: 1 when a test regressed, 0 otherwise.
+        """
+        run_ids = [row[0] for row in self.connection.execute(
+            "SELECT id FROM runs WHERE ? IS NULL OR environment = ? "
+            "ORDER BY generated DESC LIMIT ?",
+            (environment, environment, baseline_runs + 1))]
+        if len(run_ids) < 2:
+            self.logger.info("Not enough runs to compare.")
+            return 0
+        latest, baseline = run_ids[0], run_ids[1:]
+        placeholders = ",".join("?" * len(baseline))
+        history: Dict[str, List[float]] = {}
+        for name, duration in self.connection.execute(
+                "SELECT name, duration FROM tests WHERE status = 'PASS' "
+                f"AND run_id IN ({placeholders}) ORDER BY name, duration",
+                baseline):
+            history.setdefault(name, []).append(duration)
+        regressions = []
+        for name, duration in self.connection.execute(
+                "SELECT name, duration FROM tests WHERE run_id = ? "
+                "AND status = 'PASS'", (latest,)):
+            if name not in history or duration < min_duration:
+                continue
+            p50 = percentile(history[name], 50)
+            if p50 > 0 and duration > p50 * threshold:
+                regressions.append((duration / p50, name, duration, p50))
+        for ratio, name, duration, p50 in sorted(regressions, reverse=True):
+            self.logger.warning(f"{ratio:>5.1f}x {duration:>10.3f}s "
+                                f"(p50 {p50:.3f}s)  {name}")
+        self.logger.info(f"{len(regressions)} test(s) regressed beyond "
+                         f"{threshold}x of the last {len(baseline)} run(s).")
+        return 1 if regressions else 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Store and query test durations of Robot Framework runs.")
+    parser.add_argument("--database", default=DEFAULT_DATABASE,
+                        help="SQLite database file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Store an output.xml or "
+                                                "junit.xml.")
+    ingest.add_argument("outputs", nargs="+")
+    ingest.add_argument("--environment")
+    ingest.add_argument("--strategy")
+    ingest.add_argument("--commit")
+    stats = commands.add_parser("stats", help="Print p50 and p95 durations.")
+    stats.add_argument("--kind", choices=("test", "keyword"), default="test")
+    stats.add_argument("--environment")
+    stats.add_argument("--last-runs", type=int, default=20)
+    stats.add_argument("--top", type=int, default=20)
+    trend = commands.add_parser("trend", help="Print durations of a test.")
+    trend.add_argument("name")
+    trend.add_argument("--environment")
+    regressions = commands.add_parser("regressions",
+                                      help="Flag slower tests of the "
+                                           "latest run.")
+    regressions.add_argument("--environment")
+    regressions.add_argument("--baseline-runs", type=int, default=10)
+    regressions.add_argument("--threshold", type=float, default=1.5)
+    regressions.add_argument("--min-duration", type=float, default=1.0,
+                             help="Ignore tests faster than this, seconds.")
+    arguments = parser.parse_args()
+    database = TimingDatabase(arguments.database)
+    if arguments.command == "ingest":
+        exit_code = max(database.ingest(output,
+                                        arguments.environment,
+                                        arguments.strategy,
+                                        arguments.commit)
+                        for output in arguments.outputs)
+    elif arguments.command == "stats":
+        exit_code = database.print_stats(arguments.kind,
+                                         arguments.environment,
+                                         arguments.last_runs,
+                                         arguments.top)
+    elif arguments.command == "trend":
+        exit_code = database.print_trend(arguments.name,
+                                         arguments.environment)
+    else:
+        exit_code = database.find_regressions(arguments.environment,
+                                              arguments.baseline_runs,
+                                              arguments.threshold,
+                                              arguments.min_duration)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Environment Verification Script
+
+This script verifies Python, Poetry with its required plugins, Node.js and
+npm in one run. Every external command (``poetry --version``,
+``poetry self show plugins``, ``node --version`` and ``npm --version``) is
+started once and all of them run concurrently, so the verification takes
+about as long as the slowest single command.
+
+The command outputs are cached in Results/verify_environment_cache.json,
+keyed by the command, the resolved executable, its modification time and
+PATH. Upgrading a tool or changing PATH runs the command again.
+
+Usage:
+    python Scripts/verify_environment.py
+    python Scripts/verify_environment.py --check poetry --check node
+    python Scripts/verify_environment.py --no-cache --json -
+    python Scripts/verify_environment.py --json Results/environment.json
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from verify_node_installation import MINIMUM_NODE_MAJOR, MINIMUM_NPM_MAJOR
+from verify_poetry_installation import MINIMUM_POETRY_VERSION, REQUIRED_PLUGINS
+
+MINIMUM_PYTHON_VERSION = "3.12.0"
+CACHE_FILE = "Results/verify_environment_cache.json"
+CACHE_MAX_AGE = 24 * 60 * 60
+COMMAND_TIMEOUT = 60
+COMMANDS = {
+    "poetry": ["poetry", "--version"],
+    "poetry-plugins": ["poetry", "self", "show", "plugins"],
+    "node": ["node", "--version"],
+    "npm": ["npm", "--version"],
+}
+CHECK_GROUPS = {
+    "python": [],
+    "poetry": ["poetry", "poetry-plugins"],
+    "node": ["node", "npm"],
+}
+
+
+class EnvironmentVerifier:
+    def __init__(self,
+                 checks: Optional[List[str]] = None,
+                 cache_file: Optional[str] = CACHE_FILE,
+                 max_age: float = CACHE_MAX_AGE,
+                 log_stream=sys.stdout):
+        self.checks = checks or list(CHECK_GROUPS)
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.max_age = max_age
+        self.cache = self.load_cache()
+
+        # Setup logging
+        self.setup_logging(log_stream)
+
+    def setup_logging(self, stream=sys.stdout):
+        """Setup logging configuration for console output."""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(message)s',
+            handlers=[
+                logging.StreamHandler(stream)
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def load_cache(self) -> Dict[str, dict]:
+        """Load the cached command outputs, empty when caching is off."""
+        if not self.cache_file:
+            return {}
+        try:
+            return json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self) -> None:
+        """Write the cached command outputs."""
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(self.cache, indent=2),
+                             encoding="utf-8")
+        os.replace(temporary, self.cache_file)
+
+    @staticmethod
+    def cache_key(command: List[str], executable: Optional[str]) -> str:
+        """
+        Key of a command output in the cache.
+
+        Args:
+            command (List[str]): The command to run.
+            executable (Optional[str]): The resolved executable, None when
+                it is not found in PATH.
+
+        Returns:
+            str: Hash of the command, executable, its mtime and PATH.
+        """
+        mtime = None
+        if executable:
+            try:
+                mtime = os.stat(executable).st_mtime_ns
+            except OSError:
+                pass
+        return hashlib.sha1(json.dumps([
+            command,
+            executable,
+            mtime,
+            os.environ.get("PATH", ""),
+        ]).encode("utf-8")).hexdigest()
+
+    def run_command(self, command: List[str]) -> dict:
+        """
+        Run a command, or take its output from the cache.
+
+        The executable is resolved with PATH (and PATHEXT on Windows), so
+        ``npm.cmd`` runs without a shell.
+
+        Args:
+            command (List[str]): The command to run.
+
+        Returns:
+            dict: The exit code, stdout, stderr, seconds and whether the
+                output was cached.
+        """
+        executable = shutil.which(command[0])
+        key = self.cache_key(command, executable)
+        cached = self.cache.get(key)
+        if cached and time.time() - cached["time"] < self.max_age:
+            return {**cached, "cached": True, "seconds": 0.0}
+        start = time.perf_counter()
+        if executable is None:
+            result = {"exit_code": 127, "stdout": "",
+                      "stderr": f"Command not found: {command[0]}"}
+        else:
+            try:
+                process = subprocess.run(
+                    [executable] + command[1:],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    stdin=subprocess.DEVNULL,
+                    timeout=COMMAND_TIMEOUT
+                )
+                result = {"exit_code": process.returncode,
+                          "stdout": process.stdout,
+                          "stderr": process.stderr}
+            except (OSError, subprocess.TimeoutExpired) as error:
+                result = {"exit_code": 1, "stdout": "", "stderr": str(error)}
+        seconds = time.perf_counter() - start
+        # Only successful outputs are cached, a failing tool is checked
+        # again on the next run after it was installed.
+        if result["exit_code"] == 0:
+            self.cache[key] = {**result, "time": time.time()}
+        return {**result, "cached": False, "seconds": round(seconds, 3)}
+
+    def run_commands(self, names: List[str]) -> Dict[str, dict]:
+        """
+        Run the commands concurrently, each one once.
+
+        Args:
+            names (List[str]): Names of the commands in COMMANDS.
+
+        Returns:
+            Dict[str, dict]: The result of every command by name.
+        """
+        if not names:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            futures = {name: executor.submit(self.run_command, COMMANDS[name])
+                       for name in names}
+            return {name: future.result() for name, future in futures.items()}
+
+    @staticmethod
+    def _parse_version(version_string: str) -> Tuple[int, int, int]:
+        """
+        Parse the first version number of a command output.
+
+        Args:
+            version_string (str): The output to parse, e.g.
+                ``Poetry (version 2.1.3)`` or ``v20.11.1``.
+
+        Returns:
+            Tuple[int, int, int]: The major, minor, and patch components,
+                zeros when no version is found.
+        """
+        match = re.search(r'(\d+)(?:\.(\d+))?(?:\.(\d+))?', version_string)
+        if not match:
+            return 0, 0, 0
+        return tuple(int(part or 0) for part in match.groups())
+
+    @staticmethod
+    def _result(name: str, ok: bool, message: str,
+                version: Optional[str] = None,
+                required: Optional[str] = None,
+                command: Optional[dict] = None) -> dict:
+        return {
+            "name": name,
+            "ok": ok,
+            "version": version,
+            "required": required,
+            "message": message,
+            "cached": command["cached"] if command else False,
+            "seconds": command["seconds"] if command else 0.0,
+        }
+
+    def check_version(self, name: str, command: dict,
+                      minimum: Tuple[int, int, int], required: str) -> dict:
+        """
+        Check the version printed by a command against a minimum.
+
+        Args:
+            name (str): Name of the tool.
+            command (dict): Result of the version command.
+            minimum (Tuple[int, int, int]): The minimum version.
+            required (str): The minimum version as shown to the user.
+
+        Returns:
+            dict: The check result.
+        """
+        if command["exit_code"] != 0:
+            error = command["stderr"].strip()
+            return self._result(name, False, f"{name} is not installed. "
+                                f"{error}".strip(), required=required,
+                                command=command)
+        output = command["stdout"].strip()
+        version = self._parse_version(output)
+        if version == (0, 0, 0):
+            return self._result(name, False, f"Could not parse {name} "
+                                f"version from '{output}'.",
+                                required=required, command=command)
+        found = ".".join(str(part) for part in version)
+        if version < minimum:
+            return self._result(name, False, f"{name} {required} or higher "
+                                f"is required. Found {found}.", found,
+                                required, command)
+        return self._result(name, True, f"{name} version {found} meets "
+                            f"minimum requirement.", found, required, command)
+
+    def check_python(self) -> dict:
+        """Check the version of the running Python interpreter."""
+        found = ".".join(str(part) for part in sys.version_info[:3])
+        minimum = self._parse_version(MINIMUM_PYTHON_VERSION)
+        if tuple(sys.version_info[:3]) < minimum:
+            return self._result("Python", False, f"Python "
+                                f"{MINIMUM_PYTHON_VERSION} or higher is "
+                                f"required. Found {found}.", found,
+                                MINIMUM_PYTHON_VERSION)
+        return self._result("Python", True, f"Python version {found} meets "
+                            f"minimum requirement.", found,
+                            MINIMUM_PYTHON_VERSION)
+
+    def check_plugins(self, command: dict) -> List[dict]:
+        """
+        Check the required plugins in one ``poetry self show plugins`` output.
+
+        Args:
+            command (dict): Result of the plugins command.
+
+        Returns:
+            List[dict]: One check result per required plugin.
+        """
+        results = []
+        for plugin in REQUIRED_PLUGINS:
+            if command["exit_code"] == 0 and plugin in command["stdout"]:
+                results.append(self._result(
+                    plugin, True, f"Plugin {plugin} is installed",
+                    command=command))
+            else:
+                results.append(self._result(
+                    plugin, False, f"Plugin {plugin} is not installed. "
+                    f"Install it with: poetry self add {plugin}",
+                    command=command))
+        return results
+
+    def verify(self) -> dict:
+        """
+        Run all selected checks.
+
+        Returns:
+            dict: Whether all checks passed, the total seconds and the
+                result of every check.
+        """
+        start = time.perf_counter()
+        names = [name for group in self.checks for name in CHECK_GROUPS[group]]
+        commands = self.run_commands(names)
+        self.save_cache()
+        results = []
+        if "python" in self.checks:
+            results.append(self.check_python())
+        if "poetry" in self.checks:
+            results.append(self.check_version(
+                "Poetry", commands["poetry"],
+                self._parse_version(MINIMUM_POETRY_VERSION),
+                MINIMUM_POETRY_VERSION))
+            results.extend(self.check_plugins(commands["poetry-plugins"]))
+        if "node" in self.checks:
+            results.append(self.check_version(
+                "Node.js", commands["node"], (MINIMUM_NODE_MAJOR, 0, 0),
+                f"{MINIMUM_NODE_MAJOR}.x"))
+            results.append(self.check_version(
+                "npm", commands["npm"], (MINIMUM_NPM_MAJOR, 0, 0),
+                f"{MINIMUM_NPM_MAJOR}.x"))
+        return {
+            "ok": all(result["ok"] for result in results),
+            "seconds": round(time.perf_counter() - start, 3),
+            "checks": results,
+        }
+
+    def print_summary(self, report: dict) -> None:
+        """Print the check results."""
+        self.logger.info("=" * 40)
+        self.logger.info("ENVIRONMENT VERIFICATION SUMMARY")
+        self.logger.info("=" * 40)
+        for result in report["checks"]:
+            status = "OK  " if result["ok"] else "FAIL"
+            cached = " (cached)" if result["cached"] else ""
+            self.logger.info(f"[{status}] {result['message']}{cached}")
+        self.logger.info("")
+        failed = sum(not result["ok"] for result in report["checks"])
+        if failed:
+            self.logger.error(f"{failed} check(s) failed in "
+                              f"{report['seconds']:.2f}s.")
+        else:
+            self.logger.info(f"All prerequisites are satisfied in "
+                             f"{report['seconds']:.2f}s.")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Verify Python, Poetry and Node.js concurrently.")
+    parser.add_argument("--check", action="append", choices=list(CHECK_GROUPS),
+                        help="Check group to run, can be repeated. Defaults "
+                             "to all groups.")
+    parser.add_argument("--cache", default=CACHE_FILE,
+                        help="Cache file of the command outputs.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Run every command, ignoring the cache.")
+    parser.add_argument("--max-age", type=float, default=CACHE_MAX_AGE,
+                        help="Seconds a cached command output is used.")
+    parser.add_argument("--json",
+                        help="Write the results as JSON, '-' for stdout.")
+    arguments = parser.parse_args()
+    verifier = EnvironmentVerifier(
+        checks=arguments.check,
+        cache_file=None if arguments.no_cache else arguments.cache,
+        max_age=arguments.max_age,
+        log_stream=sys.stderr if arguments.json == "-" else sys.stdout)
+    report = verifier.verify()
+    verifier.print_summary(report)
+    if arguments.json == "-":
+        print(json.dumps(report, indent=2))
+    elif arguments.json:
+        Path(arguments.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(arguments.json).write_text(json.dumps(report, indent=2),
+                                        encoding="utf-8")
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
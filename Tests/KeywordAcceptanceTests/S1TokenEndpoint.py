@@ -0,0 +1,92 @@
+"""
+Stand-in OAuth 2.0 token endpoint for the S1TokenManager acceptance tests.
+
+A local ``ThreadingHTTPServer`` answers every POST with a new JWT of the
+user in the form, expiring after a few seconds, so the background renewal
+runs within a test.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs
+
+import jwt
+from robot.api.deco import keyword, library
+
+SECRET = "s1-token-manager-acceptance-test-secret"
+
+
+class _TokenHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        with self.server.lock:
+            self.server.requests += 1
+            issued = self.server.requests
+        token = jwt.encode(
+            {"sub": form.get("username", [""])[0], "jti": str(issued),
+             "exp": int(time.time()) + self.server.lifetime},
+            SECRET, algorithm="HS256")
+        data = f'{{"access_token": "{token}"}}'.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@library(scope="GLOBAL", version="1.0")
+class S1TokenEndpoint():
+    """
+    Token endpoint served on a free local port.
+    """
+
+    def __init__(self):
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @keyword("Start Token Endpoint")
+    def start_token_endpoint(self, lifetime: int = 3) -> str:
+        """
+        Starts the endpoint issuing tokens valid for ``lifetime`` seconds.
+
+        Args:
+            lifetime (int): seconds until the ``exp`` of a token
+
+        Returns:
+            str: URL of the token endpoint
+        """
+        self.stop_token_endpoint()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _TokenHandler)
+        self.server.lifetime = int(lifetime)
+        self.server.requests = 0
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_port}/token"
+
+    @keyword("Stop Token Endpoint")
+    def stop_token_endpoint(self) -> None:
+        """
+        Stops the endpoint when it runs.
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    @keyword("Get Token Requests")
+    def get_token_requests(self) -> int:
+        """
+        Returns the number of tokens issued since the start.
+
+        Returns:
+            int: token requests
+        """
+        with self.server.lock:
+            return self.server.requests
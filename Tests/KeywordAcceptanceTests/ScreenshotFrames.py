@@ -0,0 +1,45 @@
+"""
+Stand-in screen for the ScreenshotLibrary acceptance tests.
+
+It offers the ``driver.get_screenshot_as_png`` of SeleniumLibrary, so
+ScreenshotLibrary captures its frames with ``library_name=ScreenshotFrames``
+when no browser is installed.
+"""
+
+import io
+
+from PIL import Image, ImageDraw
+from robot.api.deco import keyword, library
+
+
+@library(scope="GLOBAL", version="1.0")
+class ScreenshotFrames():
+    """
+    Frames drawn with Pillow instead of captured from a browser.
+    """
+
+    def __init__(self):
+        self.driver = self
+        self.frame = Image.new("RGB", (320, 200), "white")
+
+    @keyword("Show Screenshot Frame")
+    def show_screenshot_frame(self, color: str = "white",
+                              box_color: str = "black",
+                              box_left: int = 40) -> None:
+        """
+        Shows a frame of one color with a box, like a page with an element.
+
+        Args:
+            color (str): background color
+            box_color (str): color of the box
+            box_left (int): left edge of the 100x60 pixels box
+        """
+        self.frame = Image.new("RGB", (320, 200), color)
+        box_left = int(box_left)
+        ImageDraw.Draw(self.frame).rectangle(
+            (box_left, 60, box_left + 100, 120), fill=box_color)
+
+    def get_screenshot_as_png(self) -> bytes:
+        data = io.BytesIO()
+        self.frame.save(data, "PNG")
+        return data.getvalue()
@@ -0,0 +1,95 @@
+"""
+Stand-in REST endpoint for the DataSeeder acceptance tests.
+
+A local ``ThreadingHTTPServer`` keeps the rows by their ``username``. A
+POST of a new row answers 201, of an existing row 409, and a PUT to
+``/users/<username>`` replaces the row.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from robot.api.deco import keyword, library
+
+
+class _SeedHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self) -> None:
+        row = self._read_row()
+        with self.server.lock:
+            if row["username"] in self.server.rows:
+                self._answer(409)
+                return
+            self.server.rows[row["username"]] = row
+        self._answer(201, row)
+
+    def do_PUT(self) -> None:
+        row = self._read_row()
+        with self.server.lock:
+            self.server.rows[self.path.rsplit("/", 1)[-1]] = row
+        self._answer(200, row)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _read_row(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length))
+
+    def _answer(self, status: int,
+                body: Optional[Dict[str, Any]] = None) -> None:
+        data = json.dumps(body or {}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@library(scope="GLOBAL", version="1.0")
+class SeedEndpoint():
+    """
+    Users endpoint served on a free local port.
+    """
+
+    def __init__(self):
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @keyword("Start Seed Endpoint")
+    def start_seed_endpoint(self) -> str:
+        """
+        Starts the endpoint without rows.
+
+        Returns:
+            str: base URL of the endpoint
+        """
+        self.stop_seed_endpoint()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _SeedHandler)
+        self.server.rows = {}
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    @keyword("Stop Seed Endpoint")
+    def stop_seed_endpoint(self) -> None:
+        """
+        Stops the endpoint when it runs.
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    @keyword("Get Seeded Rows")
+    def get_seeded_rows(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the rows of the endpoint.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: rows by username
+        """
+        with self.server.lock:
+            return dict(self.server.rows)